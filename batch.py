@@ -0,0 +1,401 @@
+import argparse
+import time
+
+import simulation
+from simulation import (
+    WIDTH, PLAYER_Y, LOGO_MIN, LOGO_MAX, SIM_DT,
+    GRAZE_MARGIN, GRAZE_MULT_GAIN, MULT_MAX,
+    PLAYER_MAX_SPEED, PLAYER_ACCEL, PLAYER_FRICTION,
+    DASH_CD, DASH_TIME, DASH_SPEED,
+    ENEMY_CULL_Y, TUNING, headless_sprite_sizes, load_numpy, _swept_window_arrays,
+)
+
+# -------------------------
+# AUSWEICHEN — viele Läufe gleichzeitig (NumPy)
+#
+# N unabhängige Läufe mit den Regeln von Simulation.step, im Gleichschritt:
+# ein Aufruf von step() rückt alle N um einen Takt vor. Spielerzustand liegt in
+# Arrays mit N Zeilen, Gegner in (N, K)-Arrays mit Belegt-Maske.
+# Für Bots und Balance-Versuche (Spawnrate, Tempo, Punkte), nicht für die Anzeige.
+#
+#   python spiel.py batch --envs 1024 --steps 2000
+# -------------------------
+
+# Aktionen je Lauf als Bitmaske
+ACT_LEFT = 1
+ACT_RIGHT = 2
+ACT_DASH = 4
+
+# Einstellbare Regeln: simulation.TUNING. Jeder Wert darf eine Zahl (alle Läufe)
+# oder ein Array mit N Werten (je Lauf) sein.
+BATCH_PARAMS = TUNING
+
+# Beobachtung je Lauf: Spieler, danach OBS_ENEMIES Gegner (nächste zuerst, leere Plätze = 0)
+OBS_PLAYER = ("x", "vx", "dash", "mult", "t")
+OBS_ENEMY = ("present", "dx", "dy", "w", "h", "vy")
+OBS_ENEMIES = 4
+
+BATCH_ENVS = 1024
+BATCH_STEPS = 2000
+BATCH_CAPACITY = 32             # Gegnerplätze je Lauf zu Beginn (wächst bei Bedarf)
+
+
+class BatchSimulation:
+    """
+    N Läufe von Simulation in Arrays. step(actions) → (obs, reward, done).
+
+    actions: N Bitmasken aus ACT_LEFT/ACT_RIGHT/ACT_DASH ("dash" = in diesem
+    Schritt gedrückt, wie inputs["dash"]). reward: Zuwachs von t + Punkte.
+    done: Lauf ist in diesem Schritt getroffen worden. Mit autoreset beginnt
+    er sofort neu (Endstand in final_score), sonst bleibt er stehen (done
+    bleibt True) bis reset().
+
+    Abweichungen von Simulation: Kollision nur über Boxen (wie --collision box),
+    keine Popups, ein gemeinsamer Zufallsgenerator für alle Läufe — gleiche
+    Regeln und Verteilungen, aber nicht dieselbe Zufallsfolge wie ein
+    einzelner Simulation-Lauf mit gleichem Seed. Trifft ein Gegner, zählen
+    Streifer desselben Schritts nicht mehr.
+    """
+
+    def __init__(self, n: int, seed=None, dt: float = SIM_DT, autoreset: bool = True,
+                 logo_sizes=None, player_size=None, capacity: int = BATCH_CAPACITY,
+                 obs_enemies: int = OBS_ENEMIES, **params):
+        np = load_numpy()
+        if np is None:
+            raise RuntimeError("NumPy nicht installiert — BatchSimulation braucht NumPy")
+        unknown = set(params) - set(BATCH_PARAMS)
+        if unknown:
+            raise ValueError(f"unbekannte Parameter: {', '.join(sorted(unknown))}")
+
+        if logo_sizes is None or player_size is None:
+            default_logos, default_player = headless_sprite_sizes()
+            if logo_sizes is None:
+                logo_sizes = default_logos
+            if player_size is None:
+                player_size = default_player
+
+        self.n = n
+        self.dt = dt
+        self.autoreset = autoreset
+        self.obs_enemies = obs_enemies
+        self.rng = np.random.default_rng(seed)
+
+        # Wunschgröße → (w, h) der nächsten vorhandenen Variante (wie Simulation.logo_pick)
+        keys = sorted(logo_sizes)
+        desired = range(LOGO_MIN, LOGO_MAX + 1)
+        if keys:
+            picks = [logo_sizes[min(keys, key=lambda s: abs(s - d))] for d in desired]
+        else:
+            picks = [(d, d) for d in desired]
+        self.logo_w = np.array([p[0] for p in picks], dtype=float)
+        self.logo_h = np.array([p[1] for p in picks], dtype=float)
+        self.player_w, self.player_h = player_size
+
+        self.params = {}
+        for name, default in BATCH_PARAMS.items():
+            value = np.array(params.get(name, default), dtype=float)
+            self.params[name] = np.broadcast_to(value, (n,)).copy()
+
+        # Lauf-Stats
+        self.t = np.zeros(n)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.over = np.zeros(n, dtype=bool)
+        self.points = np.zeros(n)
+        self.mult = np.ones(n)
+        self.final_score = np.full(n, np.nan)
+        self.episodes = 0
+        self.total_steps = 0
+
+        # Spieler und Sprint
+        self.player_x = np.zeros(n)
+        self.player_vx = np.zeros(n)
+        self.dash_ready_t = np.zeros(n)
+        self.dash_active_until = np.zeros(n)
+        self.next_spawn = np.zeros(n)
+
+        # Gegner: Platz k von Lauf i belegt, wenn alive[i, k]
+        self._alloc(capacity)
+        self._restart(np.ones(n, dtype=bool))
+
+    def _alloc(self, capacity):
+        np = simulation.np
+        n = self.n
+        self.capacity = capacity
+        self.x = np.zeros((n, capacity))
+        self.y = np.zeros((n, capacity))
+        self.w = np.zeros((n, capacity))
+        self.h = np.zeros((n, capacity))
+        self.vy = np.zeros((n, capacity))
+        self.alive = np.zeros((n, capacity), dtype=bool)
+        self.grazed = np.zeros((n, capacity), dtype=bool)
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in ("x", "y", "w", "h", "vy", "alive", "grazed")}
+        k = self.capacity
+        self._alloc(k * 2)
+        for name, col in old.items():
+            getattr(self, name)[:, :k] = col
+
+    def reset(self, mask=None):
+        """Läufe neu beginnen (mask: bool-Array, None = alle); Rückgabe: Beobachtung."""
+        np = simulation.np
+        self._restart(np.ones(self.n, dtype=bool) if mask is None else mask)
+        return self.observe()
+
+    def _restart(self, mask):
+        np = simulation.np
+        self.t[mask] = 0.0
+        self.steps[mask] = 0
+        self.over[mask] = False
+        self.points[mask] = 0.0
+        self.mult[mask] = 1.0
+        self.player_x[mask] = WIDTH // 2
+        self.player_vx[mask] = 0.0
+        self.dash_ready_t[mask] = 0.0
+        self.dash_active_until[mask] = 0.0
+        self.alive[mask] = False
+        self.grazed[mask] = False
+        idx = np.flatnonzero(mask)
+        self.next_spawn[idx] = self._next_arrival(idx, self.t[idx])
+
+    def score(self):
+        return self.t + self.points
+
+    def dash_charge(self):
+        np = simulation.np
+        return np.clip(1.0 - (self.dash_ready_t - self.t) / DASH_CD, 0.0, 1.0)
+
+    # -------------------------
+    # Spawns (siehe SpawnScheduler)
+    # -------------------------
+
+    def _next_arrival(self, idx, s):
+        np = simulation.np
+        e = self.rng.exponential(1.0, len(idx))
+        accel = self.params["spawn_accel"][idx]
+        lam = self.params["spawn_rate_start"][idx] + accel * s
+        return s + 2.0 * e / (lam + np.sqrt(lam * lam + 2.0 * accel * e))
+
+    def _spawn(self, idx, te, offset):
+        """Je Lauf in idx ein Logo, wie Simulation._spawn_enemy_logo."""
+        np = simulation.np
+        rng = self.rng
+        m = len(idx)
+        free = ~self.alive[idx]
+        while not free.any(axis=1).all():
+            self._grow()
+            free = ~self.alive[idx]
+        slot = np.argmax(free, axis=1)
+
+        d = rng.integers(LOGO_MIN, LOGO_MAX + 1, m) - LOGO_MIN
+        w = self.logo_w[d]
+        h = self.logo_h[d]
+        vy = self.params["enemy_base_speed"][idx] + self.params["enemy_speed_accel"][idx] * te + rng.integers(-30, 71, m)
+        x = rng.integers(10, WIDTH - 10 - w + 1)
+        y = -h - rng.integers(0, 81, m) - vy * offset
+
+        self.x[idx, slot] = x
+        self.y[idx, slot] = y
+        self.w[idx, slot] = w
+        self.h[idx, slot] = h
+        self.vy[idx, slot] = vy
+        self.alive[idx, slot] = True
+        self.grazed[idx, slot] = False
+
+    # -------------------------
+    # Schritt
+    # -------------------------
+
+    def step(self, actions):
+        np = simulation.np
+        dt = self.dt
+        actions = np.asarray(actions)
+        run = ~self.over
+        left = (actions & ACT_LEFT) != 0
+        right = (actions & ACT_RIGHT) != 0
+        score0 = self.t + self.points
+
+        # Sprint: Richtung aus der Eingabe, sonst aus der Geschwindigkeit, sonst zufällig
+        dash = run & ((actions & ACT_DASH) != 0) & (self.t >= self.dash_ready_t)
+        if dash.any():
+            idx = np.flatnonzero(dash)
+            vx = self.player_vx[idx]
+            coin = np.where(self.rng.random(len(idx)) < 0.5, -1.0, 1.0)
+            dir_ = np.where(vx < 0, -1.0, np.where(vx > 0, 1.0, coin))
+            dir_ = np.where(left[idx] & ~right[idx], -1.0, np.where(right[idx] & ~left[idx], 1.0, dir_))
+            t = self.t[idx]
+            self.dash_active_until[idx] = t + DASH_TIME
+            self.player_vx[idx] = dir_ * DASH_SPEED
+            self.dash_ready_t[idx] = t + DASH_CD
+
+        t0 = self.t.copy()
+        self.t[run] += dt
+        self.steps[run] += 1
+        self.total_steps += int(run.sum())
+
+        # Spawn: jeder fällige Zeitpunkt mit seinem Versatz, mehrere je Schritt möglich
+        while True:
+            due = run & (self.next_spawn <= self.t)
+            if not due.any():
+                break
+            idx = np.flatnonzero(due)
+            te = self.next_spawn[idx]
+            self._spawn(idx, te, te - t0[idx])
+            self.next_spawn[idx] = self._next_arrival(idx, te)
+
+        self.mult = np.where(run, np.maximum(1.0, self.mult - self.params["mult_decay"] * dt), self.mult)
+
+        # Bewegung (Beschleunigung + Reibung), während des Sprints keine Steuerung
+        vx = self.player_vx
+        target = np.where(left & ~right, -PLAYER_MAX_SPEED, np.where(right & ~left, PLAYER_MAX_SPEED, 0.0))
+        steer = np.where(vx < target, np.minimum(target, vx + PLAYER_ACCEL * dt),
+                         np.where(vx > target, np.maximum(target, vx - PLAYER_ACCEL * dt), vx))
+        coast = np.where(vx > 0, np.maximum(0.0, vx - PLAYER_FRICTION * dt),
+                         np.where(vx < 0, np.minimum(0.0, vx + PLAYER_FRICTION * dt), vx))
+        free = run & (self.t >= self.dash_active_until)
+        self.player_vx = np.where(free, np.where(target != 0.0, steer, coast), vx)
+
+        half = self.player_w / 2
+        prev_x = self.player_x
+        self.player_x = np.where(run, np.clip(prev_x + self.player_vx * dt, half + 10, WIDTH - half - 10),
+                                 prev_x)
+
+        # Gegner bewegen + Kollision + "knapp vorbei". Broadphase: genau getestet
+        # werden nur Gegner, deren Strecke py..y das Spielerband (+ GRAZE_MARGIN) berührt
+        py = self.y
+        self.y = py + self.vy * (dt * run)[:, None]
+        gm = GRAZE_MARGIN
+        band = self.alive & run[:, None] & (self.y + self.h >= PLAYER_Y - gm) & (py <= PLAYER_Y + self.player_h + gm)
+        ri, ki = np.nonzero(band)
+
+        x1 = self.x[ri, ki]
+        x2 = x1 + self.w[ri, ki]
+        h = self.h[ri, ki]
+        y1_0 = py[ri, ki]
+        y1 = self.y[ri, ki]
+        px1 = self.player_x[ri] - half
+        px2 = self.player_x[ri] + half
+        pdx = self.player_x[ri] - prev_x[ri]
+        pb = (px1, PLAYER_Y, px2, PLAYER_Y + self.player_h)
+        pb0 = (px1 - pdx, PLAYER_Y, px2 - pdx, PLAYER_Y + self.player_h)
+        graze_box = (px1 - gm, PLAYER_Y - gm, px2 + gm, PLAYER_Y + self.player_h + gm)
+        graze0 = (px1 - pdx - gm, PLAYER_Y - gm, px2 - pdx + gm, PLAYER_Y + self.player_h + gm)
+
+        y2_0 = y1_0 + h
+        y2 = y1 + h
+        hit = _swept_window_arrays(x1, y1_0, x2, y2_0, y1, y2, pb0, pb)[0]
+        near = _swept_window_arrays(x1, y1_0, x2, y2_0, y1, y2, graze0, graze_box)[0]
+        hit_run = np.zeros(self.n, dtype=bool)
+        hit_run[ri[hit]] = True
+        sel = near & ~self.grazed[ri, ki] & ~hit_run[ri]
+        self.grazed[ri[sel], ki[sel]] = True
+
+        # Streifer nacheinander wie in Simulation: Punkte mit dem Multiplikator davor
+        count = np.bincount(ri[sel], minlength=self.n)
+        bonus = self.params["graze_bonus"]
+        for i in range(int(count.max()) if count.size else 0):
+            m = count > i
+            self.points[m] += bonus[m] * self.mult[m]
+            self.mult[m] = np.minimum(MULT_MAX, self.mult[m] + GRAZE_MULT_GAIN)
+
+        self.alive &= self.y < ENEMY_CULL_Y
+
+        done = hit_run
+        self.over |= hit_run
+        reward = np.where(run, self.t + self.points - score0, 0.0)
+        if done.any():
+            self.final_score[done] = self.t[done] + self.points[done]
+            self.episodes += int(done.sum())
+            if self.autoreset:
+                self._restart(done)
+        if not self.autoreset:
+            done = self.over.copy()
+        return self.observe(), reward, done
+
+    # -------------------------
+    # Beobachtung
+    # -------------------------
+
+    def observe(self):
+        """
+        float32-Array (N, len(OBS_PLAYER) + obs_enemies·len(OBS_ENEMY)).
+        Gegner nach Abstand über dem Spieler sortiert (schon vorbeigeflogene
+        zählen nicht); dx: Mitte des Gegners minus Spieler-x, dy: Lücke bis zur
+        Oberkante des Spielers.
+        """
+        np = simulation.np
+        n, k = self.n, self.obs_enemies
+        obs = np.zeros((n, len(OBS_PLAYER) + k * len(OBS_ENEMY)), dtype=np.float32)
+        obs[:, 0] = self.player_x
+        obs[:, 1] = self.player_vx
+        obs[:, 2] = self.dash_charge()
+        obs[:, 3] = self.mult
+        obs[:, 4] = self.t
+        if k == 0:
+            return obs
+
+        gap = PLAYER_Y - (self.y + self.h)
+        ahead = self.alive & (self.y < PLAYER_Y + self.player_h)
+        key = np.where(ahead, np.abs(gap), np.inf)
+        if k < self.capacity:
+            order = np.argpartition(key, k, axis=1)[:, :k]
+            order = np.take_along_axis(order, np.argsort(np.take_along_axis(key, order, axis=1), axis=1), axis=1)
+        else:
+            order = np.argsort(key, axis=1)[:, :k]
+        rows = np.arange(n)[:, None]
+        present = ahead[rows, order]
+        cols = (present,
+                self.x[rows, order] + self.w[rows, order] / 2 - self.player_x[:, None],
+                gap[rows, order],
+                self.w[rows, order],
+                self.h[rows, order],
+                self.vy[rows, order])
+        width = len(OBS_ENEMY)
+        for j, col in enumerate(cols):
+            obs[:, len(OBS_PLAYER) + j::width][:, :col.shape[1]] = np.where(present, col, 0.0)
+        return obs
+
+
+# -------------------------
+# Durchsatz messen (python spiel.py batch)
+# -------------------------
+
+def random_actions(sim: BatchSimulation, dash_p: float = 0.02):
+    """Links/rechts/nichts gleich wahrscheinlich, gelegentlich ein Sprint."""
+    rng = sim.rng
+    actions = rng.integers(0, 3, sim.n)
+    return actions | (rng.random(sim.n) < dash_p) * ACT_DASH
+
+
+def batch_main(argv=None):
+    parser = argparse.ArgumentParser(prog="spiel.py batch",
+                                     description="AUSWEICHEN — viele Läufe gleichzeitig (Durchsatz)")
+    parser.add_argument("--envs", type=int, default=BATCH_ENVS, help=f"Läufe im Gleichschritt (Standard: {BATCH_ENVS})")
+    parser.add_argument("--steps", type=int, default=BATCH_STEPS, help=f"Schritte je Lauf (Standard: {BATCH_STEPS})")
+    parser.add_argument("--seed", type=int, default=None)
+    for name, default in BATCH_PARAMS.items():
+        parser.add_argument("--" + name.replace("_", "-"), type=float, default=default)
+    args = parser.parse_args(argv)
+
+    if load_numpy() is None:
+        print("[FEHLER] NumPy nicht installiert — ohne NumPy gibt es keine Batch-Läufe.")
+        return None
+    params = {name: getattr(args, name) for name in BATCH_PARAMS}
+    sim = BatchSimulation(args.envs, seed=args.seed, **params)
+    scores = []
+    t0 = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, done = sim.step(random_actions(sim))
+        if done.any():
+            scores.extend(sim.final_score[done].tolist())
+    elapsed = time.perf_counter() - t0
+
+    rate = sim.total_steps / elapsed if elapsed > 0 else 0.0
+    print(f"[BATCH] {args.envs} Läufe × {args.steps} Schritte: {rate:,.0f} Schritte/s "
+          f"({elapsed:.2f} s, {sim.capacity} Gegnerplätze je Lauf)")
+    if scores:
+        ordered = sorted(scores)
+        mean = sum(ordered) / len(ordered)
+        print(f"[BATCH] {len(ordered)} Läufe beendet (Zufallseingaben): Punkte Mittel {mean:.1f}, "
+              f"Median {ordered[len(ordered) // 2]:.1f}, max {ordered[-1]:.1f}")
+    return {"steps_per_s": rate, "scores": scores}
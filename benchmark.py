@@ -0,0 +1,373 @@
+import argparse
+import base64
+import json
+import os
+import platform
+import sys
+import time
+import tkinter as tk
+
+from profiler import CountingTk, percentile
+from render import RENDER_BACKENDS
+from simulation import (
+    GRAZE_MARGIN, LOGO_MIN, LOGO_MAX,
+    ENEMY_STORES, BROADPHASES, png_size, load_numpy,
+)
+import spiel
+
+# -------------------------
+# AUSWEICHEN — Benchmark
+# Feste Szenarien, feste Frame-Zeit, fester Seed: gleiche Arbeit in jedem Build.
+#
+#   python spiel.py bench                    # alle Szenarien, Attrappe + Tk
+#   xvfb-run python spiel.py bench --mode tk # Tk unter virtuellem Framebuffer
+#   python spiel.py bench --scenario logos_1000 --render framebuffer
+# -------------------------
+
+BENCH_FRAMES = 600
+BENCH_WARMUP = 240              # Frames vorweg (nicht gemessen), bis sich Logos verteilt haben
+BENCH_FRAME_DT = 1.0 / 60
+BENCH_SEED = 12345
+BENCH_OUT = "bench_results.json"
+
+LATE_GAME_T = 600.0             # "spätes Spiel": 10 Minuten Schwierigkeitsanstieg
+GRAZE_STORM_PER_FRAME = 6       # Logos pro Frame knapp neben dem Spieler
+
+
+# -------------------------
+# Attrappen ohne Tk (reine Logik-Kosten)
+# -------------------------
+
+class StubRoot:
+    def title(self, *args):
+        pass
+
+    def resizable(self, *args):
+        pass
+
+    def bind(self, *args):
+        pass
+
+    def after(self, ms, func=None, *args):
+        return "after#stub"
+
+    def after_cancel(self, after_id):
+        pass
+
+    def update(self):
+        pass
+
+    def destroy(self):
+        pass
+
+
+class StubCanvas:
+    """Nimmt Canvas-Aufrufe an, merkt sich nur Koordinaten; `calls` zählt wie Tcl-Aufrufe."""
+
+    def __init__(self, root, **options):
+        self.coords_of = {}
+        self.next_id = 1
+        self.calls = 0
+
+    def pack(self, *args, **kwargs):
+        pass
+
+    def _create(self, coords):
+        self.calls += 1
+        cid = self.next_id
+        self.next_id += 1
+        self.coords_of[cid] = list(coords)
+        return cid
+
+    def create_line(self, *coords, **options):
+        return self._create(coords)
+
+    def create_oval(self, *coords, **options):
+        return self._create(coords)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create(coords)
+
+    def create_text(self, *coords, **options):
+        return self._create(coords)
+
+    def create_image(self, *coords, **options):
+        return self._create(coords)
+
+    def delete(self, *items):
+        self.calls += 1
+        for cid in items:
+            if cid == "all":
+                self.coords_of.clear()
+            else:
+                self.coords_of.pop(cid, None)
+
+    def coords(self, cid, *coords):
+        self.calls += 1
+        if not coords:
+            return list(self.coords_of.get(cid, ()))
+        self.coords_of[cid] = list(coords)
+
+    def move(self, tag_or_id, dx, dy):
+        self.calls += 1
+
+    def itemconfig(self, tag_or_id, **options):
+        self.calls += 1
+
+    def tag_raise(self, *args):
+        self.calls += 1
+
+    def bbox(self, cid):
+        self.calls += 1
+        return None
+
+    def find_all(self):
+        self.calls += 1
+        return tuple(self.coords_of)
+
+
+class StubPhotoImage:
+    """Nur Größen: aus dem PNG-Kopf (Datei oder data=)."""
+
+    def __init__(self, file=None, data=None, width=0, height=0, **options):
+        self.w, self.h = width, height
+        if data is not None:
+            head = base64.b64decode(data)[:24]
+            self.w, self.h = int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")
+        if file is not None:
+            size = png_size(file)
+            if size is None:
+                raise tk.TclError(f"couldn't open \"{file}\"")
+            self.w, self.h = size
+
+    def width(self):
+        return self.w
+
+    def height(self):
+        return self.h
+
+    def put(self, data, to=None):
+        pass
+
+
+class StubGame(spiel.Game):
+    Canvas = StubCanvas
+    PhotoImage = StubPhotoImage
+
+
+# -------------------------
+# Szenarien
+# -------------------------
+
+def _spawn_at(sim, x):
+    """Ein Logo wie Simulation._spawn_enemy_logo, aber an fester x-Position."""
+    rng = sim.rng
+    desired = rng.randint(LOGO_MIN, LOGO_MAX)
+    key = sim._pick_logo_size(desired)
+    w, h = (desired, desired) if key is None else sim.logo_sizes[key]
+    vy = sim.enemy_base_speed + sim.enemy_speed_accel * sim.t + rng.randint(-30, 70)
+    sim.enemies.spawn(x(w), -h - rng.randint(0, 80), w, h, vy, key)
+
+
+def _play(game):
+    game.start()
+    game.sim.invulnerable = True    # konstante Last statt Game Over
+
+
+def _setup_late(game):
+    _play(game)
+    game.sim.skip_to(LATE_GAME_T)
+
+
+def _forced(n):
+    def per_frame(game):
+        sim = game.sim
+        while len(sim.enemies) < n:
+            sim._spawn_enemy_logo(sim.t)
+    return per_frame
+
+
+def _graze_storm(game):
+    sim = game.sim
+    pb = sim.player_box()
+    for i in range(GRAZE_STORM_PER_FRAME):
+        if i % 2:
+            _spawn_at(sim, lambda w: pb[2] + GRAZE_MARGIN // 2)
+        else:
+            _spawn_at(sim, lambda w: pb[0] - GRAZE_MARGIN // 2 - w)
+
+
+# Name → (Vorbereitung, pro Frame vor dem Messen oder None)
+SCENARIOS = {
+    "menu_idle": (lambda game: None, None),
+    "early_game": (_play, None),
+    "late_game": (_setup_late, None),
+    "logos_100": (_play, _forced(100)),
+    "logos_500": (_play, _forced(500)),
+    "logos_1000": (_play, _forced(1000)),
+    "logos_5000": (_play, _forced(5000)),
+    "graze_storm": (_play, _graze_storm),
+}
+MODES = ("stub", "tk")
+
+
+def _calls(game, counter) -> int:
+    return counter.calls + (game.fb.uploads if game.fb is not None else 0)
+
+
+def run_scenario(name: str, mode: str, frames: int = BENCH_FRAMES, warmup: int = BENCH_WARMUP,
+                 seed: int = BENCH_SEED, **game_kwargs) -> dict:
+    setup, per_frame = SCENARIOS[name]
+
+    # counter.calls zählt Canvas-Aufrufe (Attrappe) bzw. Tcl-Aufrufe (Tk),
+    # dazu kommen die put-Aufrufe des Framebuffers (gehen nicht übers Canvas)
+    if mode == "stub":
+        root = StubRoot()
+        game = StubGame(root, seed=seed, autorun=False, **game_kwargs)
+        counter = game.canvas
+    else:
+        root = tk.Tk()
+        game = spiel.Game(root, seed=seed, autorun=False, **game_kwargs)
+        game.canvas.tk = counter = CountingTk(game.canvas.tk)
+        root.update()
+
+    game.wait_assets()
+    setup(game)
+
+    times = []
+    enemies = []
+    popups = []
+    calls0 = saved0 = tests0 = skipped0 = 0
+    for i in range(warmup + frames):
+        if i == warmup:
+            calls0 = _calls(game, counter)
+            saved0 = game.view.saved
+            tests0, skipped0 = game.sim.enemies.pair_tests, game.sim.enemies.pair_skipped
+        if per_frame is not None:
+            per_frame(game)
+
+        t0 = time.perf_counter()
+        game._frame(BENCH_FRAME_DT)
+        root.update()           # Tk: hier wird wirklich gezeichnet
+        t1 = time.perf_counter()
+
+        if i >= warmup:
+            times.append(t1 - t0)
+            enemies.append(len(game.sim.enemies))
+            popups.append(len(game.sim.popups))
+
+    canvas_calls = _calls(game, counter) - calls0
+    saved_calls = game.view.saved - saved0
+    pair_tests = game.sim.enemies.pair_tests - tests0
+    pair_skipped = game.sim.enemies.pair_skipped - skipped0
+    pools = game.pool_stats()
+
+    # Übungsmodus: jeden Zustand im Puffer einmal wiederherstellen (Aufnahme lief schon mit)
+    rewind = None
+    if game.rewind is not None:
+        rewind = game.rewind.stats()
+        while game.rewind.restore(game.sim):
+            pass
+        rewind["restore_ms"] = game.rewind.stats()["restore_ms"]
+    root.destroy()
+
+    ordered = sorted(times)
+    return {
+        "scenario": name,
+        "mode": mode,
+        "enemy_store": game.sim.enemies.kind,      # ohne --enemy-store: mit --practice Arrays
+        "frames": frames,
+        "ticks_per_s": frames / sum(times) if sum(times) > 0 else 0.0,
+        "frame_ms": {
+            "mean": sum(times) / frames * 1000.0,
+            "p50": percentile(ordered, 0.50) * 1000.0,
+            "p95": percentile(ordered, 0.95) * 1000.0,
+            "p99": percentile(ordered, 0.99) * 1000.0,
+            "max": ordered[-1] * 1000.0,
+        },
+        "enemies_mean": sum(enemies) / frames,
+        "popups_max": max(popups),
+        "canvas_calls_per_frame": canvas_calls / frames,
+        "saved_calls_per_frame": saved_calls / frames,
+        "pair_tests_per_frame": pair_tests / frames,
+        "pair_skipped_per_frame": pair_skipped / frames,
+        "pools": pools,
+        "sprites": game.sprites.stats(),
+        "rewind": rewind,
+    }
+
+
+def _tk_available() -> bool:
+    try:
+        tk.Tk().destroy()
+        return True
+    except tk.TclError:
+        return False
+
+
+def bench_main(argv=None):
+    parser = argparse.ArgumentParser(prog="spiel.py bench",
+                                     description="AUSWEICHEN — reproduzierbare Benchmarks")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="nur diese Szenarien (mehrfach möglich; Standard: alle)")
+    parser.add_argument("--mode", choices=MODES + ("both",), default="both",
+                        help="stub = reine Logik, tk = echtes Canvas (Display/xvfb nötig)")
+    parser.add_argument("--frames", type=int, default=BENCH_FRAMES)
+    parser.add_argument("--warmup", type=int, default=BENCH_WARMUP)
+    parser.add_argument("--seed", type=int, default=BENCH_SEED)
+    parser.add_argument("--enemy-store", choices=sorted(ENEMY_STORES), default=None,
+                        help="Standard: list, mit --practice array (siehe spiel.Game)")
+    parser.add_argument("--broadphase", choices=BROADPHASES, default="grid")
+    parser.add_argument("--collision", choices=("mask", "box"), default="mask")
+    parser.add_argument("--render", choices=RENDER_BACKENDS, default="canvas")
+    parser.add_argument("--quality", choices=spiel.QUALITY_CHOICES[1:], default="0",
+                        help="feste Darstellungsstufe (der Regler läuft hier nicht mit)")
+    parser.add_argument("--practice", action="store_true",
+                        help="Übungsmodus: Zustand je Schritt aufnehmen, danach alle wiederherstellen")
+    parser.add_argument("--out", default=BENCH_OUT, help=f"JSON-Ergebnisdatei (Standard: {BENCH_OUT})")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or list(SCENARIOS)
+    modes = list(MODES) if args.mode == "both" else [args.mode]
+    if "tk" in modes and not _tk_available():
+        print("[BENCH] Kein Display — Tk-Modus übersprungen (z. B. mit xvfb-run starten).")
+        modes.remove("tk")
+
+    game_kwargs = {"enemy_store": args.enemy_store, "broadphase": args.broadphase,
+                   "collision": args.collision, "render": args.render, "quality": args.quality,
+                   "practice": args.practice}
+    results = []
+    print(f"{'Szenario':<14}{'Modus':<6}{'Ticks/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+          f"{'Logos':>8}{'Calls':>9}{'gespart':>9}{'Paare':>8}{'gespart':>9}")
+    for name in scenarios:
+        for mode in modes:
+            r = run_scenario(name, mode, args.frames, args.warmup, args.seed, **game_kwargs)
+            results.append(r)
+            ms = r["frame_ms"]
+            print(f"{name:<14}{mode:<6}{r['ticks_per_s']:10.0f}{ms['p50']:9.3f}{ms['p95']:9.3f}"
+                  f"{ms['p99']:9.3f}{ms['max']:9.3f}{r['enemies_mean']:8.0f}"
+                  f"{r['canvas_calls_per_frame']:9.0f}{r['saved_calls_per_frame']:9.0f}"
+                  f"{r['pair_tests_per_frame']:8.0f}{r['pair_skipped_per_frame']:9.0f}")
+            rw = r["rewind"]
+            if rw is not None:
+                print(f"{'':<20}Zurückspulen: Aufnahme p50 {rw['capture_us']['p50']:.0f} µs, "
+                      f"p95 {rw['capture_us']['p95']:.0f} µs, {rw['bytes_mean']:.0f} B/Zustand; "
+                      f"Wiederherstellen p50 {rw['restore_ms']['p50']:.3f} ms, p95 {rw['restore_ms']['p95']:.3f} ms")
+
+    np = load_numpy()
+    meta = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "tk": tk.TkVersion,
+        "numpy": np.__version__ if np is not None else None,
+        "frames": args.frames,
+        "warmup": args.warmup,
+        "frame_dt": BENCH_FRAME_DT,
+        "seed": args.seed,
+        **game_kwargs,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"[BENCH] Ergebnisse → {os.path.abspath(args.out)}")
+    return results
@@ -0,0 +1,239 @@
+import csv
+import json
+import time
+from collections import deque
+
+# -------------------------
+# AUSWEICHEN — Frame-Profiler
+# Misst pro Frame die Zeit je Phase und ein paar Zähler.
+# Ausgeschaltet ist der Profiler einfach None — die Aufrufer prüfen
+# `if prof is not None`, sonst kostet er nichts.
+# -------------------------
+
+# Reihenfolge im Overlay und in der Export-Datei
+PHASES = ("starfield", "spawn", "player", "enemies", "popups", "render", "hud")
+COUNTERS = ("enemies_alive", "items", "tcl_calls", "tcl_saved", "quality", "pair_tests", "pair_skipped")
+
+PROFILE_WINDOW = 600            # Frames für die laufenden Perzentile (~10 s bei 60 FPS)
+PROFILE_KEEP = 200_000          # Frames, die für den Export aufgehoben werden
+LATENCY_KEEP = 2000             # Tastenereignisse für die Latenz-Perzentile
+
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[i]
+
+
+class FrameProfiler:
+    """
+    begin_frame() — lap(phase) … — end_frame(**counters)
+
+    lap(phase) schreibt die Zeit seit dem letzten lap/begin_frame der Phase gut;
+    mehrfach pro Frame (z. B. mehrere Simulationsschritte) wird addiert.
+    """
+
+    def __init__(self, window: int = PROFILE_WINDOW, keep: int = PROFILE_KEEP):
+        self.recent = deque(maxlen=window)
+        self.samples = deque(maxlen=keep)
+        self.frame = 0
+        self._times = dict.fromkeys(PHASES, 0.0)
+        self._t = 0.0
+        self._frame_start = None
+        self._interval = 0.0
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        self._interval = now - self._frame_start if self._frame_start is not None else 0.0
+        self._frame_start = now
+        self._t = now
+        for k in self._times:
+            self._times[k] = 0.0
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self._times[phase] += now - self._t
+        self._t = now
+
+    def end_frame(self, **counters):
+        total = self._t - self._frame_start
+        row = {"frame": self.frame, "total": total, "interval": self._interval}
+        row.update(self._times)
+        for k in COUNTERS:
+            row[k] = counters.get(k, 0)
+        self.recent.append(row)
+        self.samples.append(row)
+        self.frame += 1
+
+    # -------------------------
+    # Auswertung
+    # -------------------------
+
+    def stats(self) -> dict:
+        """{Spalte: {"p50", "p95", "p99", "max"}} über das laufende Fenster (Zeiten in ms)."""
+        out = {}
+        for key in ("total", "interval") + PHASES + COUNTERS:
+            values = sorted(row[key] for row in self.recent)
+            scale = 1.0 if key in COUNTERS else 1000.0
+            out[key] = {
+                "p50": percentile(values, 0.50) * scale,
+                "p95": percentile(values, 0.95) * scale,
+                "p99": percentile(values, 0.99) * scale,
+                "max": (values[-1] if values else 0.0) * scale,
+            }
+        return out
+
+    def overlay_text(self) -> str:
+        st = self.stats()
+        lines = [f"{'Phase':<10}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}  ms"]
+        for key in PHASES + ("total", "interval"):
+            s = st[key]
+            lines.append(f"{key:<10}{s['p50']:7.2f}{s['p95']:7.2f}{s['p99']:7.2f}{s['max']:7.2f}")
+        c = {k: st[k]["p50"] for k in COUNTERS}
+        lines.append(f"Logos {c['enemies_alive']:.0f}   Items {c['items']:.0f}   Tcl/Frame {c['tcl_calls']:.0f}"
+                     f" (gespart {c['tcl_saved']:.0f})   Qualität {st['quality']['max']:.0f}")
+        lines.append(f"Paartests {c['pair_tests']:.0f}   durch Broadphase gespart {c['pair_skipped']:.0f}")
+        return "\n".join(lines)
+
+    def export(self, path: str):
+        """Alle aufgehobenen Frames als CSV oder JSON (nach Dateiendung)."""
+        fields = ["frame", "total", "interval"] + list(PHASES) + list(COUNTERS)
+        rows = list(self.samples)
+        if path.lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"fields": fields, "units": "s", "stats_ms": self.stats(),
+                           "frames": [[row[k] for k in fields] for row in rows]}, f)
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(fields)
+                for row in rows:
+                    w.writerow([row[k] for k in fields])
+
+
+class CountingTk:
+    """
+    Stellvertreter für widget.tk, der Tcl-Aufrufe zählt.
+    Wird nur bei eingeschaltetem Profiler eingesetzt.
+    """
+
+    def __init__(self, tk):
+        self._tk = tk
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self._tk.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._tk, name)
+
+
+class StartupTrace:
+    """
+    Zeitpunkte der Startphasen (--trace-startup), gemessen ab t0.
+    Wie der Profiler: ausgeschaltet ist die Spur None.
+    """
+
+    def __init__(self, t0: float = None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.marks = []
+
+    def mark(self, stage: str):
+        self.marks.append((stage, time.perf_counter() - self.t0))
+
+    def at(self, stage: str):
+        """Sekunden ab t0 bis zur Phase (oder None, falls noch nicht erreicht)."""
+        for name, t in self.marks:
+            if name == stage:
+                return t
+        return None
+
+    def report(self) -> str:
+        lines = [f"{'Phase':<22}{'ab Start':>10}{'Dauer':>9}  ms"]
+        prev = 0.0
+        for stage, t in self.marks:
+            lines.append(f"{stage:<22}{t * 1000.0:10.1f}{(t - prev) * 1000.0:9.1f}")
+            prev = t
+        return "\n".join(lines)
+
+
+class InputLatency:
+    """
+    Zeit vom Tastenereignis bis zum gezeichneten Bild mit seiner Wirkung.
+
+    key() beim Ereignis, consumed() wenn ein Simulationsschritt die Eingabe
+    übernimmt (bei festem Takt nicht zwingend im nächsten Frame; mit upto nur
+    Tasten bis zu diesem Zeitpunkt, --threaded), painted() nachdem Tk das Bild
+    dieses Frames gezeichnet hat.
+    """
+
+    def __init__(self, keep: int = LATENCY_KEEP):
+        self.pending = []
+        self.stepped = []
+        self.samples = deque(maxlen=keep)
+
+    def key(self, t: float):
+        self.pending.append(t)
+
+    def consumed(self, upto: float = None):
+        if not self.pending:
+            return
+        if upto is None:
+            self.stepped += self.pending
+            self.pending = []
+        else:
+            self.stepped += [t for t in self.pending if t <= upto]
+            self.pending = [t for t in self.pending if t > upto]
+
+    @property
+    def waiting(self) -> bool:
+        """Wartet eine übernommene Eingabe aufs Zeichnen?"""
+        return bool(self.stepped)
+
+    def painted(self, t: float):
+        for t0 in self.stepped:
+            self.samples.append(t - t0)
+        self.stepped = []
+
+    def stats(self) -> dict:
+        """{"n", "p50", "p95", "p99", "max"} in ms"""
+        values = sorted(self.samples)
+        return {
+            "n": len(values),
+            "p50": percentile(values, 0.50) * 1000.0,
+            "p95": percentile(values, 0.95) * 1000.0,
+            "p99": percentile(values, 0.99) * 1000.0,
+            "max": (values[-1] if values else 0.0) * 1000.0,
+        }
+
+
+class IdleMeter:
+    """
+    CPU-Zeit des Prozesses (alle Threads, time.process_time) je Zustand.
+    switch(key, now) schreibt die Zeit seit dem letzten switch dem bis dahin
+    gültigen Zustand gut und macht key zum neuen — Wartezeit und Frame danach
+    zählen also zu dem Zustand, in dem gewartet wurde.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.t = 0.0
+        self.cpu = 0.0
+        self.totals = {}            # key → [Sekunden, CPU-Sekunden]
+
+    def switch(self, key: str, now: float):
+        cpu = time.process_time()
+        if self.key is not None:
+            total = self.totals.setdefault(self.key, [0.0, 0.0])
+            total[0] += now - self.t
+            total[1] += cpu - self.cpu
+        self.key, self.t, self.cpu = key, now, cpu
+
+    def stats(self) -> dict:
+        """{Zustand: {"wall_s", "cpu_s", "cpu_pct"}}"""
+        return {
+            key: {"wall_s": wall, "cpu_s": cpu, "cpu_pct": 100.0 * cpu / wall if wall > 0 else 0.0}
+            for key, (wall, cpu) in self.totals.items()
+        }
@@ -0,0 +1,480 @@
+from collections import deque
+
+from profiler import percentile
+from simulation import load_numpy
+
+# -------------------------
+# AUSWEICHEN — Canvas-Hilfen für die Anzeige (spiel.py)
+# -------------------------
+
+# Anzeige: "canvas" = ein Canvas-Item je Objekt, "framebuffer" = Szene als ein Bild (NumPy)
+RENDER_BACKENDS = ("canvas", "framebuffer")
+
+# Framebuffer: Kachel- und Randbreite mal 3 Byte (RGB) sind Vielfache von 8 —
+# verglichen wird in 64-Bit-Worten statt Byte für Byte
+FB_TILE = 16                    # Kachelgröße für den Vergleich mit dem zuletzt gesendeten Bild
+FB_MERGE_GAP = 2                # so viele saubere Kacheln zwischen zwei geänderten werden mitgeschickt
+FB_FULL_UPLOAD = 0.5            # ab diesem Anteil geänderter Kacheln geht das ganze Bild an Tk
+FB_PAD = 96                     # unsichtbarer Rand: Sprites bis zu dieser Größe brauchen kein Zuschneiden
+
+PACE_WINDOW = 600               # Frames für die Verspätungs-Perzentile des Frame-Takts
+
+# Qualitätsregler: entschieden wird je Fenster von QUALITY_WINDOW Frames
+QUALITY_WINDOW = 30
+QUALITY_LATE_FRAC = 0.2         # so viele Frames über dem Budget → eine Stufe zurück
+QUALITY_HEADROOM = 0.5          # alle Frames unter diesem Anteil des Budgets …
+QUALITY_UP_WINDOWS = 4          # … so viele Fenster in Folge → eine Stufe hoch
+
+# Platzhalter-Koordinaten je Item-Art beim Vorab-Anlegen
+_EMPTY_COORDS = {
+    "image": (0, 0),
+    "text": (0, 0),
+    "oval": (0, 0, 0, 0),
+    "rectangle": (0, 0, 0, 0),
+}
+
+
+class ItemPool:
+    """
+    Vorab angelegte Canvas-Items einer Art (image/text/oval/rectangle).
+
+    acquire() holt ein verstecktes Item und setzt Koordinaten + Optionen,
+    release() versteckt es wieder (state="hidden") statt es zu löschen.
+    Ist der Pool leer, wird ein neues Item angelegt (Miss) — der Pool wächst.
+
+    images: Bildquelle mit pin()/unpin() (sprites.SpriteCache) — Bilder, die ein
+    belegtes Item zeigt, bleiben dort geladen. Bilder wechseln dann nur über
+    acquire() und set_image(); canvas muss ein RetainedCanvas sein.
+    """
+
+    def __init__(self, canvas, kind: str, size: int = 0, tag: str = "", images=None, **defaults):
+        self.canvas = canvas
+        self.kind = kind
+        self.tag = tag
+        self.images = images
+        self.shown = {}             # cid → Bild (nur mit images)
+        self.defaults = defaults
+        self.free = []
+        self.created = 0
+        self.hits = 0
+        self.misses = 0
+        for _ in range(size):
+            self.free.append(self._create())
+
+    def _create(self):
+        create = getattr(self.canvas, "create_" + self.kind)
+        self.created += 1
+        tags = (self.tag,) if self.tag else ()
+        return create(*_EMPTY_COORDS[self.kind], state="hidden", tags=tags, **self.defaults)
+
+    def acquire(self, coords, **options):
+        if self.free:
+            cid = self.free.pop()
+            self.hits += 1
+        else:
+            cid = self._create()
+            self.misses += 1
+        self.canvas.coords(cid, *coords)
+        self.canvas.itemconfig(cid, state="normal", **options)
+        if self.images is not None and options.get("image") is not None:
+            self.images.pin(options["image"])
+            self.shown[cid] = options["image"]
+        return cid
+
+    def set_image(self, cid, img):
+        """Bild eines belegten Items wechseln."""
+        if self.images is not None:
+            old = self.shown.get(cid)
+            if old is img:
+                return
+            self.images.pin(img)
+            self.shown[cid] = img
+            if old is not None:
+                self.images.unpin(old)
+        self.canvas.itemconfig(cid, image=img)
+
+    def release(self, cid):
+        self.canvas.itemconfig(cid, state="hidden")
+        if self.images is not None and cid in self.shown:
+            # auch der gemerkte Stand hält das Bild nicht mehr fest (RetainedCanvas)
+            self.images.unpin(self.shown.pop(cid))
+            self.canvas.forget_options(cid, "image")
+        self.free.append(cid)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.created,
+            "in_use": self.created - len(self.free),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class RetainedCanvas:
+    """
+    Schicht zwischen Spielzustand und tk.Canvas: merkt sich je Item, was zuletzt
+    an Tk ging (Koordinaten und Optionen wie text/image/state), und schickt nur
+    Änderungen. move() sammelt pro Item/Tag und Frame, flush() schickt dann
+    einen Aufruf je Ziel. Alles andere (create_*, delete, tag_raise, …) geht
+    unverändert durch.
+
+    Items, die hierüber laufen, nur noch hierüber ändern — sonst stimmt der
+    gemerkte Stand nicht mehr. Mit move() bewegte Ziele nicht zusätzlich per
+    coords() setzen.
+
+    sent/saved zählen gesendete bzw. eingesparte Tcl-Aufrufe bis zum letzten
+    end_frame(); end_frame() liefert und leert die Zahlen des laufenden Frames.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.coords_of = {}
+        self.options_of = {}
+        self.moves = {}
+        self.sent = 0
+        self.saved = 0
+        self.frame_sent = 0
+        self.frame_saved = 0
+
+    def __getattr__(self, name):
+        return getattr(self.canvas, name)
+
+    def coords(self, cid, *coords):
+        if not coords:
+            known = self.coords_of.get(cid)
+            return list(known) if known is not None else self.canvas.coords(cid)
+        if self.coords_of.get(cid) == coords:
+            self.frame_saved += 1
+            return
+        self.coords_of[cid] = coords
+        self.canvas.coords(cid, *coords)
+        self.frame_sent += 1
+
+    def itemconfig(self, cid, **options):
+        known = self.options_of.setdefault(cid, {})
+        changed = {k: v for k, v in options.items() if k not in known or known[k] != v}
+        if not changed:
+            self.frame_saved += 1
+            return
+        known.update(changed)
+        self.canvas.itemconfig(cid, **changed)
+        self.frame_sent += 1
+
+    def forget_options(self, cid, *names):
+        """Gemerkte Optionen vergessen: der nächste itemconfig schickt sie wieder."""
+        known = self.options_of.get(cid)
+        if known is not None:
+            for name in names:
+                known.pop(name, None)
+
+    def move(self, tag_or_id, dx, dy):
+        m = self.moves.get(tag_or_id)
+        if m is None:
+            self.moves[tag_or_id] = [dx, dy]
+        else:
+            m[0] += dx
+            m[1] += dy
+            self.frame_saved += 1
+
+    def flush(self):
+        for key, (dx, dy) in self.moves.items():
+            if dx or dy:
+                self.canvas.move(key, dx, dy)
+                self.frame_sent += 1
+            else:
+                self.frame_saved += 1
+        self.moves.clear()
+
+    def end_frame(self):
+        """Rückgabe: (gesendet, gespart) seit dem letzten end_frame()."""
+        self.flush()
+        counts = (self.frame_sent, self.frame_saved)
+        self.sent += self.frame_sent
+        self.saved += self.frame_saved
+        self.frame_sent = 0
+        self.frame_saved = 0
+        return counts
+
+
+def hex_rgb(color: str):
+    """"#RRGGBB" → (r, g, b)"""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+class Framebuffer:
+    """
+    Die ganze Szene (ohne Text) in einem PhotoImage statt vieler Canvas-Items.
+
+    Pro Frame: begin() legt den Hintergrund hinein, blit() zeichnet ein Sprite
+    an vielen Positionen (Slice-Kopien, NumPy), present() vergleicht kachelweise
+    mit dem zuletzt gesendeten Bild und schickt nur geänderte Bereiche als PPM
+    an Tk — nahe beieinanderliegende Kacheln als ein Rechteck. Tk zeichnet dann
+    auch nur diese Bereiche neu, egal wie viele Sprites darin liegen.
+
+    Sprites werden einmal mit add_*() als Arrays abgelegt. Sie dürfen höchstens
+    FB_PAD groß sein: der Puffer hat rundherum so viel unsichtbaren Rand,
+    dass am Bildrand nichts zugeschnitten werden muss.
+
+    uploads/upload_bytes zählen gesendete put-Aufrufe bzw. Bytes insgesamt.
+    """
+
+    def __init__(self, photo, background):
+        np = load_numpy()
+        if np is None:
+            raise RuntimeError("NumPy ist nicht installiert")
+        self.photo = photo
+        self.h, self.w = background.shape[:2]
+        if self.w % FB_TILE or self.h % FB_TILE:
+            raise ValueError(f"Bildgröße {self.w}x{self.h} ist kein Vielfaches von {FB_TILE}")
+        self.background = background
+        self.buf = np.zeros((self.h + 2 * FB_PAD, self.w + 2 * FB_PAD, 3), dtype=np.uint8)
+        self.screen = self.buf[FB_PAD:FB_PAD + self.h, FB_PAD:FB_PAD + self.w]
+        self.front = np.zeros((self.h, self.w, 3), dtype=np.uint8)
+        self.sent = False           # front ist erst nach dem ersten present() gültig
+        # dieselben Pixel als 64-Bit-Worte (Zeile für Zeile) für den Vergleich
+        words = self.buf.reshape(self.buf.shape[0], -1).view(np.uint64)
+        self.screen_words = words[FB_PAD:FB_PAD + self.h, FB_PAD * 3 // 8:(FB_PAD + self.w) * 3 // 8]
+        self.front_words = self.front.reshape(self.h, -1).view(np.uint64)
+        self.sprites = {}           # Schlüssel → (RGB, Deckkraft oder None)
+        self.uploads = 0
+        self.upload_bytes = 0
+
+    # -------------------------
+    # Sprites
+    # -------------------------
+
+    def has(self, key) -> bool:
+        return key in self.sprites
+
+    def _add(self, key, rgb, alpha):
+        h, w = rgb.shape[:2]
+        if w > FB_PAD or h > FB_PAD:
+            raise ValueError(f"Sprite {key!r} ({w}x{h}) ist größer als FB_PAD ({FB_PAD})")
+        self.sprites[key] = (rgb, alpha)
+
+    def add_sprite(self, key, w: int, h: int, channels: int, pixels: bytes):
+        """Sprite aus dekodierten Pixeln (sprites.decode_png); voll deckend ohne Mischen."""
+        np = load_numpy()
+        img = np.frombuffer(pixels, dtype=np.uint8).reshape(h, w, channels)
+        alpha = None
+        if channels == 4 and img[..., 3].min() < 255:
+            alpha = img[..., 3:4] / 255.0
+        self._add(key, np.ascontiguousarray(img[..., :3]), alpha)
+
+    def add_rect(self, key, w: int, h: int, color: str):
+        np = load_numpy()
+        rgb = np.empty((h, w, 3), dtype=np.uint8)
+        rgb[...] = hex_rgb(color)
+        self._add(key, rgb, None)
+
+    def add_ellipse(self, key, w: int, h: int, color: str, opacity: float = 1.0):
+        """Gefüllte Ellipse im w×h-Rechteck (wie create_oval ohne Rand); opacity < 1 mischt."""
+        np = load_numpy()
+        yy, xx = np.mgrid[0:h, 0:w]
+        inside = ((xx + 0.5 - w / 2) / (w / 2)) ** 2 + ((yy + 0.5 - h / 2) / (h / 2)) ** 2 <= 1.0
+        rgb = np.empty((h, w, 3), dtype=np.uint8)
+        rgb[...] = hex_rgb(color)
+        if opacity >= 1.0:
+            alpha = inside[..., None]
+        else:
+            alpha = inside[..., None] * opacity
+        self._add(key, rgb, alpha)
+
+    # -------------------------
+    # Frame
+    # -------------------------
+
+    def begin(self):
+        self.screen[...] = self.background
+
+    def blit(self, key, xs, ys, dy: float = 0.0):
+        """
+        Sprite mit der linken oberen Ecke an (xs[i], ys[i] + dy), auf ganze Pixel
+        gerundet. Was ganz außerhalb des Bildes liegt, fällt vorher weg.
+        """
+        np = load_numpy()
+        rgb, alpha = self.sprites[key]
+        h, w = rgb.shape[:2]
+        xs = np.floor(np.asarray(xs, dtype=np.float64) + 0.5).astype(np.int64)
+        ys = np.floor(np.asarray(ys, dtype=np.float64) + (dy + 0.5)).astype(np.int64)
+        keep = (xs > -w) & (xs < self.w) & (ys > -h) & (ys < self.h)
+        xs = (xs[keep] + FB_PAD).tolist()
+        ys = (ys[keep] + FB_PAD).tolist()
+
+        buf = self.buf
+        if alpha is None:
+            for x, y in zip(xs, ys):
+                buf[y:y + h, x:x + w] = rgb
+        elif alpha.dtype == np.bool_:
+            for x, y in zip(xs, ys):
+                np.copyto(buf[y:y + h, x:x + w], rgb, where=alpha)
+        else:
+            for x, y in zip(xs, ys):
+                dst = buf[y:y + h, x:x + w]
+                dst[...] = dst * (1.0 - alpha) + rgb * alpha + 0.5
+
+    def present(self) -> int:
+        """Geänderte Bereiche an Tk schicken. Rückgabe: Anzahl put-Aufrufe."""
+        t = FB_TILE
+        rows, cols = self.h // t, self.w // t
+        if not self.sent:
+            dirty = None
+            self.sent = True
+        else:
+            changed = self.screen_words != self.front_words
+            tiles = changed.reshape(rows, t, cols, t * 3 // 8).any(axis=3).any(axis=1)
+            n = int(tiles.sum())
+            if n == 0:
+                return 0
+            dirty = tiles.tolist() if n < FB_FULL_UPLOAD * rows * cols else None
+        self.front[...] = self.screen
+
+        if dirty is None:
+            self._put(0, 0, self.w, self.h)
+            return 1
+
+        # Zeilen mit gleichem Muster zusammenfassen, je Zeile Läufe geänderter Kacheln
+        puts = 0
+        row = 0
+        while row < rows:
+            pattern = dirty[row]
+            if True not in pattern:
+                row += 1
+                continue
+            end = row + 1
+            while end < rows and dirty[end] == pattern:
+                end += 1
+            col = 0
+            while col < cols:
+                if not pattern[col]:
+                    col += 1
+                    continue
+                start = last = col
+                while col < cols and col - last <= FB_MERGE_GAP:
+                    if pattern[col]:
+                        last = col
+                    col += 1
+                self._put(start * t, row * t, (last + 1) * t, end * t)
+                puts += 1
+                col = last + 1
+            row = end
+        return puts
+
+    def _put(self, x0, y0, x1, y1):
+        data = b"P6 %d %d 255\n" % (x1 - x0, y1 - y0) + self.screen[y0:y1, x0:x1].tobytes()
+        self.photo.put(data, to=(x0, y0))
+        self.uploads += 1
+        self.upload_bytes += len(data)
+
+
+class FramePacer:
+    """
+    Frame-Takt über feste Zeitpunkte: Frame n ist bei t0 + n / hz fällig.
+
+    frame_started(now) zu Beginn jedes Frames, delay_ms(now) am Ende liefert
+    die Wartezeit für root.after bis zum nächsten Zeitpunkt. Rechenzeit des
+    Frames und Ungenauigkeit von after (ganze ms, mal früher, mal später)
+    werden so beim nächsten Frame ausgeglichen statt aufaddiert — im Mittel
+    läuft es genau mit hz. Liegt ein Frame mehr als eine Periode hinter
+    seinem Zeitpunkt, werden die verpassten übersprungen (dropped) statt im
+    Schnelldurchlauf nachgeholt.
+    """
+
+    def __init__(self, hz: int):
+        self.hz = hz
+        self.period = 1.0 / hz
+        self.deadline = None
+        self.t0 = self.t_last = 0.0
+        self.frames = 0
+        self.dropped = 0
+        self.lateness = deque(maxlen=PACE_WINDOW)
+
+    def frame_started(self, now: float):
+        if self.deadline is None:
+            self.deadline = self.t0 = now
+        self.lateness.append(now - self.deadline)
+        self.frames += 1
+        self.t_last = now
+        self.deadline += self.period
+        if now >= self.deadline:
+            skipped = int((now - self.deadline) / self.period) + 1
+            self.deadline += skipped * self.period
+            self.dropped += skipped
+
+    def resume(self, now: float):
+        """
+        Nach einer Zeit ohne Frames (Leerlauf, siehe spiel.py) im Takt
+        weitermachen: die Lücke zählt weder als übersprungen noch in fps.
+        """
+        if self.deadline is None:
+            return
+        self.t0 += max(0.0, now - self.t_last - self.period)
+        self.deadline = now
+
+    def delay_ms(self, now: float) -> int:
+        # abgerundet: after kommt eher zu spät als zu früh
+        return max(0, int((self.deadline - now) * 1000.0))
+
+    def stats(self) -> dict:
+        """Ziel- und erreichte Rate, übersprungene Frames, Verspätung (ms) ab dem Zeitpunkt."""
+        values = sorted(self.lateness)
+        span = self.t_last - self.t0
+        return {
+            "hz": self.hz,
+            "fps": (self.frames - 1) / span if span > 0 else 0.0,
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "late_p50": percentile(values, 0.50) * 1000.0,
+            "late_p95": percentile(values, 0.95) * 1000.0,
+            "late_max": (values[-1] if values else 0.0) * 1000.0,
+        }
+
+
+class QualityGovernor:
+    """
+    Passt die Darstellungsstufe an die Frame-Kosten an (0 = volle Qualität,
+    je höher, desto weniger Aufwand; was jede Stufe weglässt, entscheidet der
+    Aufrufer). frame(cost) nach jedem Frame mit der Zeit, die er gekostet hat;
+    Rückgabe: die neue Stufe, wenn sie sich geändert hat, sonst None.
+
+    Runter geht es nach einem Fenster mit zu vielen Frames über dem Budget,
+    hoch erst nach QUALITY_UP_WINDOWS Fenstern in Folge mit viel Luft — so
+    pendelt die Stufe nicht an der Grenze hin und her. Nach jedem Wechsel
+    beginnt die Zählung neu. fixed: Stufe bleibt, wie sie ist (--quality N).
+    """
+
+    def __init__(self, budget: float, levels: int, level: int = 0, fixed: bool = False):
+        self.budget = budget
+        self.levels = levels
+        self.level = level
+        self.fixed = fixed
+        self.costs = []
+        self.calm = 0
+        self.changes = 0
+
+    def frame(self, cost: float):
+        if self.fixed:
+            return None
+        costs = self.costs
+        costs.append(cost)
+        if len(costs) < QUALITY_WINDOW:
+            return None
+        late = sum(1 for c in costs if c > self.budget)
+        peak = max(costs)
+        self.costs = []
+
+        if late >= QUALITY_LATE_FRAC * QUALITY_WINDOW and self.level < self.levels - 1:
+            return self._set(self.level + 1)
+        if peak < QUALITY_HEADROOM * self.budget and self.level > 0:
+            self.calm += 1
+            if self.calm >= QUALITY_UP_WINDOWS:
+                return self._set(self.level - 1)
+        else:
+            self.calm = 0
+        return None
+
+    def _set(self, level: int) -> int:
+        self.level = level
+        self.calm = 0
+        self.changes += 1
+        return level
@@ -0,0 +1,228 @@
+import json
+import time
+from collections import deque
+
+from profiler import percentile
+from simulation import Simulation
+from sprites import sprite_masks
+
+# -------------------------
+# AUSWEICHEN — Aufnahme und Wiedergabe
+#
+# Datei: erste Zeile JSON-Kopf (Seed, Takt, Spritegrößen, Ergebnis),
+# danach eine Zeile pro wirksamem Tastenereignis: "<schritt> <taste> <1|0>"
+# (1 = gedrückt, 0 = losgelassen). <schritt> ist Simulation.steps beim
+# Ereignis — es wirkt im nächsten Simulationsschritt.
+# -------------------------
+
+REPLAY_FORMAT = "ausweichen-replay"
+REPLAY_VERSION = 5               # 2: Poisson-Spawns, 3: Kollision über die ganze Bewegung, 4: Masken,
+                                 # 5: Spielermaske ohne weißen Rand
+
+LEFT_KEYS = ("Left", "a")
+RIGHT_KEYS = ("Right", "d")
+DASH_KEYS = ("space",)
+PAUSE_KEYS = ("p", "P")
+
+# Wiedergabe-Tempi für die gerenderte Wiedergabe; 0 = ohne Anzeige, so schnell wie möglich
+REPLAY_SPEEDS = (0, 1, 4, 16)
+
+REWIND_SECONDS = 5.0            # Übungsmodus: so weit (Spielzeit) reicht das Zurückspulen …
+REWIND_MAX_BYTES = 32 << 20     # … solange die Zustände zusammen nicht mehr Speicher brauchen
+REWIND_TIMING_KEEP = 600        # Messwerte für die Perzentile von Aufnahme und Wiederherstellung
+
+
+class ReplayRecorder:
+    """
+    Nimmt einen Lauf auf (start() bis Game Over) und schreibt ihn bei finish().
+    Ein Neustart mitten im Lauf verwirft die laufende Aufnahme.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header = None
+        self.lines = []
+
+    def begin(self, sim: Simulation, sim_hz: int, left: bool, right: bool):
+        self.header = {
+            "format": REPLAY_FORMAT,
+            "version": REPLAY_VERSION,
+            "seed": sim.seed,
+            "sim_hz": sim_hz,
+            "left": left,
+            "right": right,
+            "logo_sizes": {str(k): list(v) for k, v in sim.logo_sizes.items()},
+            "player_size": [sim.player_w, sim.player_h],
+            "collision": sim.collision,
+        }
+        self.lines = []
+
+    def key(self, step: int, key: str, down: bool):
+        if self.header is not None:
+            self.lines.append(f"{step} {key} {int(down)}")
+
+    def finish(self, sim: Simulation, score: float):
+        if self.header is None:
+            return
+        self.header.update({"steps": sim.steps, "t": sim.t, "score": score})
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self.header) + "\n")
+                for line in self.lines:
+                    f.write(line + "\n")
+            print(f"[REPLAY] Lauf aufgenommen → {self.path} (Punkte {score:.1f})")
+        except OSError as e:
+            print(f"[FEHLER] Replay konnte nicht geschrieben werden: {self.path}")
+            print(f"        Grund: {e}")
+        self.header = None
+
+
+class RewindBuffer:
+    """
+    Ringpuffer der letzten Zustände (Simulation.save_state) für den Übungsmodus:
+    capture() einmal je Frame, restore() holt den jüngsten zurück und nimmt ihn
+    heraus. Der älteste fällt heraus, sobald der Puffer mehr als `seconds`
+    Spielzeit oder mehr als `max_bytes` hält — bei sehr vielen Logos reicht er
+    also weniger weit zurück. Misst nebenbei Aufnahmekosten, Größe und
+    Wiederherstellungszeit.
+    """
+
+    def __init__(self, seconds: float = REWIND_SECONDS, max_bytes: int = REWIND_MAX_BYTES):
+        self.seconds = seconds
+        self.max_bytes = max_bytes
+        self.snaps = deque()        # (Spielzeit, Zustand)
+        self.held = 0
+        self.capture_s = deque(maxlen=REWIND_TIMING_KEEP)
+        self.restore_s = deque(maxlen=REWIND_TIMING_KEEP)
+        self.captured = 0
+        self.bytes_total = 0
+
+    def __len__(self):
+        return len(self.snaps)
+
+    def capture(self, sim: Simulation):
+        t0 = time.perf_counter()
+        data = sim.save_state()
+        snaps = self.snaps
+        snaps.append((sim.t, data))
+        self.held += len(data)
+        while len(snaps) > 1 and (self.held > self.max_bytes or sim.t - snaps[0][0] > self.seconds):
+            self.held -= len(snaps.popleft()[1])
+        self.capture_s.append(time.perf_counter() - t0)
+        self.captured += 1
+        self.bytes_total += len(data)
+
+    def restore(self, sim: Simulation) -> bool:
+        """Jüngsten Zustand zurückholen; False, wenn der Puffer leer ist."""
+        if not self.snaps:
+            return False
+        t0 = time.perf_counter()
+        _, data = self.snaps.pop()
+        self.held -= len(data)
+        sim.load_state(data)
+        self.restore_s.append(time.perf_counter() - t0)
+        return True
+
+    def clear(self):
+        self.snaps.clear()
+        self.held = 0
+
+    def stats(self) -> dict:
+        capture = sorted(self.capture_s)
+        restore = sorted(self.restore_s)
+        snaps = self.snaps
+        return {
+            "snapshots": len(snaps),
+            "seconds": snaps[-1][0] - snaps[0][0] if snaps else 0.0,
+            "capture_us": {"p50": percentile(capture, 0.50) * 1e6, "p95": percentile(capture, 0.95) * 1e6},
+            "bytes_mean": self.bytes_total / self.captured if self.captured else 0.0,
+            "held_kb": self.held / 1024.0,
+            "restore_ms": {"p50": percentile(restore, 0.50) * 1e3, "p95": percentile(restore, 0.95) * 1e3},
+        }
+
+
+def load_replay(path: str):
+    """Rückgabe: (Kopf, [(schritt, taste, gedrückt), ...])"""
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != REPLAY_FORMAT:
+            raise ValueError(f"keine Replay-Datei: {path}")
+        if header.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Replay-Version {header.get('version')} passt nicht zu diesem Spiel ({REPLAY_VERSION})")
+        events = []
+        for line in f:
+            if line.strip():
+                step, key, down = line.split()
+                events.append((int(step), key, down == "1"))
+    return header, events
+
+
+def replay_simulation(header, **kwargs) -> Simulation:
+    """Simulation mit Seed, Spritegrößen und Kollisionsart der Aufnahme."""
+    logo_sizes = {int(k): tuple(v) for k, v in header["logo_sizes"].items()}
+    player_size = tuple(header["player_size"])
+    masks = sprite_masks(logo_sizes, player_size) if header["collision"] == "mask" else None
+    return Simulation(
+        logo_sizes=logo_sizes,
+        player_size=player_size,
+        seed=header["seed"],
+        masks=masks,
+        **kwargs,
+    )
+
+
+class ReplayInput:
+    """
+    Spielt die Tastenereignisse als Simulations-Eingaben ab —
+    mit derselben Logik wie die Tastenbelegung in spiel.Game.
+    """
+
+    def __init__(self, header, events):
+        self.events = events
+        self.i = 0
+        self.left = header["left"]
+        self.right = header["right"]
+        self.paused = False
+
+    def inputs(self, step: int) -> dict:
+        dash = False
+        events = self.events
+        while self.i < len(events) and events[self.i][0] <= step:
+            _, key, down = events[self.i]
+            self.i += 1
+            if key in LEFT_KEYS:
+                self.left = down
+            elif key in RIGHT_KEYS:
+                self.right = down
+            elif key in DASH_KEYS and down and not self.paused:
+                dash = True
+            elif key in PAUSE_KEYS and down:
+                # nur in älteren Aufnahmen; heute fehlen P und Sprints in der Pause
+                self.paused = not self.paused
+        return {"left": self.left, "right": self.right, "dash": dash}
+
+
+def replay_headless(path: str, **sim_kwargs) -> dict:
+    """Lauf ohne Anzeige so schnell wie möglich nachspielen und Punkte prüfen."""
+    header, events = load_replay(path)
+    sim = replay_simulation(header, **sim_kwargs)
+    source = ReplayInput(header, events)
+    dt = 1.0 / header["sim_hz"]
+
+    # etwas Luft über die aufgenommene Schrittzahl, falls der Lauf abweicht
+    limit = header["steps"] + header["sim_hz"] * 10
+    while not sim.over and sim.steps < limit:
+        sim.step(dt, source.inputs(sim.steps))
+
+    return verify(header, sim)
+
+
+def verify(header, sim: Simulation) -> dict:
+    score = sim.t + sim.points
+    return {
+        "recorded_score": header["score"],
+        "score": score,
+        "recorded_steps": header["steps"],
+        "steps": sim.steps,
+        "ok": sim.over and score == header["score"] and sim.steps == header["steps"],
+    }
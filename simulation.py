@@ -0,0 +1,1027 @@
+import math
+import os
+import random
+import struct
+import sys
+from array import array
+
+# NumPy ist optional (ArrayEnemyStore, sprites.py) und wird erst bei Bedarf
+# über load_numpy() importiert — der Import allein kostet ~0.15 s Startzeit.
+np = None
+
+# -------------------------
+# AUSWEICHEN — Simulationskern (ohne Tk)
+# Alle Spielregeln: Spawn, Schwierigkeit, Bewegung, Sprint, Kollision,
+# "knapp vorbei" und Multiplikator. spiel.py zeichnet nur noch.
+# -------------------------
+
+WIDTH, HEIGHT = 720, 480
+
+
+def resource_path(rel_path: str) -> str:
+    """
+    Funktioniert sowohl im Editor als auch später in einer PyInstaller-EXE.
+    """
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, rel_path)
+
+
+LOGO_FILE = resource_path("bbq_logo.png")
+PLAYER_FILE = resource_path("krankenschein.png")
+
+# Spieler
+PLAYER_Y = HEIGHT - 125         # vertikale Position (oben am Bild)
+PLAYER_TARGET_W = 160           # grobe Zielbreite VOR der Halbierung
+PLAYER_EXTRA_HALVE = True       # zusätzlich halbieren (50%)
+PLAYER_FALLBACK_W, PLAYER_FALLBACK_H = 90, 18
+
+# Logo-Gegner Größenwunsch: jede Pixelgröße hat ihre eigene Variante (sprites.py)
+LOGO_MIN, LOGO_MAX = 24, 64
+LOGO_SIZES = list(range(LOGO_MIN, LOGO_MAX + 1))
+
+# Gameplay
+GRAZE_MARGIN = 18               # "knapp vorbei"-Zone um den Spieler
+GRAZE_BONUS = 12.0
+GRAZE_MULT_GAIN = 0.22
+MULT_DECAY = 0.35               # Multiplikator fällt pro Sekunde Richtung 1.0
+MULT_MAX = 6.0
+
+# Bewegung
+PLAYER_MAX_SPEED = 520.0
+PLAYER_ACCEL = 2400.0
+PLAYER_FRICTION = 3200.0
+
+# Sprint
+DASH_CD = 1.25                  # Cooldown
+DASH_TIME = 0.10                # Dauer
+DASH_SPEED = 1150.0
+
+# Gegner
+SPAWN_RATE_START = 0.95
+SPAWN_ACCEL = 0.065
+ENEMY_BASE_SPEED = 190.0
+ENEMY_SPEED_ACCEL = 12.0
+ENEMY_CULL_Y = HEIGHT + 140     # darunter werden Gegner entfernt
+
+# Stellschrauben fürs Balancing (Name → Standard); Simulation(tuning={...}) und
+# batch.BatchSimulation überschreiben einzelne davon je Lauf (tournament.py)
+TUNING = {
+    "spawn_rate_start": SPAWN_RATE_START,
+    "spawn_accel": SPAWN_ACCEL,
+    "enemy_base_speed": ENEMY_BASE_SPEED,
+    "enemy_speed_accel": ENEMY_SPEED_ACCEL,
+    "graze_bonus": GRAZE_BONUS,
+    "mult_decay": MULT_DECAY,
+}
+
+# Broadphase: Zeilenhöhe des Rasters auf der y-Achse
+BROADPHASE_CELL = 32
+
+# Popups
+POPUP_VY = -45.0
+
+# Binärer Laufzustand (Simulation.save_state): native Byte-Reihenfolge — für den
+# Speicher (Rückspulen), nicht zum Austausch zwischen Rechnern
+STATE_MAGIC = b"AWS2"
+_STATE_HEAD = struct.Struct("=4sdq?ddddddddI?d")
+_STATE_RNG = struct.Struct("=625I")
+_STATE_POPUP = struct.Struct("=ddddddBB")
+_STATE_COUNT = struct.Struct("=I")
+_ENEMY_FLOATS = ("x", "y", "py", "w", "h", "vy")
+
+# Fester Simulationstakt (Anzeige interpoliert dazwischen)
+SIM_HZ = 120
+SIM_DT = 1.0 / SIM_HZ
+
+
+def load_numpy():
+    """NumPy importieren (einmalig) und zurückgeben; None, wenn nicht installiert."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+def clamp(x, a, b):
+    return max(a, min(b, x))
+
+
+def aabb_intersect(a, b) -> bool:
+    ax1, ay1, ax2, ay2 = a
+    bx1, by1, bx2, by2 = b
+    return not (ax2 < bx1 or ax1 > bx2 or ay2 < by1 or ay1 > by2)
+
+
+def swept_window(a0, a1, b0, b1):
+    """
+    Wann während eines Schritts berühren sich zwei AABBs?
+    a0/b0: Boxen am Anfang, a1/b1 am Ende (gleiche Größe, linear dazwischen).
+    Je Achse und Seite ist der Abstand eine Gerade in τ ∈ [0, 1]; die Zeitfenster
+    mit Abstand ≥ 0 werden geschnitten. Grenzen zählen wie bei aabb_intersect.
+    Rückgabe: (τ_von, τ_bis) oder None.
+    """
+    lo, hi = 0.0, 1.0
+    for k in (0, 1):
+        for s0, s1 in ((a0[k + 2] - b0[k], a1[k + 2] - b1[k]),
+                       (b0[k + 2] - a0[k], b1[k + 2] - a1[k])):
+            d = s1 - s0
+            if d > 0:
+                lo = max(lo, -s0 / d)
+            elif d < 0:
+                hi = min(hi, -s0 / d)
+            elif s0 < 0:
+                return None
+    return (lo, hi) if lo <= hi else None
+
+
+def swept_intersect(a0, a1, b0, b1) -> bool:
+    return swept_window(a0, a1, b0, b1) is not None
+
+
+def _swept_window_arrays(ax1, ay1_0, ax2, ay2_0, ay1_1, ay2_1, b0, b1):
+    """
+    swept_window für viele Gegner auf einmal (ArrayEnemyStore, batch.py).
+    Gegner bewegen sich nur in y (ax1/ax2 fest), b ist eine einzelne Box
+    (oder je Zeile eine, als (N, 1)-Spalten zu (N, K)-Gegnern).
+    Gleiche Arithmetik wie swept_window, also gleiche Ergebnisse.
+    Rückgabe: (berühren?, τ_von, τ_bis) als Arrays.
+    """
+    lo = np.zeros(ax1.shape)
+    hi = np.ones(ax1.shape)
+    ok = np.ones(ax1.shape, dtype=bool)
+    sides = ((ax2 - b0[0], ax2 - b1[0]), (b0[2] - ax1, b1[2] - ax1),
+             (ay2_0 - b0[1], ay2_1 - b1[1]), (b0[3] - ay1_0, b1[3] - ay1_1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for s0, s1 in sides:
+            d = s1 - s0
+            t = -s0 / d
+            lo = np.where(d > 0, np.maximum(lo, t), lo)
+            hi = np.where(d < 0, np.minimum(hi, t), hi)
+            ok &= (d != 0) | (s0 >= 0)
+    return ok & (lo <= hi), lo, hi
+
+
+# -------------------------
+# Pixelgenaue Kollision
+# Masken: eine Zeile je int, Bit x = Spalte x (deckender Pixel, siehe sprites.py).
+# Getestet wird erst, wenn die Boxen sich schon berühren.
+# -------------------------
+
+def full_mask(w: int, h: int):
+    """Maske eines voll deckenden Rechtecks (Kreis-Fallback, Bild ohne Alpha)."""
+    return [(1 << w) - 1] * h
+
+
+def masks_overlap(ma, dx: int, dy: int, mb) -> bool:
+    """Liegt ein gesetztes Pixel von ma (um dx, dy gegen mb verschoben) auf einem von mb?"""
+    for r in range(max(0, dy), min(len(mb), dy + len(ma))):
+        row = ma[r - dy]
+        if (row << dx if dx >= 0 else row >> -dx) & mb[r]:
+            return True
+    return False
+
+
+def swept_masks_overlap(ma, a0, a1, mb, b0, b1, lo: float, hi: float) -> bool:
+    """
+    Masken entlang des Zeitfensters [lo, hi] aus swept_window abtasten —
+    so dicht, dass sich die beiden zwischen zwei Proben höchstens 1 px bewegen.
+    """
+    rx0, ry0 = a0[0] - b0[0], a0[1] - b0[1]
+    rx = (a1[0] - a0[0]) - (b1[0] - b0[0])
+    ry = (a1[1] - a0[1]) - (b1[1] - b0[1])
+    n = int(math.ceil(max(abs(rx), abs(ry)) * (hi - lo)))
+    for i in range(n + 1):
+        t = lo + (hi - lo) * i / n if n else hi
+        dx = int(math.floor(rx0 + rx * t + 0.5))
+        dy = int(math.floor(ry0 + ry * t + 0.5))
+        if masks_overlap(ma, dx, dy, mb):
+            return True
+    return False
+
+
+def _enemy_mask_hit(masks, size, w, h, mb0, mb, pb0, pb, lo, hi) -> bool:
+    logo_masks, player_mask = masks
+    em = logo_masks.get(size)
+    if em is None:
+        em = full_mask(int(w), int(h))
+    return swept_masks_overlap(em, mb0, mb, player_mask, pb0, pb, lo, hi)
+
+
+# -------------------------
+# Spritegrößen ohne Tk
+# -------------------------
+
+def png_size(path: str):
+    """Breite/Höhe aus dem IHDR-Kopf einer PNG-Datei (oder None)."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(24)
+    except OSError:
+        return None
+    if len(head) < 24 or head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        return None
+    return int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")
+
+
+def scaled_size(bw: int, bh: int, target_w: int):
+    """Größe bei Zielbreite target_w, Seitenverhältnis bleibt (wie sprites.py umrechnet)."""
+    return target_w, max(1, int(bh * target_w / bw + 0.5))
+
+
+def headless_sprite_sizes():
+    """
+    Dieselben Spritegrößen, die spiel.py anzeigt — nur aus den PNG-Köpfen.
+    Rückgabe: ({Wunschgröße: (w, h)}, (player_w, player_h))
+    """
+    logo_sizes = {}
+    base = png_size(LOGO_FILE)
+    if base is not None:
+        for target in LOGO_SIZES:
+            logo_sizes[target] = scaled_size(base[0], base[1], target)
+
+    player = (PLAYER_FALLBACK_W, PLAYER_FALLBACK_H)
+    base = png_size(PLAYER_FILE)
+    if base is not None:
+        target = PLAYER_TARGET_W // 2 if PLAYER_EXTRA_HALVE else PLAYER_TARGET_W
+        player = scaled_size(base[0], base[1], target)
+
+    return logo_sizes, player
+
+
+# -------------------------
+# Broadphase
+# -------------------------
+
+class RowGrid:
+    """
+    Gleichmäßiges Zeilenraster auf der y-Achse (Zeilenhöhe `cell`).
+    Nur Gegner, die eine Zeile des Spielerbands (+ GRAZE_MARGIN) berühren,
+    kommen in die genauen AABB-Tests. Das Band wird auf ganze Zeilen
+    aufgerundet — es fällt also nie ein Gegner heraus, der treffen oder
+    streifen könnte, und die Ergebnisse sind identisch zum Brute-Force-Weg.
+    """
+
+    def __init__(self, cell: int = BROADPHASE_CELL):
+        self.cell = cell
+
+    def span(self, box):
+        """(y_oben, y_unten) der Rasterzeilen, die box berühren."""
+        c = self.cell
+        return (box[1] // c) * c, (box[3] // c + 1) * c
+
+
+BROADPHASES = ("grid", "brute")
+
+
+# -------------------------
+# Gegner-Speicher
+# -------------------------
+
+class ListEnemyStore:
+    """
+    Gegner als Liste von dicts (x, y, py, w, h, vy, grazed, size, cid).
+    Einfach und ohne Abhängigkeiten; Schritt läuft Gegner für Gegner.
+    """
+
+    kind = "list"
+
+    def __init__(self):
+        self.items = []
+        # laufen über alle Läufe weiter (Leser bilden Differenzen, z. B. je Frame)
+        self.pair_tests = 0         # genaue AABB-Tests (Spieler + Graze-Zone)
+        self.pair_skipped = 0       # durch die Broadphase gesparte Tests
+
+    def __len__(self):
+        return len(self.items)
+
+    def clear(self):
+        """Alles entfernen; Rückgabe: Canvas-Items, die die Anzeige löschen muss."""
+        cids = [m["cid"] for m in self.items if m["cid"] is not None]
+        self.items = []
+        return cids
+
+    def spawn(self, x, y, w, h, vy, size):
+        self.items.append({"x": x, "y": y, "py": y, "w": w, "h": h, "vy": vy,
+                           "grazed": False, "size": size, "cid": None})
+
+    def step(self, dt, pb, graze_box, cull_y, span=None, stop_on_hit=True, pdx=0.0, masks=None):
+        """
+        Bewegen, Kollision, "knapp vorbei", Aufräumen.
+        Getestet wird die ganze Bewegung im Schritt (swept), nicht nur die Endlage:
+        Gegner von py nach y, Spieler um pdx nach rechts bis pb.
+        span: (y_oben, y_unten) aus der Broadphase — nur dort wird genau getestet.
+        masks: (Logo-Masken je Größe, Spielermaske) — Treffer erst, wenn sich
+        auch deckende Pixel berühren. "Knapp vorbei" bleibt bei Boxen.
+        Rückgabe: (Treffer?, Boxen neu gestreifter Gegner, entfernte Canvas-Items)
+        Bei Treffer endet der Schritt an diesem Gegner (wie früher: break),
+        außer stop_on_hit ist False (unverwundbar).
+        """
+        alive = []
+        grazes = []
+        removed = []
+        tested = skipped = 0
+        hit = False
+        pb0 = (pb[0] - pdx, pb[1], pb[2] - pdx, pb[3])
+        graze0 = (graze_box[0] - pdx, graze_box[1], graze_box[2] - pdx, graze_box[3])
+
+        for m in self.items:
+            py = m["py"] = m["y"]
+            m["y"] += m["vy"] * dt
+            y = m["y"]
+
+            # Broadphase über die ganze Strecke py..y (+ Höhe)
+            if span is None or (y + m["h"] >= span[0] and py <= span[1]):
+                tested += 1
+                x2 = m["x"] + m["w"]
+                mb0 = (m["x"], py, x2, py + m["h"])
+                mb = (m["x"], y, x2, y + m["h"])
+
+                # Kollision
+                win = swept_window(mb0, mb, pb0, pb)
+                if win is not None and (masks is None or _enemy_mask_hit(
+                        masks, m["size"], m["w"], m["h"], mb0, mb, pb0, pb, *win)):
+                    hit = True
+                    if stop_on_hit:
+                        self._count(tested, skipped)
+                        return True, grazes, []
+
+                # knapp vorbei (ohne Kollision)
+                elif (not m["grazed"]) and swept_intersect(mb0, mb, graze0, graze_box):
+                    m["grazed"] = True
+                    grazes.append(mb)
+            else:
+                skipped += 1
+
+            if y < cull_y:
+                alive.append(m)
+            elif m["cid"] is not None:
+                removed.append(m["cid"])
+
+        self._count(tested, skipped)
+        self.items = alive
+        return hit, grazes, removed
+
+    def _count(self, tested, skipped):
+        # je Gegner zwei Paare: Spielerbox und Graze-Zone
+        self.pair_tests += 2 * tested
+        self.pair_skipped += 2 * skipped
+
+    def rows(self):
+        """(Index, cid, x, y, py, w, h, size) je Gegner — für die Anzeige."""
+        for i, m in enumerate(self.items):
+            yield i, m["cid"], m["x"], m["y"], m["py"], m["w"], m["h"], m["size"]
+
+    def set_cid(self, i, cid):
+        self.items[i]["cid"] = cid
+
+    def snapshot(self):
+        """Unveränderliche Zeilen (x, y, py, w, h, size) — für die Anzeige in einem anderen Thread."""
+        return tuple((m["x"], m["y"], m["py"], m["w"], m["h"], m["size"]) for m in self.items)
+
+    def pack(self) -> bytes:
+        """
+        Binär für Simulation.save_state: Anzahl, je Spalte x, y, py, w, h, vy als
+        float64, grazed als Bytes, size als int16 (-1 = Kreis). Canvas-Items nicht.
+        """
+        items = self.items
+        flat = array("d")
+        for k in _ENEMY_FLOATS:
+            flat.extend([m[k] for m in items])
+        return b"".join((
+            _STATE_COUNT.pack(len(items)),
+            flat.tobytes(),
+            bytes([m["grazed"] for m in items]),
+            array("h", [-1 if m["size"] is None else m["size"] for m in items]).tobytes(),
+        ))
+
+    def unpack(self, data, offset: int) -> int:
+        """Gegenstück zu pack(); Rückgabe: Position hinter den Gegnern."""
+        n, = _STATE_COUNT.unpack_from(data, offset)
+        offset += _STATE_COUNT.size
+        flat = array("d")
+        flat.frombytes(data[offset:offset + 48 * n])
+        offset += 48 * n
+        grazed = data[offset:offset + n]
+        offset += n
+        size = array("h")
+        size.frombytes(data[offset:offset + 2 * n])
+        offset += 2 * n
+        cols = [flat[i * n:(i + 1) * n] for i in range(6)]
+        self.items = [
+            {"x": x, "y": y, "py": py, "w": w, "h": h, "vy": vy,
+             "grazed": g != 0, "size": None if s < 0 else s, "cid": None}
+            for x, y, py, w, h, vy, g, s in zip(*cols, grazed, size)
+        ]
+        return offset
+
+    def columns(self):
+        """x, y, py, w, h, size (-1 = Kreis) als NumPy-Arrays — für den Framebuffer."""
+        items = self.items
+        return (
+            np.array([m["x"] for m in items], dtype=np.float64),
+            np.array([m["y"] for m in items], dtype=np.float64),
+            np.array([m["py"] for m in items], dtype=np.float64),
+            np.array([m["w"] for m in items], dtype=np.float64),
+            np.array([m["h"] for m in items], dtype=np.float64),
+            np.array([-1 if m["size"] is None else m["size"] for m in items], dtype=np.int16),
+        )
+
+
+class ArrayEnemyStore:
+    """
+    Gegner als NumPy-Spalten (structure of arrays): x, y, py, w, h, vy, grazed,
+    size (-1 = Kreis) und cid (0 = kein Canvas-Item; Tk vergibt ab 1).
+
+    Bewegen, Kollision, "knapp vorbei" und Aufräumen laufen als Array-Operationen.
+    Ergebnisse sind identisch zu ListEnemyStore (gleiche Reihenfolge, gleiche Arithmetik).
+    """
+
+    kind = "array"
+
+    def __init__(self, capacity: int = 256):
+        if load_numpy() is None:
+            raise RuntimeError("NumPy ist nicht installiert")
+        self.n = 0
+        self.pair_tests = 0
+        self.pair_skipped = 0
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        old = getattr(self, "x", None)
+        cols = {
+            "x": np.float64, "y": np.float64, "py": np.float64,
+            "w": np.float64, "h": np.float64, "vy": np.float64,
+            "grazed": np.bool_, "size": np.int16, "cid": np.int64,
+        }
+        for name, dtype in cols.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                arr[:self.n] = getattr(self, name)[:self.n]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        cids = [int(c) for c in self.cid[:self.n] if c]
+        self.n = 0
+        return cids
+
+    def spawn(self, x, y, w, h, vy, size):
+        i = self.n
+        if i == self.capacity:
+            self._alloc(self.capacity * 2)
+        self.x[i] = x
+        self.y[i] = y
+        self.py[i] = y
+        self.w[i] = w
+        self.h[i] = h
+        self.vy[i] = vy
+        self.grazed[i] = False
+        self.size[i] = -1 if size is None else size
+        self.cid[i] = 0
+        self.n = i + 1
+
+    def step(self, dt, pb, graze_box, cull_y, span=None, stop_on_hit=True, pdx=0.0, masks=None):
+        n = self.n
+        if n == 0:
+            return False, [], []
+
+        y = self.y[:n]
+        py = self.py[:n]
+        py[:] = y
+        y += self.vy[:n] * dt
+
+        # Broadphase: Kandidaten, deren Strecke py..y das Spielerband berührt
+        if span is None:
+            cand = np.arange(n)
+        else:
+            h = self.h[:n]
+            cand = np.flatnonzero((y + h >= span[0]) & (py <= span[1]))
+        self.pair_tests += 2 * len(cand)
+        self.pair_skipped += 2 * (n - len(cand))
+
+        x1 = self.x[cand]
+        x2 = x1 + self.w[cand]
+        h = self.h[cand]
+        y1 = y[cand]
+        y2 = y1 + h
+        y1_0 = py[cand]
+        y2_0 = y1_0 + h
+
+        pb0 = (pb[0] - pdx, pb[1], pb[2] - pdx, pb[3])
+        graze0 = (graze_box[0] - pdx, graze_box[1], graze_box[2] - pdx, graze_box[3])
+        hit, lo, hi = _swept_window_arrays(x1, y1_0, x2, y2_0, y1, y2, pb0, pb)
+        graze = ~self.grazed[cand] & _swept_window_arrays(x1, y1_0, x2, y2_0, y1, y2,
+                                                          graze0, graze_box)[0]
+
+        # Pixeltest nur für die wenigen Box-Treffer, Gegner für Gegner
+        if masks is not None:
+            sizes = self.size[cand]
+            for j in np.flatnonzero(hit).tolist():
+                size = int(sizes[j])
+                x1j, x2j = float(x1[j]), float(x2[j])
+                mb0 = (x1j, float(y1_0[j]), x2j, float(y2_0[j]))
+                mb = (x1j, float(y1[j]), x2j, float(y2[j]))
+                if not _enemy_mask_hit(masks, None if size < 0 else size, x2j - x1j, mb[3] - mb[1],
+                                       mb0, mb, pb0, pb, float(lo[j]), float(hi[j])):
+                    hit[j] = False
+
+        first_hit = int(np.argmax(hit)) if hit.any() else -1
+        if first_hit >= 0 and stop_on_hit:
+            # wie ListEnemyStore: nur Gegner vor dem Treffer zählen
+            graze[first_hit:] = False
+        else:
+            graze &= ~hit
+
+        sel = np.flatnonzero(graze)
+        self.grazed[cand[sel]] = True
+        grazes = [(x1[j], y1[j], x2[j], y2[j]) for j in sel.tolist()]
+
+        if first_hit >= 0 and stop_on_hit:
+            return True, grazes, []
+
+        keep = y < cull_y
+        removed = []
+        if not keep.all():
+            gone = self.cid[:n][~keep]
+            removed = gone[gone != 0].tolist()
+            m = int(keep.sum())
+            for name in ("x", "y", "py", "w", "h", "vy", "grazed", "size", "cid"):
+                col = getattr(self, name)
+                col[:m] = col[:n][keep]
+            self.n = m
+
+        return first_hit >= 0, grazes, removed
+
+    def rows(self):
+        n = self.n
+        sizes = self.size[:n].tolist()
+        cids = self.cid[:n].tolist()
+        return zip(
+            range(n),
+            [c or None for c in cids],
+            self.x[:n].tolist(), self.y[:n].tolist(), self.py[:n].tolist(),
+            self.w[:n].tolist(), self.h[:n].tolist(),
+            [None if s < 0 else s for s in sizes],
+        )
+
+    def set_cid(self, i, cid):
+        self.cid[i] = cid or 0
+
+    def snapshot(self):
+        n = self.n
+        return tuple(zip(
+            self.x[:n].tolist(), self.y[:n].tolist(), self.py[:n].tolist(),
+            self.w[:n].tolist(), self.h[:n].tolist(),
+            [None if s < 0 else s for s in self.size[:n].tolist()],
+        ))
+
+    def columns(self):
+        n = self.n
+        return self.x[:n], self.y[:n], self.py[:n], self.w[:n], self.h[:n], self.size[:n]
+
+    def pack(self) -> bytes:
+        n = self.n
+        return b"".join([_STATE_COUNT.pack(n)]
+                        + [getattr(self, k)[:n].tobytes() for k in _ENEMY_FLOATS + ("grazed", "size")])
+
+    def unpack(self, data, offset: int) -> int:
+        n, = _STATE_COUNT.unpack_from(data, offset)
+        offset += _STATE_COUNT.size
+        if n > self.capacity:
+            self._alloc(max(n, self.capacity * 2))
+        for k in _ENEMY_FLOATS + ("grazed", "size"):
+            col = getattr(self, k)
+            end = offset + n * col.itemsize
+            col[:n] = np.frombuffer(data[offset:end], dtype=col.dtype)
+            offset = end
+        self.cid[:n] = 0
+        self.n = n
+        return offset
+
+
+ENEMY_STORES = {"list": ListEnemyStore, "array": ArrayEnemyStore}
+
+
+def make_enemy_store(kind: str = "list"):
+    """Gegner-Speicher nach Name; ohne NumPy fällt "array" auf die Liste zurück."""
+    if kind == "array" and load_numpy() is None:
+        print("[FEHLER] NumPy nicht installiert — Gegner laufen als Liste.")
+        kind = "list"
+    return ENEMY_STORES[kind]()
+
+
+# -------------------------
+# Spawn-Planer
+# -------------------------
+
+class SpawnScheduler:
+    """
+    Spawnzeitpunkte als Poisson-Prozess mit steigender Rate λ(t) = rate0 + accel·t.
+
+    Die Zeit bis zum nächsten Spawn wird exakt gezogen: mit E ~ Exp(1) ist τ die
+    Lösung von ∫ λ über [s, s+τ] = E, also accel/2·τ² + λ(s)·τ = E. Unabhängig
+    vom Takt: gleiche Rate bei 30, 60 oder 120 Schritten pro Sekunde.
+
+    Statt eines Heaps genügt ein einziger anstehender Zeitpunkt (next_t): es gibt
+    nur diesen einen Strom, seine Zeitpunkte kommen von selbst aufsteigend, und
+    weil der Prozess kein Gedächtnis hat, muss keiner im Voraus gezogen werden —
+    erst wenn next_t fällig ist, wird der darauffolgende gezogen. Ein Heap hätte
+    immer genau ein Element. Kosten je Schritt: ein Vergleich, dazu ein Zug je
+    tatsächlichem Spawn (der ohnehin einen Gegner anlegt) — keine Würfe je Frame,
+    auch bei sehr hoher Rate nicht. Vorspulen ohne Simulation: skip_to().
+    """
+
+    def __init__(self, rng: random.Random, rate0: float = SPAWN_RATE_START,
+                 accel: float = SPAWN_ACCEL, t: float = 0.0):
+        self.rng = rng
+        self.rate0 = rate0
+        self.accel = accel
+        self.skip_to(t)
+
+    def rate(self, t: float) -> float:
+        return self.rate0 + self.accel * t
+
+    def _next_arrival(self, s: float) -> float:
+        e = self.rng.expovariate(1.0)
+        lam = self.rate(s)
+        # Lösung der quadratischen Gleichung in stabiler Form (auch für accel = 0)
+        return s + 2.0 * e / (lam + math.sqrt(lam * lam + 2.0 * self.accel * e))
+
+    def skip_to(self, t: float):
+        """
+        Vorspulen (ohne Simulation): der Poisson-Strom beginnt bei t neu.
+        Exakt, weil der Prozess kein Gedächtnis hat.
+        """
+        self.next_t = self._next_arrival(t)
+
+    def due(self, t: float):
+        """Alle Spawnzeitpunkte bis einschließlich t, aufsteigend."""
+        out = []
+        while self.next_t <= t:
+            out.append(self.next_t)
+            self.next_t = self._next_arrival(self.next_t)
+        return out
+
+
+# -------------------------
+# Simulation
+# -------------------------
+
+class Simulation:
+    """
+    Ein Lauf ohne Anzeige. `step(dt, inputs)` rückt die Welt um dt Sekunden vor.
+
+    inputs: dict mit "left"/"right" (Taste gehalten) und "dash"
+    (seit dem letzten Schritt gedrückt). Was die Anzeige wissen muss
+    (entfernte Gegner/Popups, Game Over), steht nach jedem Schritt in `events`.
+
+    Gegner liegen in einem Gegner-Speicher (`enemy_store`: "list" oder "array"),
+    Popups sind dicts. "cid" gehört der Anzeige (Canvas-Item, sonst None),
+    "py" ist die Position vor dem letzten Schritt (zum Interpolieren).
+
+    Jeder Lauf hat einen eigenen Zufallsgenerator: gleicher Seed + gleiche
+    Eingaben + gleiche dt-Folge = gleicher Lauf.
+
+    masks: (Logo-Masken, Spielermaske) für pixelgenaue Treffer, sonst Boxen.
+    tuning: abweichende Werte aus TUNING (z. B. {"graze_bonus": 20.0}).
+    """
+
+    def __init__(self, logo_sizes=None, player_size=None, seed=None, enemy_store="list",
+                 broadphase="grid", masks=None, tuning=None):
+        if logo_sizes is None or player_size is None:
+            default_logos, default_player = headless_sprite_sizes()
+            if logo_sizes is None:
+                logo_sizes = default_logos
+            if player_size is None:
+                player_size = default_player
+
+        # {Wunschgröße: (w, h)} — leer: Kreise in Wunschgröße
+        self.logo_sizes = dict(logo_sizes)
+        self.logo_keys = sorted(self.logo_sizes)
+        # Wunschgröße → nächste vorhandene Variante, einmal vorab statt min() pro Spawn
+        self.logo_pick = [
+            min(self.logo_keys, key=lambda s: abs(s - d)) if self.logo_keys else None
+            for d in range(LOGO_MIN, LOGO_MAX + 1)
+        ]
+        self.player_w, self.player_h = player_size
+
+        # Kollisionsmasken (None: Boxen reichen)
+        self.masks = None
+        if masks is not None:
+            self.set_masks(*masks)
+
+        unknown = set(tuning or ()) - set(TUNING)
+        if unknown:
+            raise ValueError(f"unbekannte Stellschrauben: {', '.join(sorted(unknown))}")
+        self.tuning = {**TUNING, **(tuning or {})}
+
+        self.enemies = make_enemy_store(enemy_store)
+        self.broadphase = RowGrid() if broadphase == "grid" else None
+        self.profiler = None        # profiler.FrameProfiler, wenn eingeschaltet
+        self.invulnerable = False   # Treffer beenden den Lauf nicht (Benchmarks, Übung)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.enemies.clear()
+        self.popups = []
+        self.events = []
+
+        # Lauf-Stats
+        self.t = 0.0
+        self.steps = 0
+        self.over = False
+        self.points = 0.0
+        self.mult = 1.0
+
+        # Schwierigkeit (Spawnrate: siehe SpawnScheduler)
+        tuning = self.tuning
+        self.spawner = SpawnScheduler(self.rng, tuning["spawn_rate_start"], tuning["spawn_accel"])
+        self.enemy_base_speed = tuning["enemy_base_speed"]
+        self.enemy_speed_accel = tuning["enemy_speed_accel"]
+        self.graze_bonus = tuning["graze_bonus"]
+        self.mult_decay = tuning["mult_decay"]
+
+        # Bewegung
+        self.player_x = WIDTH // 2
+        self.prev_player_x = self.player_x
+        self.player_vx = 0.0
+
+        # Sprint
+        self.dash_cd = DASH_CD
+        self.dash_time = DASH_TIME
+        self.dash_speed = DASH_SPEED
+        self.dash_ready_t = 0.0
+        self.dash_active_until = 0.0
+
+    # -------------------------
+    # Abfragen
+    # -------------------------
+
+    def score(self) -> float:
+        return max(0.0, self.t + self.points)
+
+    def dash_charge(self) -> float:
+        """Ladezustand der Sprint-Leiste (0..1)."""
+        if self.t >= self.dash_ready_t:
+            return 1.0
+        return clamp(1.0 - ((self.dash_ready_t - self.t) / self.dash_cd), 0.0, 1.0)
+
+    def pair_stats(self):
+        """Broadphase-Zähler seit Anlegen des Gegner-Speichers (über alle Läufe)."""
+        tests = self.enemies.pair_tests
+        skipped = self.enemies.pair_skipped
+        total = tests + skipped
+        return {"pair_tests": tests, "pair_skipped": skipped,
+                "skipped_frac": skipped / total if total else 0.0}
+
+    @property
+    def collision(self) -> str:
+        return "box" if self.masks is None else "mask"
+
+    def set_masks(self, logo_masks, player_mask=None):
+        """
+        Pixelgenaue Kollision einschalten. logo_masks: {Wunschgröße: Maske},
+        player_mask None = volles Rechteck (siehe sprites.sprite_masks).
+        """
+        if player_mask is None:
+            player_mask = full_mask(int(self.player_w), int(self.player_h))
+        self.masks = (dict(logo_masks), player_mask)
+
+    def player_box(self):
+        half = self.player_w / 2
+        return (self.player_x - half, PLAYER_Y, self.player_x + half, PLAYER_Y + self.player_h)
+
+    # -------------------------
+    # Zustand sichern / wiederherstellen (Rückspulen)
+    # -------------------------
+
+    def save_state(self) -> bytes:
+        """
+        Der ganze Lauf als Bytes: Uhr, Punkte, Multiplikator, Spieler, Sprint,
+        nächster Spawnzeitpunkt, Zufallsgenerator, Gegner und Popups.
+        load_state() damit = exakt derselbe Lauf ab hier (gleiche Eingaben →
+        gleiche Schritte). Nicht enthalten: Stellschrauben, Masken, Canvas-Items.
+        """
+        _, key, gauss = self.rng.getstate()
+        parts = [
+            _STATE_HEAD.pack(STATE_MAGIC, self.t, self.steps, self.over, self.points, self.mult,
+                             self.player_x, self.prev_player_x, self.player_vx,
+                             self.dash_ready_t, self.dash_active_until,
+                             self.spawner.next_t, len(self.popups),
+                             gauss is not None, gauss or 0.0),
+            _STATE_RNG.pack(*key),
+        ]
+        for p in self.popups:
+            text = p["text"].encode()
+            kind = p["kind"].encode()
+            parts.append(_STATE_POPUP.pack(p["x"], p["y"], p["py"], p["vy"], p["t0"], p["ttl"],
+                                           len(text), len(kind)))
+            parts += (text, kind)
+        parts.append(self.enemies.pack())
+        return b"".join(parts)
+
+    def load_state(self, data: bytes):
+        """
+        Gegenstück zu save_state(). Vorher vergebene Canvas-Items gehören danach
+        niemandem mehr — die Anzeige gibt sie vorher frei (wie bei reset()).
+        """
+        (magic, self.t, self.steps, self.over, self.points, self.mult,
+         self.player_x, self.prev_player_x, self.player_vx,
+         self.dash_ready_t, self.dash_active_until,
+         self.spawner.next_t, n_popups, has_gauss, gauss) = _STATE_HEAD.unpack_from(data, 0)
+        if magic != STATE_MAGIC:
+            raise ValueError("kein Laufzustand")
+        offset = _STATE_HEAD.size
+        self.rng.setstate((3, _STATE_RNG.unpack_from(data, offset), gauss if has_gauss else None))
+        offset += _STATE_RNG.size
+
+        popups = []
+        for _ in range(n_popups):
+            x, y, py, vy, t0, ttl, n_text, n_kind = _STATE_POPUP.unpack_from(data, offset)
+            offset += _STATE_POPUP.size
+            text = data[offset:offset + n_text].decode()
+            offset += n_text
+            kind = data[offset:offset + n_kind].decode()
+            offset += n_kind
+            popups.append({"x": x, "y": y, "py": py, "vy": vy, "t0": t0, "ttl": ttl,
+                           "text": text, "kind": kind, "cid": None})
+        self.popups = popups
+        self.enemies.unpack(data, offset)
+        self.events = []
+
+    # -------------------------
+    # Aktionen
+    # -------------------------
+
+    def _dash(self, left: bool, right: bool):
+        if self.t < self.dash_ready_t:
+            return
+
+        # Richtung: Eingabe bevorzugen, sonst aktuelle Geschwindigkeit
+        if left and not right:
+            dir_ = -1
+        elif right and not left:
+            dir_ = 1
+        else:
+            if self.player_vx < 0:
+                dir_ = -1
+            elif self.player_vx > 0:
+                dir_ = 1
+            else:
+                dir_ = self.rng.choice([-1, 1])
+
+        self.dash_active_until = self.t + self.dash_time
+        self.player_vx = dir_ * self.dash_speed
+        self.dash_ready_t = self.t + self.dash_cd
+
+        self._popup(self.player_x, PLAYER_Y - 18, "SPRINT", "sprint", ttl=0.35)
+
+    def _pick_logo_size(self, desired: int):
+        return self.logo_pick[desired - LOGO_MIN]
+
+    def skip_to(self, t: float):
+        """Headless vorspulen: Uhr und Schwierigkeit springen auf t, ohne Schritte dazwischen."""
+        self.t = t
+        self.spawner.skip_to(t)
+
+    def _spawn_enemy_logo(self, elapsed: float, offset: float = 0.0):
+        """
+        elapsed: Spawnzeitpunkt (bestimmt das Tempo).
+        offset: Zeit vom Beginn des laufenden Schritts bis zum Spawn. Der Schritt
+        bewegt den Gegner um volle vy·dt, darum startet er um vy·offset weiter oben.
+        """
+        rng = self.rng
+        desired = rng.randint(LOGO_MIN, LOGO_MAX)
+        key = self._pick_logo_size(desired)
+
+        vy = self.enemy_base_speed + self.enemy_speed_accel * elapsed + rng.randint(-30, 70)
+
+        if key is None:
+            # Fallback: Kreis
+            w = h = desired
+        else:
+            w, h = self.logo_sizes[key]
+
+        x = rng.randint(10, WIDTH - 10 - w)
+        y = -h - rng.randint(0, 80) - vy * offset
+
+        self.enemies.spawn(x, y, w, h, vy, key)
+
+    def _popup(self, x, y, text, kind, ttl=0.9):
+        self.popups.append({"x": x, "y": y, "py": y, "vy": POPUP_VY, "t0": self.t, "ttl": ttl,
+                            "text": text, "kind": kind, "cid": None})
+
+    def _move_player_to_x(self, new_x):
+        half = self.player_w / 2
+        self.player_x = clamp(new_x, half + 10, WIDTH - half - 10)
+
+    # -------------------------
+    # Schritt
+    # -------------------------
+
+    def step(self, dt: float, inputs):
+        self.events = []
+        if self.over:
+            return
+        self.steps += 1
+        prof = self.profiler
+
+        left = inputs.get("left", False)
+        right = inputs.get("right", False)
+        if inputs.get("dash", False):
+            self._dash(left, right)
+        if prof is not None:
+            prof.lap("player")
+
+        t0 = self.t
+        self.t += dt
+
+        # Spawn: jeder fällige Zeitpunkt dieses Schritts mit seinem Versatz
+        for te in self.spawner.due(self.t):
+            self._spawn_enemy_logo(te, te - t0)
+
+        if prof is not None:
+            prof.lap("spawn")
+
+        # Multiplikator fällt langsam zurück
+        self.mult = max(1.0, self.mult - self.mult_decay * dt)
+
+        # Bewegung (Beschleunigung + Reibung)
+        target = 0.0
+        if left and not right:
+            target = -PLAYER_MAX_SPEED
+        elif right and not left:
+            target = PLAYER_MAX_SPEED
+
+        if self.t < self.dash_active_until:
+            pass
+        else:
+            if target != 0.0:
+                if self.player_vx < target:
+                    self.player_vx = min(target, self.player_vx + PLAYER_ACCEL * dt)
+                elif self.player_vx > target:
+                    self.player_vx = max(target, self.player_vx - PLAYER_ACCEL * dt)
+            else:
+                if self.player_vx > 0:
+                    self.player_vx = max(0.0, self.player_vx - PLAYER_FRICTION * dt)
+                elif self.player_vx < 0:
+                    self.player_vx = min(0.0, self.player_vx + PLAYER_FRICTION * dt)
+
+        self.prev_player_x = self.player_x
+        self._move_player_to_x(self.player_x + self.player_vx * dt)
+        if prof is not None:
+            prof.lap("player")
+
+        # Gegner bewegen + Kollision + "knapp vorbei"
+        pb = self.player_box()
+        graze_box = (pb[0] - GRAZE_MARGIN, pb[1] - GRAZE_MARGIN,
+                     pb[2] + GRAZE_MARGIN, pb[3] + GRAZE_MARGIN)
+
+        span = self.broadphase.span(graze_box) if self.broadphase is not None else None
+        hit, grazes, removed = self.enemies.step(dt, pb, graze_box, ENEMY_CULL_Y, span,
+                                                 stop_on_hit=not self.invulnerable,
+                                                 pdx=self.player_x - self.prev_player_x,
+                                                 masks=self.masks)
+
+        for mb in grazes:
+            gain = self.graze_bonus * self.mult
+            self.points += gain
+            self.mult = min(MULT_MAX, self.mult + GRAZE_MULT_GAIN)
+
+            cx = (mb[0] + mb[2]) / 2
+            cy = (mb[1] + mb[3]) / 2
+            self._popup(cx, cy - 18, f"+{gain:.0f}", "graze", ttl=0.8)
+
+        if hit and not self.invulnerable:
+            self.over = True
+            self.events.append(("gameover", self.t + self.points))
+
+        for cid in removed:
+            self.events.append(("despawn", cid))
+        if prof is not None:
+            prof.lap("enemies")
+
+        # Popups
+        new_pop = []
+        for p in self.popups:
+            if self.t - p["t0"] <= p["ttl"]:
+                p["py"] = p["y"]
+                p["y"] += p["vy"] * dt
+                new_pop.append(p)
+            elif p["cid"] is not None:
+                self.events.append(("popup_end", p["cid"]))
+        self.popups = new_pop
+        if prof is not None:
+            prof.lap("popups")
@@ -1,696 +1,1507 @@
-import tkinter as tk
-import random
-import time
-import json
-import os
-import sys
-
-# -------------------------
-# AUSWEICHEN — Arcade Edition (Tkinter)
-# Gegner: BBQ-Logo (PNG)
-# Spieler: Krankenschein (PNG) — automatisch maximal halb so groß
-# -------------------------
-
-WIDTH, HEIGHT = 720, 480
-FPS = 60
-FRAME_MS = int(1000 / FPS)
-
-BG = "#0D1020"
-FG = "#E7EAF0"
-ACCENT = "#7EE2B8"
-ACCENT2 = "#7AA2FF"
-GRID = "#141A2E"
-HUD_DIM = "#B9C0D6"
-
-BEST_FILE = "meteor_ausweichen_best.json"
-
-
-def resource_path(rel_path: str) -> str:
-    """
-    Funktioniert sowohl im Editor als auch später in einer PyInstaller-EXE.
-    """
-    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
-    return os.path.join(base, rel_path)
-
-
-LOGO_FILE = resource_path("bbq_logo.png")
-PLAYER_FILE = resource_path("krankenschein.png")
-
-# Spieler
-PLAYER_Y = HEIGHT - 125         # vertikale Position (oben am Bild)
-PLAYER_TARGET_W = 160           # grobe Zielbreite VOR der Halbierung
-PLAYER_EXTRA_HALVE = True       # zusätzlich halbieren (50%)
-
-# Logo-Gegner Größenwunsch (wir wählen vorbereitete Varianten)
-LOGO_MIN, LOGO_MAX = 24, 64
-
-# Gameplay
-GRAZE_MARGIN = 18               # "knapp vorbei"-Zone um den Spieler
-GRAZE_BONUS = 12.0
-GRAZE_MULT_GAIN = 0.22
-MULT_DECAY = 0.35               # Multiplikator fällt pro Sekunde Richtung 1.0
-
-# Bewegung
-PLAYER_MAX_SPEED = 520.0
-PLAYER_ACCEL = 2400.0
-PLAYER_FRICTION = 3200.0
-
-# Sprint
-DASH_CD = 1.25                  # Cooldown
-DASH_TIME = 0.10                # Dauer
-DASH_SPEED = 1150.0
-
-# Gegner
-SPAWN_RATE_START = 0.95
-SPAWN_ACCEL = 0.065
-ENEMY_BASE_SPEED = 190.0
-ENEMY_SPEED_ACCEL = 12.0
-
-
-def clamp(x, a, b):
-    return max(a, min(b, x))
-
-
-def aabb_intersect(a, b) -> bool:
-    ax1, ay1, ax2, ay2 = a
-    bx1, by1, bx2, by2 = b
-    return not (ax2 < bx1 or ax1 > bx2 or ay2 < by1 or ay1 > by2)
-
-
-class Game:
-    def __init__(self, root: tk.Tk):
-        self.root = root
-        root.title("Ausweichen — ←/→ bewegen | LEERTASTE Sprint | P Pause | R Neustart | ESC Beenden")
-        root.resizable(False, False)
-
-        self.canvas = tk.Canvas(root, width=WIDTH, height=HEIGHT, bg=BG, highlightthickness=0)
-        self.canvas.pack()
-
-        # Tastenzustand
-        self.left = False
-        self.right = False
-
-        root.bind("<KeyPress-Left>", lambda e: self._set_dir("L", True))
-        root.bind("<KeyRelease-Left>", lambda e: self._set_dir("L", False))
-        root.bind("<KeyPress-Right>", lambda e: self._set_dir("R", True))
-        root.bind("<KeyRelease-Right>", lambda e: self._set_dir("R", False))
-
-        # optional: A/D
-        root.bind("<KeyPress-a>", lambda e: self._set_dir("L", True))
-        root.bind("<KeyRelease-a>", lambda e: self._set_dir("L", False))
-        root.bind("<KeyPress-d>", lambda e: self._set_dir("R", True))
-        root.bind("<KeyRelease-d>", lambda e: self._set_dir("R", False))
-
-        root.bind("<Escape>", lambda e: root.destroy())
-        root.bind("<KeyPress-space>", lambda e: self._dash())
-        root.bind("<KeyPress-p>", lambda e: self._toggle_pause())
-        root.bind("<KeyPress-P>", lambda e: self._toggle_pause())
-        root.bind("<KeyPress-r>", lambda e: self._restart())
-        root.bind("<KeyPress-R>", lambda e: self._restart())
-        root.bind("<KeyPress-Return>", lambda e: self._start_from_menu())
-
-        self._load_best()
-        self._load_logo_varianten()
-        self._load_player_image()
-
-        self._init_scene()
-        self._to_menu()
-
-        self.last_t = time.perf_counter()
-        self._tick()
-
-    # -------------------------
-    # Bestwert speichern/laden
-    # -------------------------
-
-    def _load_best(self):
-        self.best = 0.0
-        try:
-            if os.path.exists(BEST_FILE):
-                with open(BEST_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.best = float(data.get("best", 0.0))
-        except Exception:
-            self.best = 0.0
-
-    def _save_best(self):
-        try:
-            with open(BEST_FILE, "w", encoding="utf-8") as f:
-                json.dump({"best": round(self.best, 3)}, f)
-        except Exception:
-            pass
-
-    # -------------------------
-    # Bilder laden
-    # -------------------------
-
-    def _load_logo_varianten(self):
-        """
-        Logo mehrfach skaliert vorbereiten (ohne PIL nur subsample/zoom in Ganzzahlen).
-        Wichtig: Referenzen halten, sonst verschwinden Bilder.
-        """
-        self.logo_ok = False
-        self.logo_base = None
-        self.logo_variants = {}
-        self.logo_sizes = [24, 28, 32, 36, 40, 48, 56, 64]
-
-        try:
-            self.logo_base = tk.PhotoImage(file=LOGO_FILE)
-            bw = self.logo_base.width()
-
-            for target in self.logo_sizes:
-                if bw >= target:
-                    f = max(1, round(bw / target))
-                    img = self.logo_base.subsample(f, f)
-                else:
-                    f = max(1, round(target / bw))
-                    img = self.logo_base.zoom(f, f)
-
-                self.logo_variants[target] = img
-
-            self.logo_ok = True
-        except Exception as e:
-            print(f"[FEHLER] Logo konnte nicht geladen werden: {LOGO_FILE}")
-            print(f"        Grund: {e}")
-            self.logo_ok = False
-            self.logo_variants = {}
-
-    def _pick_logo_variant(self, desired_size: int):
-        if not self.logo_ok:
-            return None
-        best_key = min(self.logo_sizes, key=lambda s: abs(s - desired_size))
-        return self.logo_variants[best_key]
-
-    def _load_player_image(self):
-        """
-        Spielerbild laden (PNG).
-        Skaliert grob auf PLAYER_TARGET_W und halbiert danach zusätzlich (max. 50%).
-        """
-        self.player_img = None
-        self.player_w = 90
-        self.player_h = 18
-
-        try:
-            base = tk.PhotoImage(file=PLAYER_FILE)
-            bw = base.width()
-
-            # 1) grob auf Zielbreite
-            if bw >= PLAYER_TARGET_W:
-                f = max(1, round(bw / PLAYER_TARGET_W))
-                img = base.subsample(f, f)
-            else:
-                f = max(1, round(PLAYER_TARGET_W / bw))
-                img = base.zoom(f, f)
-
-            # 2) zusätzlich halbieren
-            if PLAYER_EXTRA_HALVE:
-                img = img.subsample(2, 2)
-
-            self.player_img = img
-            self.player_w = img.width()
-            self.player_h = img.height()
-
-        except Exception as e:
-            print(f"[FEHLER] Spielerbild konnte nicht geladen werden: {PLAYER_FILE}")
-            print(f"        Grund: {e}")
-            self.player_img = None
-            self.player_w = 90
-            self.player_h = 18
-
-    # -------------------------
-    # Szene / UI
-    # -------------------------
-
-    def _init_scene(self):
-        self.canvas.delete("all")
-
-        # Raster
-        for x in range(0, WIDTH, 24):
-            self.canvas.create_line(x, 0, x, HEIGHT, fill=GRID)
-        for y in range(0, HEIGHT, 24):
-            self.canvas.create_line(0, y, WIDTH, y, fill=GRID)
-
-        # Sternfeld (3 Ebenen)
-        self.stars = []
-        self.star_ids = []
-        for layer in range(3):
-            count = 38 if layer == 0 else (26 if layer == 1 else 18)
-            speed = 35 + layer * 55
-            size_min = 1 + layer
-            size_max = 2 + layer
-            for _ in range(count):
-                sx = random.randint(0, WIDTH)
-                sy = random.randint(0, HEIGHT)
-                r = random.randint(size_min, size_max)
-                sid = self.canvas.create_oval(
-                    sx - r, sy - r, sx + r, sy + r,
-                    fill=("#232A45" if layer == 0 else ("#2D3660" if layer == 1 else "#3C4A85")),
-                    outline=""
-                )
-                self.stars.append({"x": sx, "y": sy, "r": r, "vy": speed})
-                self.star_ids.append(sid)
-
-        # HUD
-        self.hud_id = self.canvas.create_text(
-            12, 10, anchor="nw", fill=FG, font=("Consolas", 14),
-            text=""
-        )
-
-        # Sprint-Leiste
-        self.dash_bar_bg = self.canvas.create_rectangle(12, 36, 172, 48, fill="#0B0E19", outline="#222A44")
-        self.dash_bar_fg = self.canvas.create_rectangle(12, 36, 12, 48, fill=ACCENT2, outline="")
-        self.canvas.create_text(178, 42, anchor="w", fill=HUD_DIM, font=("Consolas", 11), text="SPRINT")
-
-        self.overlay_items = []
-
-    def _clear_overlay(self):
-        for item in self.overlay_items:
-            self.canvas.delete(item)
-        self.overlay_items = []
-
-    def _to_menu(self):
-        self.state = "menu"
-        self._clear_overlay()
-
-        title = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 - 85,
-            fill=FG, font=("Consolas", 40, "bold"),
-            text="AUSWEICHEN"
-        )
-
-        instr = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 + 20,
-            fill=FG, font=("Consolas", 12),
-            text="ENTER = Start | ←/→ oder A/D = Bewegen | LEERTASTE = Sprint",
-            width=WIDTH - 80, justify="center"
-        )
-        instr2 = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 + 50,
-            fill=HUD_DIM, font=("Consolas", 11),
-            text="P = Pause | R = Neustart | ESC = Beenden | Knapp vorbei = Bonus + Multiplikator",
-            width=WIDTH - 80, justify="center"
-        )
-
-        best = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 + 95,
-            fill=ACCENT, font=("Consolas", 15, "bold"),
-            text=f"Bestwert: {self.best:.1f}"
-        )
-
-        self.overlay_items += [title, instr, instr2, best]
-
-        self._reset_run_objects(create_player=True)
-        self._update_hud(0.0)
-
-    def _start_from_menu(self):
-        if self.state == "menu":
-            self.start()
-
-    def start(self):
-        self._clear_overlay()
-        self._reset_run_objects(create_player=True)
-        self.state = "playing"
-        self.start_time = time.perf_counter()
-        self.last_t = time.perf_counter()
-
-    def _restart(self):
-        if self.state in ("gameover", "paused", "playing"):
-            self.start()
-        else:
-            self._to_menu()
-
-    def _toggle_pause(self):
-        if self.state == "playing":
-            self.state = "paused"
-            self._show_pause()
-        elif self.state == "paused":
-            self._clear_overlay()
-            self.state = "playing"
-            self.last_t = time.perf_counter()
-
-    def _show_pause(self):
-        self._clear_overlay()
-        dim = self.canvas.create_rectangle(0, 0, WIDTH, HEIGHT, fill="#000000", outline="", stipple="gray50")
-        t = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 - 10,
-            fill=FG, font=("Consolas", 38, "bold"),
-            text="PAUSE"
-        )
-        h = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 + 35,
-            fill=FG, font=("Consolas", 13),
-            text="P = Weiter | R = Neustart | ESC = Beenden",
-            width=WIDTH - 80, justify="center"
-        )
-        self.overlay_items += [dim, t, h]
-
-    def _game_over(self, score: float):
-        self.state = "gameover"
-        self._clear_overlay()
-
-        if score > self.best:
-            self.best = score
-            self._save_best()
-
-        dim = self.canvas.create_rectangle(0, 0, WIDTH, HEIGHT, fill="#000000", outline="", stipple="gray50")
-        t = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 - 55,
-            fill=FG, font=("Consolas", 44, "bold"),
-            text="GAME OVER"
-        )
-        s = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 + 5,
-            fill=FG, font=("Consolas", 18),
-            text=f"Punkte: {score:.1f}   Bestwert: {self.best:.1f}"
-        )
-        h = self.canvas.create_text(
-            WIDTH // 2, HEIGHT // 2 + 50,
-            fill=FG, font=("Consolas", 13),
-            text="R = Neustart | ENTER = Menü | ESC = Beenden",
-            width=WIDTH - 80, justify="center"
-        )
-        self.overlay_items += [dim, t, s, h]
-
-    # -------------------------
-    # Spieler / Gegner / Popups
-    # -------------------------
-
-    def _reset_run_objects(self, create_player: bool):
-        # Gegner + Popups entfernen
-        if hasattr(self, "enemies"):
-            for m in self.enemies:
-                self.canvas.delete(m["id"])
-        if hasattr(self, "popups"):
-            for p in self.popups:
-                self.canvas.delete(p["id"])
-
-        # Spieler entfernen
-        if hasattr(self, "player_id"):
-            self.canvas.delete(self.player_id)
-
-        # Schatten entfernen
-        if hasattr(self, "player_shadow_ids"):
-            for sid in self.player_shadow_ids:
-                self.canvas.delete(sid)
-
-        self.enemies = []
-        self.popups = []
-        self.player_shadow_ids = []
-
-        # Lauf-Stats
-        self.points = 0.0
-        self.mult = 1.0
-
-        # Schwierigkeit
-        self.spawn_rate = SPAWN_RATE_START
-        self.spawn_accel = SPAWN_ACCEL
-        self.enemy_base_speed = ENEMY_BASE_SPEED
-        self.enemy_speed_accel = ENEMY_SPEED_ACCEL
-
-        # Bewegung
-        self.player_x = WIDTH // 2
-        self.player_vx = 0.0
-
-        # Sprint
-        self.dash_cd = DASH_CD
-        self.dash_time = DASH_TIME
-        self.dash_speed = DASH_SPEED
-        self.dash_ready_t = 0.0
-        self.dash_active_until = 0.0
-
-        if create_player:
-            self._create_player()
-
-    def _create_player(self):
-        x = self.player_x
-        y = PLAYER_Y
-
-        # Eleganter Schatten ohne Kastenoptik (weiche Ovale, kein Rechteck)
-        self.player_shadow_ids = []
-
-        if self.player_img is not None:
-            w = self.player_w
-            h = self.player_h
-
-            # Sehr weicher Schatten (2 Lagen) leicht nach unten/rechts
-            s2 = self.canvas.create_oval(
-                x - w / 2 + 2, y + 12,
-                x + w / 2 + 18, y + h + 20,
-                fill="#000000", outline="", stipple="gray75"
-            )
-            s1 = self.canvas.create_oval(
-                x - w / 2 + 6, y + 8,
-                x + w / 2 + 14, y + h + 16,
-                fill="#000000", outline="", stipple="gray50"
-            )
-            self.player_shadow_ids = [s2, s1]
-
-            # Spielerbild
-            self.player_id = self.canvas.create_image(x, y, image=self.player_img, anchor="n")
-        else:
-            # Fallback: Balken ohne Schatten
-            self.player_id = self.canvas.create_rectangle(
-                x - self.player_w / 2, y, x + self.player_w / 2, y + self.player_h,
-                fill=ACCENT, outline=""
-            )
-
-    def _player_bbox(self):
-        return self.canvas.bbox(self.player_id)
-
-    def _move_player_to_x(self, new_x):
-        half = self.player_w / 2
-        new_x = clamp(new_x, half + 10, WIDTH - half - 10)
-        dx = new_x - self.player_x
-        self.player_x = new_x
-
-        self.canvas.move(self.player_id, dx, 0)
-        for sid in getattr(self, "player_shadow_ids", []):
-            self.canvas.move(sid, dx, 0)
-
-    def _set_dir(self, which: str, state: bool):
-        if which == "L":
-            self.left = state
-        else:
-            self.right = state
-
-    def _dash(self):
-        if self.state != "playing":
-            return
-        now = time.perf_counter()
-        if now < self.dash_ready_t:
-            return
-
-        # Richtung: Eingabe bevorzugen, sonst aktuelle Geschwindigkeit
-        if self.left and not self.right:
-            dir_ = -1
-        elif self.right and not self.left:
-            dir_ = 1
-        else:
-            if self.player_vx < 0:
-                dir_ = -1
-            elif self.player_vx > 0:
-                dir_ = 1
-            else:
-                dir_ = random.choice([-1, 1])
-
-        self.dash_active_until = now + self.dash_time
-        self.player_vx = dir_ * self.dash_speed
-        self.dash_ready_t = now + self.dash_cd
-
-        self._popup_text(self.player_x, PLAYER_Y - 18, "SPRINT", ACCENT2, ttl=0.35)
-
-    def _spawn_enemy_logo(self, elapsed: float):
-        desired = random.randint(LOGO_MIN, LOGO_MAX)
-        img = self._pick_logo_variant(desired)
-
-        vy = self.enemy_base_speed + self.enemy_speed_accel * elapsed + random.randint(-30, 70)
-
-        if img is None:
-            # Fallback: Kreis
-            w = h = desired
-            x = random.randint(10, WIDTH - 10 - w)
-            y = -h - random.randint(0, 80)
-            enemy_id = self.canvas.create_oval(x, y, x + w, y + h, fill="#FF5C7A", outline="")
-            self.enemies.append({"id": enemy_id, "vy": vy, "y": y, "grazed": False})
-            return
-
-        w = img.width()
-        h = img.height()
-
-        x = random.randint(10, WIDTH - 10 - w)
-        y = -h - random.randint(0, 80)
-
-        enemy_id = self.canvas.create_image(x + w / 2, y + h / 2, image=img)
-
-        # Referenz auf img behalten (gegen Garbage Collection)
-        self.enemies.append({"id": enemy_id, "vy": vy, "y": y, "grazed": False, "img": img})
-
-    def _popup_text(self, x, y, text, color, ttl=0.9):
-        pid = self.canvas.create_text(x, y, fill=color, font=("Consolas", 14, "bold"), text=text)
-        self.popups.append({"id": pid, "vy": -45.0, "t0": time.perf_counter(), "ttl": ttl})
-
-    # -------------------------
-    # HUD + Hintergrund
-    # -------------------------
-
-    def _update_starfield(self, dt):
-        for s, sid in zip(self.stars, self.star_ids):
-            s["y"] += s["vy"] * dt
-            if s["y"] > HEIGHT + 10:
-                s["y"] = -10
-                s["x"] = random.randint(0, WIDTH)
-            r = s["r"]
-            self.canvas.coords(sid, s["x"] - r, s["y"] - r, s["x"] + r, s["y"] + r)
-
-    def _update_hud(self, elapsed):
-        score = max(0.0, elapsed + self.points)
-        line1 = f"Punkte: {score:6.1f}   Multi: {self.mult:4.2f}   Bestwert: {self.best:6.1f}"
-        line2 = f"Logos: {len(self.enemies):3d}   (Knapp vorbei = Bonus)"
-        self.canvas.itemconfig(self.hud_id, text=f"{line1}\n{line2}")
-
-        # Sprint-Leiste
-        now = time.perf_counter()
-        if self.state != "playing":
-            frac = 1.0
-        else:
-            if now >= self.dash_ready_t:
-                frac = 1.0
-            else:
-                frac = clamp(1.0 - ((self.dash_ready_t - now) / self.dash_cd), 0.0, 1.0)
-
-        x0, y0, x1, y1 = self.canvas.coords(self.dash_bar_bg)
-        fill_x = x0 + (x1 - x0) * frac
-        self.canvas.coords(self.dash_bar_fg, x0, y0, fill_x, y1)
-
-    # -------------------------
-    # Loop
-    # -------------------------
-
-    def _tick(self):
-        now = time.perf_counter()
-        dt = now - self.last_t
-        self.last_t = now
-        dt = min(dt, 0.05)
-
-        # Hintergrund läuft immer
-        self._update_starfield(dt)
-
-        if self.state == "playing":
-            elapsed = now - self.start_time
-
-            # Schwierigkeit steigt
-            self.spawn_rate += self.spawn_accel * dt
-
-            # Spawn
-            p = self.spawn_rate * dt
-            while p > 1.0:
-                self._spawn_enemy_logo(elapsed)
-                p -= 1.0
-            if random.random() < p:
-                self._spawn_enemy_logo(elapsed)
-
-            # Multiplikator fällt langsam zurück
-            self.mult = max(1.0, self.mult - MULT_DECAY * dt)
-
-            # Bewegung (Beschleunigung + Reibung)
-            target = 0.0
-            if self.left and not self.right:
-                target = -PLAYER_MAX_SPEED
-            elif self.right and not self.left:
-                target = PLAYER_MAX_SPEED
-
-            if now < self.dash_active_until:
-                pass
-            else:
-                if target != 0.0:
-                    if self.player_vx < target:
-                        self.player_vx = min(target, self.player_vx + PLAYER_ACCEL * dt)
-                    elif self.player_vx > target:
-                        self.player_vx = max(target, self.player_vx - PLAYER_ACCEL * dt)
-                else:
-                    if self.player_vx > 0:
-                        self.player_vx = max(0.0, self.player_vx - PLAYER_FRICTION * dt)
-                    elif self.player_vx < 0:
-                        self.player_vx = min(0.0, self.player_vx + PLAYER_FRICTION * dt)
-
-            self._move_player_to_x(self.player_x + self.player_vx * dt)
-
-            # Gegner bewegen + Kollision + "knapp vorbei"
-            alive = []
-            pb = self._player_bbox()
-            graze_box = (pb[0] - GRAZE_MARGIN, pb[1] - GRAZE_MARGIN,
-                         pb[2] + GRAZE_MARGIN, pb[3] + GRAZE_MARGIN)
-
-            for m in self.enemies:
-                dy = m["vy"] * dt
-                m["y"] += dy
-                self.canvas.move(m["id"], 0, dy)
-
-                mb = self.canvas.bbox(m["id"])
-                if mb:
-                    # Kollision
-                    if aabb_intersect(pb, mb):
-                        score = (now - self.start_time) + self.points
-                        self._game_over(score)
-                        break
-
-                    # knapp vorbei (ohne Kollision)
-                    if (not m.get("grazed", False)) and aabb_intersect(graze_box, mb):
-                        m["grazed"] = True
-                        gain = GRAZE_BONUS * self.mult
-                        self.points += gain
-                        self.mult = min(6.0, self.mult + GRAZE_MULT_GAIN)
-
-                        cx = (mb[0] + mb[2]) / 2
-                        cy = (mb[1] + mb[3]) / 2
-                        self._popup_text(cx, cy - 18, f"+{gain:.0f}", ACCENT, ttl=0.8)
-
-                if m["y"] < HEIGHT + 140:
-                    alive.append(m)
-                else:
-                    self.canvas.delete(m["id"])
-
-            if self.state == "playing":
-                self.enemies = alive
-
-            # Popups animieren
-            new_pop = []
-            for p in self.popups:
-                age = now - p["t0"]
-                if age <= p["ttl"]:
-                    self.canvas.move(p["id"], 0, p["vy"] * dt)
-                    new_pop.append(p)
-                else:
-                    self.canvas.delete(p["id"])
-            self.popups = new_pop
-
-            self._update_hud(now - self.start_time)
-
-        elif self.state == "menu":
-            self._update_hud(0.0)
-
-        elif self.state in ("paused", "gameover"):
-            self._update_hud(time.perf_counter() - getattr(self, "start_time", time.perf_counter()))
-
-        # ENTER: im Game Over zurück ins Menü
-        if not hasattr(self, "_return_bound"):
-            self._return_bound = True
-            self.root.bind("<KeyPress-Return>", self._return_dispatch)
-
-        self.root.after(FRAME_MS, self._tick)
-
-    def _return_dispatch(self, e=None):
-        if self.state == "menu":
-            self.start()
-        elif self.state == "gameover":
-            self._to_menu()
-
-
-def main():
-    root = tk.Tk()
-    Game(root)
-    root.mainloop()
-
-
-if __name__ == "__main__":
-    main()
+import time
+
+STARTUP_T0 = time.perf_counter()    # --trace-startup: Importe zählen mit
+
+import tkinter as tk
+import argparse
+import random
+import json
+import os
+import sys
+import threading
+
+from profiler import FrameProfiler, CountingTk, IdleMeter, InputLatency, StartupTrace
+from render import (
+    RENDER_BACKENDS, Framebuffer, FramePacer, ItemPool, QualityGovernor, RetainedCanvas, hex_rgb,
+)
+from replay import (
+    LEFT_KEYS, RIGHT_KEYS, DASH_KEYS, PAUSE_KEYS, REPLAY_SPEEDS,
+    RewindBuffer, ReplayRecorder, ReplayInput, load_replay, replay_headless, verify,
+)
+from simulation import (
+    WIDTH, HEIGHT, PLAYER_Y, LOGO_FILE, PLAYER_FILE, PLAYER_FALLBACK_W, PLAYER_FALLBACK_H,
+    SIM_HZ, ENEMY_STORES, BROADPHASES, Simulation, headless_sprite_sizes, png_size, load_numpy,
+)
+from sprites import SpriteCache, sprite_masks
+from worker import KeyInput, SimWorker
+
+# -------------------------
+# AUSWEICHEN — Arcade Edition (Tkinter)
+# Gegner: BBQ-Logo (PNG)
+# Spieler: Krankenschein (PNG) — automatisch maximal halb so groß
+# -------------------------
+
+FPS = 60
+FPS_CHOICES = (60, 120, 144)    # Ziel-Bildraten für --fps (Frames zu festen Zeitpunkten, FramePacer)
+MAX_FRAME_DT = 0.05             # variabler Takt: dt wird hier gekappt
+MAX_CATCHUP = 0.25              # fester Takt: mehr Rückstand wird verworfen
+STAR_SEED = 1                   # Sternfeld ist Deko, aber reproduzierbar
+STAR_COUNTS = (38, 26, 18)      # Sterne je Ebene (hinten → vorne) bei Dichte 1.0
+STAR_COLORS = ("#232A45", "#2D3660", "#3C4A85")
+
+# Canvas-Item-Pools: so viele Items werden vorab angelegt (wachsen bei Bedarf)
+ENEMY_POOL_SIZE = 64
+POPUP_POOL_SIZE = 16
+OVERLAY_TEXT_POOL_SIZE = 4
+
+PROFILE_OVERLAY_EVERY = 15      # Profiler-Overlay alle N Frames neu schreiben
+BBOX_TOLERANCE = 2              # Tk rundet Bildpositionen, Ovale haben einen Rand
+GRID_STEP = 24                  # Rasterabstand im Hintergrund (WIDTH/HEIGHT sind Vielfache)
+DASH_BAR = (12, 36, 172, 48)    # Sprint-Leiste: Rahmen (x0, y0, x1, y1)
+
+# Darstellungsstufen des Qualitätsreglers (render.QualityGovernor), jede spart mehr als
+# die vorige: Stipple (Spielerschatten, Abdunkeln bei Pause/Game Over), Sternebenen
+# (die vorderen bleiben), gleichzeitig sichtbare Popups, Hintergrundraster.
+# Am Spiel ändert sich nichts — die Simulation sieht keine Stufe.
+QUALITY_LEVELS = (
+    {"name": "voll", "stipple": True, "stars": 3, "popups": None, "grid": True},
+    {"name": "ohne Stipple", "stipple": False, "stars": 3, "popups": None, "grid": True},
+    {"name": "2 Sternebenen", "stipple": False, "stars": 2, "popups": None, "grid": True},
+    {"name": "1 Sternebene, 3 Popups", "stipple": False, "stars": 1, "popups": 3, "grid": True},
+    {"name": "ohne Raster", "stipple": False, "stars": 1, "popups": 3, "grid": False},
+)
+# Leerlauf: außerhalb eines Laufs reicht eine niedrige Bildrate (0 = keine Frames,
+# bis eine Taste kommt). Im Hintergrund (Fenster ohne Fokus oder minimiert) ruht
+# alles; ein laufendes Spiel pausiert dort von selbst (Replays laufen weiter).
+# Das Spiel selbst läuft immer mit voller Rate.
+IDLE_HZ = {"menu": 20, "paused": 0, "gameover": 20}
+QUALITY_CHOICES = ("auto",) + tuple(str(i) for i in range(len(QUALITY_LEVELS)))
+
+# Zeit bis zum ersten Frame (Prozessstart bis Menü sichtbar), geprüft mit --check-ttff.
+# Grafiken zählen nicht mit: sie laden im Hintergrund, das Menü zeigt solange einen Platzhalter.
+TTFF_TARGET_MS = 300
+
+BG = "#0D1020"
+FG = "#E7EAF0"
+ACCENT = "#7EE2B8"
+ACCENT2 = "#7AA2FF"
+GRID = "#141A2E"
+HUD_DIM = "#B9C0D6"
+ENEMY_FALLBACK = "#FF5C7A"      # Kreise statt Logos, falls das Logo nicht lädt
+
+# Spieltasten (mit --record aufgezeichnet); Links/Rechts auch beim Loslassen
+RESTART_KEYS = ("r", "R")
+REWIND_KEY = "BackSpace"        # Übungsmodus: gedrückt halten = zurückspulen
+GAME_KEYS = LEFT_KEYS + RIGHT_KEYS + DASH_KEYS + PAUSE_KEYS + RESTART_KEYS + ("Return",)
+
+# Popup-Farben je Art (siehe Simulation._popup)
+POPUP_COLORS = {"graze": ACCENT, "sprint": ACCENT2}
+
+BEST_FILE = "meteor_ausweichen_best.json"
+
+
+class Game:
+    # austauschbar (benchmark.py setzt Attrappen ohne Tk ein)
+    Canvas = tk.Canvas
+    PhotoImage = tk.PhotoImage
+
+    def __init__(self, root: tk.Tk, sim_hz: int = SIM_HZ, seed=None, enemy_store=None,
+                 broadphase="grid", check_bbox=False, star_density=1.0,
+                 enemy_pool_size=ENEMY_POOL_SIZE, profile=False, autorun=True,
+                 record=None, replay=None, replay_speed=1, sprite_cache=None,
+                 trace=None, trace_quit=False, collision="mask", render="canvas", fps=FPS,
+                 threaded=False, quality="auto", idle=True, practice=False):
+        """
+        sim_hz: fester Simulationstakt (0 = variables dt wie früher).
+        seed: fester Seed für jeden Lauf (None = jeder Lauf neu gewürfelt).
+        enemy_store: "list" (dicts) oder "array" (NumPy, für sehr viele Logos);
+            None = "list", im Übungsmodus "array" (falls NumPy da ist).
+        broadphase: "grid" (nur Gegner im Spielerband testen) oder "brute".
+        check_bbox: Debug — Python-Boxen jeden Frame gegen canvas.bbox prüfen.
+        star_density: Faktor auf STAR_COUNTS (Kosten pro Frame bleiben gleich).
+        enemy_pool_size: vorab angelegte Canvas-Items für Gegner.
+        profile: Frame-Profiler von Anfang an mitlaufen lassen (F3 zeigt ihn an).
+        autorun: Frames selbst per root.after planen (False: Aufrufer ruft _frame()).
+        record: Pfad — jeder Lauf bis zum Game Over wird als Replay gespeichert.
+        replay: Pfad — Replay abspielen (Tastatur wird ignoriert), replay_speed-fach.
+        sprite_cache: Ordner für die erzeugten Sprite-Varianten (Standard: Benutzer-Cache).
+        trace: StartupTrace — Startphasen mitschreiben und ausgeben (--trace-startup).
+        trace_quit: nach erstem Frame + geladenen Grafiken beenden (--check-ttff).
+        collision: "mask" (pixelgenau, sobald die Grafiken geladen sind) oder "box".
+        render: "canvas" (ein Canvas-Item je Objekt) oder "framebuffer" (Hintergrund,
+            Sterne, Spieler und Logos als ein Bild, NumPy; Text bleibt Canvas-Item
+            und liegt damit über den Logos; check_bbox entfällt).
+        fps: Ziel-Bildrate; Frames laufen zu festen Zeitpunkten (render.FramePacer).
+        threaded: Simulation im eigenen Thread (worker.SimWorker), Tk zeichnet nur
+            deren Snapshots — braucht einen festen Takt; check_bbox entfällt.
+        quality: "auto" (Stufe folgt den Frame-Kosten) oder feste Stufe aus QUALITY_LEVELS.
+        idle: außerhalb eines Laufs und im Hintergrund seltener oder gar nicht
+            zeichnen (IDLE_HZ); CPU je Zustand misst self.idle_meter.
+        practice: Übungsmodus — die letzten Sekunden liegen als Zustände im Speicher
+            (replay.RewindBuffer, einer je Frame), RÜCKTASTE spult zurück, auch aus
+            dem Game Over; Bestwerte zählen nicht. Braucht einen festen Takt, nicht
+            mit threaded, record oder replay. Ohne enemy_store liegen die Gegner dann
+            als Arrays vor (falls NumPy da ist): ein Zustand ist eine Pufferkopie.
+        """
+        self.root = root
+        self.trace = trace
+        self.trace_quit = trace_quit
+        self.first_frame = True
+        self.autorun = autorun
+        self.pacer = FramePacer(fps)
+        level = 0 if quality == "auto" else int(quality)
+        self.governor = QualityGovernor(self.pacer.period, len(QUALITY_LEVELS), level,
+                                        fixed=quality != "auto")
+        self.quality = QUALITY_LEVELS[level]
+        self.latency = InputLatency()
+        self.idle = idle
+        self.idle_meter = IdleMeter()
+        self.focused = True
+        self.mapped = True
+        self.tick_id = None
+        self.tick_mode = "active"
+        self.sim_hz = sim_hz
+        self.recorder = ReplayRecorder(record) if record else None
+        self.replay = None
+        self.time_scale = 1.0
+        if replay:
+            header, events = load_replay(replay)
+            self.replay = (header, ReplayInput(header, events))
+            self.time_scale = float(replay_speed)
+            sim_hz = header["sim_hz"]
+            seed = header["seed"]
+        if render == "framebuffer" and load_numpy() is None:
+            print("[FEHLER] NumPy nicht installiert — Anzeige läuft über Canvas-Items.")
+            render = "canvas"
+        self.render = render
+        self.star_density = star_density
+        self.enemy_pool_size = enemy_pool_size
+        self.check_bbox = check_bbox and render == "canvas"
+        self.bbox_checks = 0
+        self.bbox_mismatches = 0
+        self.sim_dt = 1.0 / sim_hz if sim_hz else 0.0
+        self.seed = seed
+        self.accumulator = 0.0
+        self.star_rng = random.Random(STAR_SEED)
+        root.title("Ausweichen — ←/→ bewegen | LEERTASTE Sprint | P Pause | R Neustart | ESC Beenden")
+        root.resizable(False, False)
+
+        self.canvas = self.Canvas(root, width=WIDTH, height=HEIGHT, bg=BG, highlightthickness=0)
+        self.canvas.pack()
+        self._mark("Fenster")
+
+        # Tastenzustand
+        self.left = False
+        self.right = False
+        self.dash_pending = False
+
+        # ←/→ und optional A/D, LEERTASTE, P, R, ENTER — alle über _key()
+        for key in GAME_KEYS:
+            root.bind(f"<KeyPress-{key}>", lambda e, k=key: self._on_key(k, True))
+            if key in LEFT_KEYS + RIGHT_KEYS:
+                root.bind(f"<KeyRelease-{key}>", lambda e, k=key: self._on_key(k, False))
+
+        root.bind("<Escape>", lambda e: root.destroy())
+        root.bind("<KeyPress-F3>", lambda e: (self._toggle_profiler_overlay(), self._wake()))
+        root.bind(f"<KeyPress-{REWIND_KEY}>", lambda e: (self._set_rewind(True), self._wake()))
+        root.bind(f"<KeyRelease-{REWIND_KEY}>", lambda e: self._set_rewind(False))
+
+        # Fokus und Minimieren: ein laufendes Spiel pausiert, im Hintergrund ruht der Leerlauf ganz
+        root.bind("<FocusIn>", lambda e: self._on_window(e, focused=True))
+        root.bind("<FocusOut>", lambda e: self._on_window(e, focused=False))
+        root.bind("<Map>", lambda e: self._on_window(e, mapped=True))
+        root.bind("<Unmap>", lambda e: self._on_window(e, mapped=False))
+
+        self._load_best()
+        self._mark("Bestwert")
+
+        # Übungsmodus: Zustand je Frame in den Ringpuffer (vor den Schritten des Frames)
+        self.rewind = None
+        self.rewinding = False
+        if practice:
+            if not sim_hz:
+                print("[FEHLER] Zurückspulen braucht einen festen Takt (--sim-hz > 0) — Übungsmodus aus.")
+            elif threaded or record or replay:
+                print("[FEHLER] Zurückspulen geht nicht mit --threaded, --record oder --replay — Übungsmodus aus.")
+            else:
+                self.rewind = RewindBuffer()
+                # Gegnerliste: Sichern kostet bei vielen Logos einen großen Teil des Frames.
+                # Eine ausdrücklich gewählte Art bleibt.
+                if enemy_store is None and load_numpy() is not None:
+                    enemy_store = "array"
+                elif enemy_store is None:
+                    print("[FEHLER] NumPy nicht installiert — Zurückspulen sichert die Gegnerliste "
+                          "(bei vielen Logos spürbar langsamer).")
+
+        self.enemy_store = enemy_store or "list"
+        self.broadphase = broadphase
+        self.collision = collision
+
+        # Grafiken laden im Hintergrund; Größen stehen schon in den PNG-Köpfen
+        self.sprites = SpriteCache(self.PhotoImage, sprite_cache)
+        self._start_asset_loading()
+
+        self.sim = self._make_sim()
+
+        # --threaded: Tk liest nur Snapshots; Items werden der Reihe nach vergeben
+        self.worker = None
+        self.keys = None
+        if threaded and sim_hz:
+            self.worker = SimWorker(self.sim, sim_hz)
+            self.check_bbox = False
+        elif threaded:
+            print("[FEHLER] --threaded braucht einen festen Takt (--sim-hz > 0) — Simulation läuft im Tk-Thread.")
+        self.snap = self.worker.snapshot if self.worker is not None else None
+        self.snap_enemy_cids = []
+        self.snap_popup_cids = []
+
+        # Profiler: None = aus (kostet dann nichts)
+        self.profiler = None
+        self.pairs_last = (0, 0)
+        self.profile_always = profile
+        self.profile_overlay = False
+        if profile:
+            self._set_profiling(True)
+
+        self._init_scene()
+        self._mark("Szene")
+        self._to_menu()
+        self._mark("Menü")
+
+        self.last_t = time.perf_counter()
+        self._tick()
+
+    def _mark(self, stage: str):
+        if self.trace is not None:
+            self.trace.mark(stage)
+
+    def _make_sim(self) -> Simulation:
+        return Simulation(
+            logo_sizes=self.logo_sizes,
+            player_size=(self.player_w, self.player_h),
+            seed=self.seed,
+            enemy_store=self.enemy_store,
+            broadphase=self.broadphase,
+        )
+
+    # -------------------------
+    # Bestwert speichern/laden
+    # -------------------------
+
+    def _load_best(self):
+        self.best = 0.0
+        try:
+            if os.path.exists(BEST_FILE):
+                with open(BEST_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                    self.best = float(data.get("best", 0.0))
+        except Exception:
+            self.best = 0.0
+
+    def _save_best(self):
+        try:
+            with open(BEST_FILE, "w", encoding="utf-8") as f:
+                json.dump({"best": round(self.best, 3)}, f)
+        except Exception:
+            pass
+
+    # -------------------------
+    # Bilder laden
+    # -------------------------
+
+    def _start_asset_loading(self):
+        """
+        Spritegrößen sofort aus den PNG-Köpfen (die Simulation braucht nur die),
+        die Varianten selbst erzeugt ein Hintergrund-Thread — nur bei kaltem
+        Cache kostet das spürbar Zeit. Tk-Bilder legt erst _finish_assets()
+        im Hauptthread an; bis dahin zeichnet die Szene Platzhalter.
+        """
+        logo_sizes, (self.player_w, self.player_h) = headless_sprite_sizes()
+        self.logo_sizes = logo_sizes
+        self.logo_ok = bool(logo_sizes)
+        self.player_img = None
+        self.asset_errors = {}
+        self.asset_masks = None
+        if png_size(PLAYER_FILE) is None:
+            self.player_w, self.player_h = PLAYER_FALLBACK_W, PLAYER_FALLBACK_H
+
+        self.loading = True
+        self.asset_thread = threading.Thread(target=self._prepare_assets, daemon=True)
+        self.asset_thread.start()
+
+    def _prepare_assets(self):
+        # Hintergrund-Thread: nur Dateien, kein Tk
+        for name, path, sizes in (("logo", LOGO_FILE, self.logo_sizes.values()),
+                                  ("player", PLAYER_FILE, [(self.player_w, self.player_h)])):
+            try:
+                if png_size(path) is None:
+                    raise OSError("Datei fehlt oder ist kein PNG")
+                self.sprites.prepare(path, sizes)
+                if self.render == "framebuffer":
+                    for w, h in sizes:
+                        self.sprites.pixels(path, w, h)
+            except Exception as e:
+                self.asset_errors[name] = e
+        if self.collision == "mask":
+            self.asset_masks = sprite_masks(self.logo_sizes, (self.player_w, self.player_h), self.sprites)
+
+    def wait_assets(self):
+        """Auf die Grafiken warten (Benchmark, Tests) statt sie im Frame abzuholen."""
+        self.asset_thread.join()
+        if self.loading:
+            self._finish_assets()
+
+    def _finish_assets(self):
+        self.loading = False
+
+        e = self.asset_errors.get("logo")
+        if e is not None:
+            print(f"[FEHLER] Logo konnte nicht geladen werden: {LOGO_FILE}")
+            print(f"        Grund: {e}")
+            # Fallback: Kreise — es läuft noch kein Lauf, die Simulation wird neu angelegt
+            if self.logo_ok:
+                self.logo_ok = False
+                self.logo_sizes = {}
+                profiler = self.sim.profiler
+                self.sim = self._make_sim()
+                self.sim.profiler = profiler
+                if self.worker is not None:
+                    self.worker.sim = self.sim
+                    self.worker.publish()
+                if self.fb is None:
+                    self.canvas.delete("enemy")
+                    self._create_enemy_pool()
+                    self.canvas.tag_raise("enemy", "player")
+
+        if self.asset_masks is not None:
+            self.sim.set_masks(*self.asset_masks)
+
+        e = self.asset_errors.get("player")
+        if e is not None:
+            print(f"[FEHLER] Spielerbild konnte nicht geladen werden: {PLAYER_FILE}")
+            print(f"        Grund: {e}")
+        elif self.fb is not None:
+            self.player_img = self.sprites.pixels(PLAYER_FILE, self.player_w, self.player_h)
+            self._create_player()
+        else:
+            # eigene Referenz: der Spieler bleibt sichtbar, auch wenn der LRU ihn verdrängt
+            self.player_img = self.sprites.photo(PLAYER_FILE, self.player_w, self.player_h)
+            self.view.flush()
+            self.canvas.delete("player")
+            self._create_player()
+            self.canvas.tag_raise("player", self.dash_label)
+
+        self._mark("Grafiken geladen")
+        if self.state == "menu":
+            self._to_menu()
+        if self.replay is not None:
+            self._check_replay_sizes()
+            self.start()
+
+    def _logo_image(self, size_key):
+        if not self.logo_ok or size_key is None:
+            return None
+        w, h = self.logo_sizes[size_key]
+        return self.sprites.photo(LOGO_FILE, w, h)
+
+    # -------------------------
+    # Szene / UI
+    # -------------------------
+
+    def _init_scene(self):
+        self.canvas.delete("all")
+        # Spielobjekte ändern sich nur über self.view: nur Änderungen gehen an Tk
+        self.view = RetainedCanvas(self.canvas)
+        self.hud_last = None
+
+        # Raster: ein vorberechnetes Bild statt einer Linie pro Rasterzeile.
+        # Framebuffer: dasselbe Item zeigt die ganze Szene (_draw_framebuffer).
+        self.fb = None
+        self.fb_puts = 0
+        if self.render == "framebuffer":
+            self.grid_img = self.PhotoImage(width=WIDTH, height=HEIGHT)
+            self.fb = Framebuffer(self.grid_img, self._grid_array())
+        else:
+            self.grid_img = self._grid_image()
+        self.grid_id = self.canvas.create_image(0, 0, image=self.grid_img, anchor="nw")
+
+        # Sternfeld (3 Ebenen)
+        # Jede Ebene ist eine Kachel der Höhe HEIGHT, zweimal übereinander
+        # (y und y - HEIGHT) und über ein Tag verschoben: ein canvas.move pro
+        # Ebene und Frame, egal wie viele Sterne.
+        self.star_layers = []
+        for layer, (count, color) in enumerate(zip(STAR_COUNTS, STAR_COLORS)):
+            tag = f"stars{layer}"
+            count = round(count * self.star_density)
+            size_min = 1 + layer
+            size_max = 2 + layer
+            stars = {}              # Framebuffer: Radius → (x links, y oben)
+            for _ in range(count):
+                sx = self.star_rng.randint(0, WIDTH)
+                sy = self.star_rng.randint(0, HEIGHT)
+                r = self.star_rng.randint(size_min, size_max)
+                if self.fb is not None:
+                    xs, ys = stars.setdefault(r, ([], []))
+                    xs.append(sx - r)
+                    ys.append(sy - r)
+                    continue
+                for oy in (0, -HEIGHT):
+                    self.canvas.create_oval(
+                        sx - r, sy + oy - r, sx + r, sy + oy + r,
+                        fill=color, outline="", tags=(tag,)
+                    )
+            groups = []
+            for r, (xs, ys) in stars.items():
+                # wie die Canvas-Kachel zweimal übereinander: ein blit je Radius
+                key = ("star", layer, r)
+                self.fb.add_ellipse(key, 2 * r, 2 * r, color)
+                groups.append((key, xs + xs, ys + [y - HEIGHT for y in ys]))
+            self.star_layers.append({"tag": tag, "vy": 35 + layer * 55, "offset": 0.0, "stars": groups,
+                                     "on": True})
+
+        # HUD
+        self.hud_id = self.canvas.create_text(
+            12, 10, anchor="nw", fill=FG, font=("Consolas", 14),
+            text=""
+        )
+
+        # Sprint-Leiste
+        x0, y0, x1, y1 = DASH_BAR
+        self.dash_bar_bg = self.canvas.create_rectangle(x0, y0, x1, y1, fill="#0B0E19", outline="#222A44")
+        self.dash_bar_fg = self.canvas.create_rectangle(x0, y0, x0, y1, fill=ACCENT2, outline="")
+        self.dash_label = self.canvas.create_text(178, 42, anchor="w", fill=HUD_DIM,
+                                                  font=("Consolas", 11), text="SPRINT")
+
+        # Spieler bleibt die ganze Zeit bestehen, wird nur neu positioniert
+        self._create_player()
+
+        # Pools (Reihenfolge = Stapelreihenfolge: Gegner < Popups < Overlay)
+        self._create_enemy_pool()
+        self.popup_pool = ItemPool(self.view, "text", POPUP_POOL_SIZE,
+                                   font=("Consolas", 14, "bold"))
+        self.overlay_dim_pool = ItemPool(self.view, "rectangle", 1, tag="overlay",
+                                         fill="#000000", outline="", stipple="gray50")
+        self.overlay_text_pool = ItemPool(self.view, "text", OVERLAY_TEXT_POOL_SIZE, tag="overlay")
+
+        # Profiler-Overlay (F3)
+        self.profile_text = self.canvas.create_text(
+            12, HEIGHT - 10, anchor="sw", fill=HUD_DIM, font=("Consolas", 10),
+            text="", state="hidden", tags=("overlay",)
+        )
+
+        self.overlay_items = []
+        self._apply_quality(self.governor.level)
+
+    def _apply_quality(self, level: int):
+        """Darstellungsstufe umschalten: versteckt bzw. zeigt die betroffenen Items."""
+        q = self.quality = QUALITY_LEVELS[level]
+        shown = {True: "normal", False: "hidden"}
+        for i, layer in enumerate(self.star_layers):
+            # ausgeblendete Ebenen bleiben stehen (_update_starfield) — beim
+            # Einblenden passt ihr Versatz noch zu den Items
+            layer["on"] = i >= len(self.star_layers) - q["stars"]
+            if self.fb is None:
+                self.view.itemconfig(layer["tag"], state=shown[layer["on"]])
+        if self.fb is None:
+            self.view.itemconfig("shadow", state=shown[q["stipple"]])
+            self.view.itemconfig(self.grid_id, state=shown[q["grid"]])
+        for pool, cid in self.overlay_items:
+            if pool is self.overlay_dim_pool:
+                self.view.itemconfig(cid, state=shown[q["stipple"]])
+
+    def _grid_image(self):
+        """Eine GRID_STEP-Kachel (Linie oben + links), von Tk mit put(to=...) gekachelt."""
+        top = "{" + " ".join([GRID] * GRID_STEP) + "}"
+        row = "{" + " ".join([GRID] + [BG] * (GRID_STEP - 1)) + "}"
+        img = self.PhotoImage(width=WIDTH, height=HEIGHT)
+        img.put(" ".join([top] + [row] * (GRID_STEP - 1)), to=(0, 0, WIDTH, HEIGHT))
+        return img
+
+    def _grid_array(self):
+        """Dasselbe Raster als Array: Hintergrund des Framebuffers."""
+        np = load_numpy()
+        img = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        img[...] = hex_rgb(BG)
+        img[::GRID_STEP, :] = hex_rgb(GRID)
+        img[:, ::GRID_STEP] = hex_rgb(GRID)
+        return img
+
+    def _create_enemy_pool(self):
+        # Framebuffer: Logos sind keine Items, der Pool bleibt leer
+        size = self.enemy_pool_size if self.fb is None else 0
+        if self.logo_ok:
+            self.enemy_pool = ItemPool(self.view, "image", size, tag="enemy", images=self.sprites)
+        else:
+            # Fallback: Kreise
+            self.enemy_pool = ItemPool(self.view, "oval", size, tag="enemy",
+                                       fill=ENEMY_FALLBACK, outline="")
+
+    def pool_stats(self) -> dict:
+        return {
+            "enemy": self.enemy_pool.stats(),
+            "popup": self.popup_pool.stats(),
+            "overlay_dim": self.overlay_dim_pool.stats(),
+            "overlay_text": self.overlay_text_pool.stats(),
+        }
+
+    def pool_text(self) -> str:
+        """
+        Pools und Sprite-Cache für das F3-Overlay: belegt/angelegt, nachträglich
+        angelegte Items (misses), geladene/angezeigte Bilder.
+        """
+        names = {"enemy": "Gegner", "popup": "Popups", "overlay_text": "Texte"}
+        stats = self.pool_stats()
+        sprites = self.sprites.stats()
+        return "Pools " + ", ".join(
+            f"{label} {stats[key]['in_use']}/{stats[key]['size']} ({stats[key]['misses']} nachgelegt)"
+            for key, label in names.items()) + (
+            f"\nSprites {sprites['resident']}/{self.sprites.resident} geladen ({sprites['pinned']} angezeigt), "
+            f"{sprites['loads']} Ladevorgänge, {sprites['evictions']} verdrängt")
+
+    def _overlay_dim(self):
+        cid = self.overlay_dim_pool.acquire((0, 0, WIDTH, HEIGHT))
+        if not self.quality["stipple"]:
+            self.view.itemconfig(cid, state="hidden")
+        self.overlay_items.append((self.overlay_dim_pool, cid))
+
+    def _overlay_text(self, x, y, text, fill, font, width=0, justify="left"):
+        # alle Optionen setzen: das Item kann vorher etwas anderes gezeigt haben
+        cid = self.overlay_text_pool.acquire((x, y), text=text, fill=fill, font=font,
+                                             width=width, justify=justify)
+        self.overlay_items.append((self.overlay_text_pool, cid))
+
+    def _clear_overlay(self):
+        for pool, item in self.overlay_items:
+            pool.release(item)
+        self.overlay_items = []
+
+    def _raise_overlay(self):
+        # gewachsene Gegner-/Popup-Items liegen über den vorab angelegten
+        self.canvas.tag_raise("overlay")
+
+    def _to_menu(self):
+        self.state = "menu"
+        self._clear_overlay()
+
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 - 85,
+            fill=FG, font=("Consolas", 40, "bold"),
+            text="AUSWEICHEN"
+        )
+
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 + 20,
+            fill=FG, font=("Consolas", 12),
+            text="ENTER = Start | ←/→ oder A/D = Bewegen | LEERTASTE = Sprint",
+            width=WIDTH - 80, justify="center"
+        )
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 + 50,
+            fill=HUD_DIM, font=("Consolas", 11),
+            text="P = Pause | R = Neustart | ESC = Beenden | Knapp vorbei = Bonus + Multiplikator",
+            width=WIDTH - 80, justify="center"
+        )
+
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 + 95,
+            fill=ACCENT, font=("Consolas", 15, "bold"),
+            text="Grafiken werden geladen …" if self.loading else f"Bestwert: {self.best:.1f}"
+        )
+
+        self._reset_run_objects()
+        self._update_hud()
+
+    def start(self):
+        self._clear_overlay()
+        self._reset_run_objects()
+        self.state = "playing"
+        self.last_t = time.perf_counter()
+        self.accumulator = 0.0
+        if self.recorder is not None:
+            if self.sim_hz:
+                self.recorder.begin(self.sim, self.sim_hz, self.left, self.right)
+            else:
+                print("[REPLAY] Aufnahme braucht einen festen Takt (--sim-hz > 0).")
+        if self.worker is not None:
+            if self.replay is not None:
+                source = self.replay[1]
+            else:
+                source = self.keys = KeyInput(self.left, self.right, self.recorder)
+            self.worker.play(source, self.time_scale)
+
+    def _restart(self):
+        if self.state in ("gameover", "paused", "playing"):
+            self.start()
+        else:
+            self._to_menu()
+
+    def _toggle_pause(self):
+        if self.state == "playing":
+            self.state = "paused"
+            if self.worker is not None:
+                self.worker.halt()
+            self._show_pause()
+        elif self.state == "paused":
+            self._clear_overlay()
+            self.state = "playing"
+            if self.worker is not None:
+                self.worker.play()
+            self.last_t = time.perf_counter()
+            self.accumulator = 0.0
+
+    def _show_pause(self):
+        self._clear_overlay()
+        self._overlay_dim()
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 - 10,
+            fill=FG, font=("Consolas", 38, "bold"),
+            text="PAUSE"
+        )
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 + 35,
+            fill=FG, font=("Consolas", 13),
+            text="P = Weiter | R = Neustart | ESC = Beenden",
+            width=WIDTH - 80, justify="center"
+        )
+        self._raise_overlay()
+
+    def _game_over(self, score: float):
+        self.state = "gameover"
+        self._clear_overlay()
+
+        if self.recorder is not None:
+            self.recorder.finish(self.sim, score)
+        if self.replay is not None:
+            self._report_replay()
+        elif score > self.best and self.rewind is None:
+            self.best = score
+            self._save_best()
+
+        self._overlay_dim()
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 - 55,
+            fill=FG, font=("Consolas", 44, "bold"),
+            text="GAME OVER"
+        )
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 + 5,
+            fill=FG, font=("Consolas", 18),
+            text=f"Punkte: {score:.1f}   Bestwert: {self.best:.1f}"
+        )
+        self._overlay_text(
+            WIDTH // 2, HEIGHT // 2 + 50,
+            fill=FG, font=("Consolas", 13),
+            text="R = Neustart | ENTER = Menü | ESC = Beenden",
+            width=WIDTH - 80, justify="center"
+        )
+        if self.rewind is not None:
+            self._overlay_text(
+                WIDTH // 2, HEIGHT // 2 + 80,
+                fill=ACCENT, font=("Consolas", 13),
+                text="ÜBUNG: RÜCKTASTE = zurückspulen (Bestwert zählt nicht)"
+            )
+        self._raise_overlay()
+
+    # -------------------------
+    # Spieler / Gegner / Popups
+    # -------------------------
+
+    def _reset_run_objects(self):
+        # Gegner + Popups zurück in die Pools
+        if self.worker is not None:
+            self.worker.halt()
+            for cid in self.snap_enemy_cids:
+                self.enemy_pool.release(cid)
+            for cid in self.snap_popup_cids:
+                self.popup_pool.release(cid)
+            self.snap_enemy_cids = []
+            self.snap_popup_cids = []
+        for cid in self.sim.enemies.clear():
+            self.enemy_pool.release(cid)
+        for p in self.sim.popups:
+            if p["cid"] is not None:
+                self.popup_pool.release(p["cid"])
+        if self.rewind is not None:
+            self.rewind.clear()
+            self.rewinding = False
+
+        self.dash_pending = False
+        self.render_alpha = 1.0
+
+        # Lauf-Stats, Schwierigkeit, Bewegung und Sprint liegen in der Simulation
+        self.sim.reset(self.seed)
+        if self.worker is not None:
+            self.worker.publish()
+            self.snap = self.worker.snapshot
+
+        # Spieler zurück zur Startposition
+        self._sync_player(1.0)
+
+    def _create_player(self):
+        x = self.sim.player_x
+        self.player_drawn_x = x
+        y = PLAYER_Y
+
+        if self.fb is not None:
+            # Framebuffer: nur die Sprites ablegen, gezeichnet wird in _draw_framebuffer
+            self.player_id = None
+            w, h = self.player_w, self.player_h
+            if self.player_img is not None:
+                # Schatten wie unten; das Stipple-Muster wird zur Deckkraft (gray75 → 0.75)
+                self.fb.add_ellipse("shadow0", w + 16, h + 8, "#000000", 0.75)
+                self.fb.add_ellipse("shadow1", w + 8, h + 8, "#000000", 0.5)
+                self.fb.add_sprite("player", *self.player_img)
+            else:
+                self.fb.add_rect("player", w, h, ACCENT)
+            return
+
+        # Eleganter Schatten ohne Kastenoptik (weiche Ovale, kein Rechteck)
+        if self.player_img is not None:
+            w = self.player_w
+            h = self.player_h
+
+            # Sehr weicher Schatten (2 Lagen) leicht nach unten/rechts;
+            # "shadow" blendet der Qualitätsregler aus (_apply_quality)
+            state = "normal" if self.quality["stipple"] else "hidden"
+            self.canvas.create_oval(
+                x - w / 2 + 2, y + 12,
+                x + w / 2 + 18, y + h + 20,
+                fill="#000000", outline="", stipple="gray75", state=state, tags=("player", "shadow")
+            )
+            self.canvas.create_oval(
+                x - w / 2 + 6, y + 8,
+                x + w / 2 + 14, y + h + 16,
+                fill="#000000", outline="", stipple="gray50", state=state, tags=("player", "shadow")
+            )
+
+            # Spielerbild
+            self.player_id = self.canvas.create_image(x, y, image=self.player_img, anchor="n",
+                                                      tags=("player",))
+        else:
+            # Fallback (und Platzhalter, solange die Grafiken laden): Balken ohne Schatten
+            self.player_id = self.canvas.create_rectangle(
+                x - self.player_w / 2, y, x + self.player_w / 2, y + self.player_h,
+                fill=ACCENT, outline="", tags=("player",)
+            )
+
+    def _sync_player(self, alpha: float):
+        sim = self.sim if self.worker is None else self.snap
+        x = sim.prev_player_x + (sim.player_x - sim.prev_player_x) * alpha
+        dx = x - self.player_drawn_x
+        if dx == 0:
+            return
+        self.player_drawn_x = x
+
+        # Bild und Schatten zusammen: ein move über das Tag
+        if self.fb is None:
+            self.view.move("player", dx, 0)
+
+    def _set_dir(self, which: str, state: bool):
+        if which == "L":
+            self.left = state
+        else:
+            self.right = state
+
+    def _dash(self):
+        if self.state != "playing":
+            return
+        # wirkt im nächsten Simulationsschritt
+        self.dash_pending = True
+
+    def _on_key(self, key: str, down: bool):
+        self._key(key, down)
+        self._wake()
+
+    def _key(self, key: str, down: bool):
+        # Aufgenommen wird nur, was auf die Simulation wirkt: kein P (pausiert wird
+        # auch ohne Taste, siehe _set_visible) und kein Sprint außerhalb des Spiels.
+        # --threaded: Bewegung/Sprint zeichnet KeyInput beim Übernehmen auf.
+        if (self.recorder is not None and self.worker is None and key not in PAUSE_KEYS
+                and not (key in DASH_KEYS and self.state != "playing")):
+            self.recorder.key(self.sim.steps, key, down)
+        if self.replay is not None:
+            return
+        if self.state == "playing" and key in LEFT_KEYS + RIGHT_KEYS + DASH_KEYS:
+            self.latency.key(time.perf_counter())
+        if self.keys is not None and (key in LEFT_KEYS + RIGHT_KEYS
+                                      or key in DASH_KEYS and down and self.state == "playing"):
+            self.keys.push(key, down)
+
+        if key in LEFT_KEYS:
+            self._set_dir("L", down)
+        elif key in RIGHT_KEYS:
+            self._set_dir("R", down)
+        elif not down:
+            return
+        elif key in DASH_KEYS:
+            self._dash()
+        elif key in PAUSE_KEYS:
+            self._toggle_pause()
+        elif key in RESTART_KEYS:
+            self._restart()
+        elif key == "Return":
+            self._return_dispatch()
+
+    def _take_inputs(self):
+        if self.replay is not None:
+            return self.replay[1].inputs(self.sim.steps)
+        inputs = {"left": self.left, "right": self.right, "dash": self.dash_pending}
+        self.dash_pending = False
+        self.latency.consumed()
+        return inputs
+
+    def _sync_enemies(self, alpha: float):
+        if self.worker is not None:
+            self._sync_snapshot_enemies(alpha)
+            return
+        # Ein Canvas-Item gibt es nur im sichtbaren Bereich. Frisch gespawnt
+        # (oberhalb) und auf dem Weg zu ENEMY_CULL_Y (unterhalb) sind Gegner
+        # reine Simulationsdaten — Kollision und "knapp vorbei" rechnet ohnehin
+        # die Simulation.
+        store = self.sim.enemies
+        for i, cid, x, y, py, w, h, size in store.rows():
+            y = py + (y - py) * alpha
+            if y >= HEIGHT or y + h <= 0:
+                if cid is not None:
+                    self.enemy_pool.release(cid)
+                    store.set_cid(i, None)
+                continue
+            if cid is None:
+                img = self._logo_image(size)
+                if img is None:
+                    # Fallback: Kreis
+                    cid = self.enemy_pool.acquire((x, y, x + w, y + h))
+                else:
+                    cid = self.enemy_pool.acquire((x + w / 2, y + h / 2), image=img)
+                store.set_cid(i, cid)
+            elif size is None:
+                self.view.coords(cid, x, y, x + w, y + h)
+            else:
+                self.view.coords(cid, x + w / 2, y + h / 2)
+
+    def _sync_snapshot_enemies(self, alpha: float):
+        # --threaded: Snapshot-Gegner haben keine eigenen Items — Item n zeigt den
+        # n-ten sichtbaren Gegner; gleiche Werte filtert self.view heraus
+        cids = self.snap_enemy_cids
+        n = 0
+        for x, y, py, w, h, size in self.snap.enemies:
+            y = py + (y - py) * alpha
+            if y >= HEIGHT or y + h <= 0:
+                continue
+            img = self._logo_image(size)
+            if n < len(cids):
+                if img is None:
+                    self.view.coords(cids[n], x, y, x + w, y + h)
+                else:
+                    self.view.coords(cids[n], x + w / 2, y + h / 2)
+                    self.enemy_pool.set_image(cids[n], img)
+            elif img is None:
+                cids.append(self.enemy_pool.acquire((x, y, x + w, y + h)))
+            else:
+                cids.append(self.enemy_pool.acquire((x + w / 2, y + h / 2), image=img))
+            n += 1
+        while len(cids) > n:
+            self.enemy_pool.release(cids.pop())
+
+    def _draw_framebuffer(self) -> int:
+        """Framebuffer: Sterne, Spieler, Logos zeichnen; Rückgabe: put-Aufrufe an Tk."""
+        fb = self.fb
+        fb.begin()
+        for layer in self.star_layers:
+            if not layer["on"]:
+                continue
+            for key, xs, ys in layer["stars"]:
+                fb.blit(key, xs, ys, layer["offset"])
+
+        left = self.player_drawn_x - self.player_w / 2
+        if self.player_img is not None and self.quality["stipple"]:
+            fb.blit("shadow0", [left + 2], [PLAYER_Y + 12])
+            fb.blit("shadow1", [left + 6], [PLAYER_Y + 8])
+        fb.blit("player", [left], [PLAYER_Y])
+
+        self._draw_enemies(self.render_alpha)
+        return fb.present()
+
+    def _draw_enemies(self, alpha: float):
+        # je Spritegröße ein blit über alle Logos dieser Größe (Kreise: je Durchmesser)
+        np = load_numpy()
+        if self.worker is None:
+            x, y, py, w, h, size = self.sim.enemies.columns()
+        elif self.snap.enemies:
+            x, y, py, w, h, size = (np.array(col) for col in zip(*self.snap.enemies))
+            size = np.array([-1 if s is None else s for s in size], dtype=np.int64)
+        else:
+            return
+        if not len(x):
+            return
+        y = py + (y - py) * alpha
+        code = np.where(size >= 0, size, -w.astype(np.int64))
+        for c in np.unique(code).tolist():
+            sel = code == c
+            if c >= 0:
+                key = ("logo", c)
+                if not self.fb.has(key):
+                    lw, lh = self.logo_sizes[c]
+                    self.fb.add_sprite(key, *self.sprites.pixels(LOGO_FILE, lw, lh))
+            else:
+                key = ("oval", -c)
+                if not self.fb.has(key):
+                    self.fb.add_ellipse(key, -c, -c, ENEMY_FALLBACK)
+            self.fb.blit(key, x[sel], y[sel])
+
+    def _sync_popups(self, alpha: float):
+        cap = self.quality["popups"]
+        if self.worker is not None:
+            cids = self.snap_popup_cids
+            popups = self.snap.popups if cap is None else self.snap.popups[-cap:]
+            for n, (x, y, py, text, kind) in enumerate(popups):
+                y = py + (y - py) * alpha
+                if n < len(cids):
+                    self.view.coords(cids[n], x, y)
+                    self.view.itemconfig(cids[n], fill=POPUP_COLORS[kind], text=text)
+                else:
+                    cids.append(self.popup_pool.acquire((x, y), fill=POPUP_COLORS[kind], text=text))
+            while len(cids) > len(popups):
+                self.popup_pool.release(cids.pop())
+            return
+        popups = self.sim.popups
+        if cap is not None and len(popups) > cap:
+            # nur die neuesten zeigen; ältere geben ihr Item ab
+            for p in popups[:-cap]:
+                if p["cid"] is not None:
+                    self.popup_pool.release(p["cid"])
+                    p["cid"] = None
+            popups = popups[-cap:]
+        for p in popups:
+            y = p["py"] + (p["y"] - p["py"]) * alpha
+            if p["cid"] is None:
+                p["cid"] = self.popup_pool.acquire(
+                    (p["x"], y), fill=POPUP_COLORS[p["kind"]], text=p["text"]
+                )
+            else:
+                self.view.coords(p["cid"], p["x"], y)
+
+    def _check_bboxes(self, alpha: float):
+        """
+        Debug (--check-bbox): Kollision rechnet nur mit Python-Boxen.
+        Hier wird jede gezeichnete Box einmal gegen Tk gegengeprüft.
+        """
+        self.view.flush()
+        w, h = self.player_w, self.player_h
+        x = self.player_drawn_x
+        boxes = [(self.player_id, (x - w / 2, PLAYER_Y, x + w / 2, PLAYER_Y + h))]
+        for i, cid, x, y, py, w, h, size in self.sim.enemies.rows():
+            if cid is not None:
+                y = py + (y - py) * alpha
+                boxes.append((cid, (x, y, x + w, y + h)))
+
+        for cid, box in boxes:
+            tk_box = self.canvas.bbox(cid)
+            self.bbox_checks += 1
+            if not tk_box or max(abs(a - b) for a, b in zip(box, tk_box)) > BBOX_TOLERANCE:
+                self.bbox_mismatches += 1
+                print(f"[BBOX] Item {cid}: Python {tuple(round(v, 1) for v in box)} / Tk {tk_box}")
+
+    def _apply_events(self):
+        for ev in self.sim.events:
+            kind = ev[0]
+            if kind == "despawn":
+                self.enemy_pool.release(ev[1])
+            elif kind == "popup_end":
+                self.popup_pool.release(ev[1])
+            elif kind == "gameover":
+                self._game_over(ev[1])
+
+    # -------------------------
+    # HUD + Hintergrund
+    # -------------------------
+
+    def _update_starfield(self, dt):
+        for layer in self.star_layers:
+            if not layer["on"]:
+                continue
+            dy = layer["vy"] * dt
+            layer["offset"] += dy
+            if layer["offset"] >= HEIGHT:
+                # Kachel eine Höhe zurück: die obere Kopie steht jetzt genau dort,
+                # wo die untere war
+                layer["offset"] -= HEIGHT
+                dy -= HEIGHT
+            if self.fb is None:
+                self.view.move(layer["tag"], 0, dy)
+
+    def _update_hud(self):
+        # Text nur neu bauen, wenn sich ein Wert geändert hat (Menü, Pause: nie)
+        if self.worker is not None:
+            snap = self.snap
+            hud = (snap.score, snap.mult, self.best, len(snap.enemies))
+        else:
+            sim = self.sim
+            hud = (sim.score(), sim.mult, self.best, len(sim.enemies))
+        if hud != self.hud_last:
+            self.hud_last = hud
+            line1 = f"Punkte: {hud[0]:6.1f}   Multi: {hud[1]:4.2f}   Bestwert: {hud[2]:6.1f}"
+            line2 = f"Logos: {hud[3]:3d}   (Knapp vorbei = Bonus)"
+            self.view.itemconfig(self.hud_id, text=f"{line1}\n{line2}")
+
+        # Sprint-Leiste
+        if self.state != "playing":
+            frac = 1.0
+        elif self.worker is not None:
+            frac = self.snap.dash
+        else:
+            frac = self.sim.dash_charge()
+
+        x0, y0, x1, y1 = DASH_BAR
+        self.view.coords(self.dash_bar_fg, x0, y0, x0 + (x1 - x0) * frac, y1)
+
+    # -------------------------
+    # Profiler
+    # -------------------------
+
+    def _set_profiling(self, on: bool):
+        if on and self.profiler is None:
+            self.profiler = FrameProfiler()
+            self.canvas.tk = CountingTk(self.canvas.tk)
+        elif not on and self.profiler is not None:
+            self.profiler = None
+            self.canvas.tk = self.canvas.tk._tk
+        # --threaded: Simulationsphasen laufen nicht im Frame, nur Tk-Seite messen
+        if self.worker is None:
+            self.sim.profiler = self.profiler
+
+    def _toggle_profiler_overlay(self):
+        self.profile_overlay = not self.profile_overlay
+        if self.profile_overlay:
+            self._set_profiling(True)
+            self.canvas.itemconfig(self.profile_text, state="normal")
+            self.canvas.tag_raise(self.profile_text)
+        else:
+            self.canvas.itemconfig(self.profile_text, state="hidden")
+            if not self.profile_always:
+                self._set_profiling(False)
+
+    def _end_profiled_frame(self, prof, tcl0, tcl_saved):
+        # put-Aufrufe des Framebuffers laufen am gezählten Canvas vorbei
+        tcl_calls = self.canvas.tk.calls - tcl0 + self.fb_puts
+        enemies = self.sim.enemies if self.worker is None else self.snap.enemies
+        # Broadphase-Zähler laufen weiter; ein neuer Gegner-Speicher (Logo-Fallback) fängt bei 0 an
+        pairs = (self.sim.enemies.pair_tests, self.sim.enemies.pair_skipped)
+        last = self.pairs_last if pairs >= self.pairs_last else (0, 0)
+        self.pairs_last = pairs
+        prof.end_frame(enemies_alive=len(enemies), items=len(self.canvas.find_all()),
+                       tcl_calls=tcl_calls, tcl_saved=tcl_saved, quality=self.governor.level,
+                       pair_tests=pairs[0] - last[0], pair_skipped=pairs[1] - last[1])
+        if self.profile_overlay and prof.frame % PROFILE_OVERLAY_EVERY == 0:
+            text = "\n".join((prof.overlay_text(), self.pool_text(), self.pacing_text()))
+            self.canvas.itemconfig(self.profile_text, text=text)
+
+    def pacing_text(self) -> str:
+        p = self.pacer.stats()
+        lat = self.latency.stats()
+        return (f"Takt {p['fps']:.1f}/{p['hz']} Hz, übersprungen {p['dropped']}, "
+                f"Verspätung p95 {p['late_p95']:.2f} ms\n"
+                f"Eingabe → Bild p50 {lat['p50']:.1f} ms, p95 {lat['p95']:.1f} ms, "
+                f"max {lat['max']:.1f} ms (n={lat['n']})\n"
+                f"Qualität {self.governor.level} ({self.quality['name']}"
+                f"{', fest' if self.governor.fixed else ''}), {self.governor.changes} Wechsel"
+                + (f"\n{self.rewind_text()}" if self.rewind is not None else ""))
+
+    def rewind_text(self) -> str:
+        r = self.rewind.stats()
+        return (f"Zurückspulen {r['seconds']:.1f} s ({r['snapshots']} Zustände, {r['held_kb']:.0f} KB), "
+                f"Aufnahme p50 {r['capture_us']['p50']:.0f} µs, p95 {r['capture_us']['p95']:.0f} µs, "
+                f"{r['bytes_mean']:.0f} B; Wiederherstellen p95 {r['restore_ms']['p95']:.2f} ms")
+
+    # -------------------------
+    # Loop
+    # -------------------------
+
+    def _sim_step(self, dt):
+        self.sim.step(dt, self._take_inputs())
+        self._apply_events()
+        if self.profiler is not None:
+            self.profiler.lap("render")
+
+    def _advance(self, frame_dt) -> float:
+        """
+        Simulation um frame_dt weiterführen.
+        Rückgabe: Interpolationsanteil (0..1) zwischen vorletztem und letztem Schritt.
+        """
+        if not self.sim_dt:
+            self._sim_step(min(frame_dt, MAX_FRAME_DT))
+            return 1.0
+
+        # fester Takt: Ruckler der Anzeige ändern das Spiel nicht
+        # (time_scale > 1: Replay im Zeitraffer)
+        self.accumulator = min(self.accumulator + frame_dt * self.time_scale,
+                               MAX_CATCHUP * self.time_scale)
+        if self.rewind is not None and self.accumulator >= self.sim_dt and self.state == "playing":
+            self.rewind.capture(self.sim)
+        while self.accumulator >= self.sim_dt and self.state == "playing":
+            self._sim_step(self.sim_dt)
+            self.accumulator -= self.sim_dt
+
+        if self.sim.over:
+            return 1.0
+        return self.accumulator / self.sim_dt
+
+    def _take_snapshot(self) -> float:
+        """--threaded: neuesten Snapshot übernehmen; Rückgabe: Interpolationsanteil."""
+        snap = self.snap = self.worker.snapshot
+        self.latency.consumed(snap.polled)
+        if snap.over:
+            self._game_over(snap.score)
+            return 1.0
+        return min(1.0, max(0.0, (time.perf_counter() - snap.time) / self.worker.period))
+
+    def _tick(self):
+        self.tick_id = None
+        now = time.perf_counter()
+        frame_dt = now - self.last_t
+        self.last_t = now
+        active = self.tick_mode == "active"
+        if active:
+            self.pacer.frame_started(now)
+
+        self._frame(frame_dt)
+        if active:
+            # Kosten des Frames: eigene Rechenzeit plus Verspätung beim Start (dort
+            # steckt, was Tk seit dem letzten Frame fürs Zeichnen gebraucht hat)
+            level = self.governor.frame(time.perf_counter() - now + max(0.0, self.pacer.lateness[-1]))
+            if level is not None:
+                self._apply_quality(level)
+        if self.first_frame:
+            self.first_frame = False
+            if self.trace is not None:
+                self.root.update_idletasks()    # wirklich gezeichnet, nicht nur geplant
+                self._mark("erster Frame")
+                self._report_trace()
+
+        # Tk zeichnet im Leerlauf nach diesem Aufruf; danach eingereiht = nach dem Zeichnen
+        if self.latency.waiting:
+            self.root.after_idle(self._input_painted)
+        if self.autorun:
+            self._schedule()
+
+    def _idle_mode(self):
+        """(Zustand für idle_meter, Bildrate): Bildrate None = voller Takt, 0 = ruhen."""
+        if self.state == "playing":
+            return "playing", None
+        # Laden, Replay-Start und --check-ttff brauchen Frames, auch ohne Fokus
+        if not self.idle or self.loading:
+            return self.state, None
+        if not (self.focused and self.mapped):
+            return f"{self.state} (Hintergrund)", 0
+        return self.state, IDLE_HZ[self.state]
+
+    def _schedule(self):
+        """Nächsten Frame planen — im Takt, gedrosselt oder gar nicht (bis _wake)."""
+        now = time.perf_counter()
+        key, hz = self._idle_mode()
+        self.idle_meter.switch(key, now)
+        if hz is None:
+            if self.tick_mode != "active":
+                self.pacer.resume(now)
+            self.tick_mode = "active"
+            self.tick_id = self.root.after(self.pacer.delay_ms(now), self._tick)
+        elif hz:
+            self.tick_mode = "idle"
+            self.tick_id = self.root.after(int(1000 / hz), self._tick)
+        else:
+            self.tick_mode = "suspended"
+
+    def _wake(self):
+        """Eingabe oder Fenster wieder sichtbar: gedrosselte Frames sofort nachholen."""
+        if not self.autorun or self.tick_mode == "active":
+            return
+        if self.tick_id is not None:
+            self.root.after_cancel(self.tick_id)
+        self.tick_id = self.root.after(0, self._tick)
+
+    def _on_window(self, e, focused=None, mapped=None):
+        # Bindungen am Hauptfenster sehen auch die Ereignisse der Kind-Widgets
+        if e.widget is not self.root:
+            return
+        if focused is False:
+            # Fokus kann auch nur innerhalb des Fensters wandern: danach nachsehen
+            self.root.after_idle(self._check_focus)
+            return
+        self._set_visible(focused, mapped)
+
+    def _check_focus(self):
+        if self.root.focus_displayof() is None:
+            self._set_visible(focused=False)
+
+    def _set_visible(self, focused=None, mapped=None):
+        if focused is not None:
+            self.focused = focused
+        if mapped is not None:
+            self.mapped = mapped
+        if not (self.focused and self.mapped) and self.state == "playing" and self.replay is None:
+            # Hintergrund mitten im Lauf: Pause, danach gilt deren Drosselung;
+            # weiter geht es mit P
+            self._toggle_pause()
+        self._wake()
+
+    def _input_painted(self):
+        self.latency.painted(time.perf_counter())
+
+    def _frame(self, frame_dt):
+        """Ein Anzeige-Frame: Hintergrund, Simulation, Canvas, HUD."""
+        if self.loading and not self.asset_thread.is_alive():
+            self._finish_assets()
+            self._report_trace()
+        prof = self.profiler
+        if prof is not None:
+            prof.begin_frame()
+            tcl0 = self.canvas.tk.calls
+
+        # Hintergrund läuft immer
+        self._update_starfield(min(frame_dt, MAX_FRAME_DT))
+        if prof is not None:
+            prof.lap("starfield")
+
+        if self.state == "playing":
+            if self.worker is not None:
+                alpha = self._take_snapshot()
+            elif self.rewinding:
+                alpha = self._rewind_frame()
+            else:
+                alpha = self._advance(frame_dt)
+            self.render_alpha = alpha
+
+            self._sync_player(alpha)
+            if self.fb is None:
+                self._sync_enemies(alpha)
+            self._sync_popups(alpha)
+
+            if self.check_bbox:
+                self._check_bboxes(alpha)
+            if prof is not None:
+                prof.lap("render")
+
+        if self.fb is not None:
+            # Sterne laufen auch im Menü: jeden Frame neu zusammensetzen
+            self.fb_puts = self._draw_framebuffer()
+            if prof is not None:
+                prof.lap("render")
+
+        self._update_hud()
+        _, saved = self.view.end_frame()
+        if prof is not None:
+            prof.lap("hud")
+            self._end_profiled_frame(prof, tcl0, saved)
+
+    def _return_dispatch(self):
+        # ENTER: Start aus dem Menü (sobald die Grafiken da sind), im Game Over zurück ins Menü
+        if self.state == "menu" and not self.loading:
+            self.start()
+        elif self.state == "gameover":
+            self._to_menu()
+
+    def _report_trace(self):
+        # erst ausgeben, wenn erster Frame und Grafiken beide durch sind
+        trace = self.trace
+        if trace is None or self.first_frame or self.loading:
+            return
+        ttff = trace.at("erster Frame") * 1000.0
+        print(trace.report())
+        print(f"[START] Erster Frame nach {ttff:.1f} ms (Ziel ≤ {TTFF_TARGET_MS} ms)")
+        if self.trace_quit:
+            self.root.destroy()
+
+    # -------------------------
+    # Replay
+    # -------------------------
+
+    def _check_replay_sizes(self):
+        header = self.replay[0]
+        recorded = {int(k): tuple(v) for k, v in header["logo_sizes"].items()}
+        if recorded != self.sim.logo_sizes or tuple(header["player_size"]) != (self.player_w, self.player_h):
+            print("[REPLAY] Achtung: Spritegrößen weichen von der Aufnahme ab — der Lauf wird anders.")
+
+    def _report_replay(self):
+        r = verify(self.replay[0], self.sim)
+        print(f"[REPLAY] {'OK' if r['ok'] else 'ABWEICHUNG'}: Punkte {r['score']:.3f} "
+              f"(aufgenommen {r['recorded_score']:.3f}), Schritte {r['steps']}/{r['recorded_steps']}")
+
+    # -------------------------
+    # Übungsmodus: Zurückspulen
+    # -------------------------
+
+    def _set_rewind(self, on: bool):
+        if self.rewind is None or on == self.rewinding:
+            return
+        if on:
+            if self.state == "gameover" and len(self.rewind):
+                # der letzte Zustand liegt vor dem tödlichen Schritt
+                self._clear_overlay()
+                self.state = "playing"
+            if self.state != "playing":
+                return
+        self.rewinding = on
+        self.accumulator = 0.0
+
+    def _rewind_frame(self) -> float:
+        """
+        Einen Zustand zurück (einer je aufgenommenem Frame, also etwa im Spieltempo).
+        Die Items der Gegner und Popups bleiben belegt und zeigen danach die
+        wiederhergestellten — wie bei --threaded der Reihe nach; was übrig ist,
+        geht an den Pool zurück, fehlende holt _sync_enemies/_sync_popups.
+        Rückgabe wie _advance.
+        """
+        if not len(self.rewind):
+            return 1.0
+        store = self.sim.enemies
+        enemy_cids = [cid for _, cid, *_ in store.rows() if cid is not None]
+        popup_cids = [p["cid"] for p in self.sim.popups if p["cid"] is not None]
+        self.rewind.restore(self.sim)
+        self.dash_pending = False
+
+        for i, _, _, y, _, _, h, size in store.rows():
+            if not enemy_cids:
+                break
+            if y >= HEIGHT or y + h <= 0:
+                continue
+            cid = enemy_cids.pop()
+            img = self._logo_image(size)
+            if img is not None:
+                self.enemy_pool.set_image(cid, img)
+            store.set_cid(i, cid)
+        for cid in enemy_cids:
+            self.enemy_pool.release(cid)
+
+        for p in self.sim.popups:
+            if not popup_cids:
+                break
+            p["cid"] = cid = popup_cids.pop()
+            self.view.itemconfig(cid, fill=POPUP_COLORS[p["kind"]], text=p["text"])
+        for cid in popup_cids:
+            self.popup_pool.release(cid)
+        return 1.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AUSWEICHEN — Arcade Edition")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="fester Seed für jeden Lauf (gleiche Eingaben = gleicher Lauf)")
+    parser.add_argument("--sim-hz", type=int, default=SIM_HZ,
+                        help=f"fester Simulationstakt in Hz, 0 = variables dt (Standard: {SIM_HZ})")
+    parser.add_argument("--enemy-store", choices=sorted(ENEMY_STORES), default=None,
+                        help="Gegner als Liste von dicts oder als NumPy-Arrays "
+                             "(Standard: list, mit --practice array)")
+    parser.add_argument("--broadphase", choices=BROADPHASES, default="grid",
+                        help="Kollision nur im Spielerband prüfen (grid) oder alle Gegner (brute)")
+    parser.add_argument("--check-bbox", action="store_true",
+                        help="Debug: Kollisionsboxen jeden Frame gegen canvas.bbox prüfen")
+    parser.add_argument("--star-density", type=float, default=1.0,
+                        help=f"Sternfeld-Dichte (1.0 = {sum(STAR_COUNTS)} Sterne)")
+    parser.add_argument("--pool-size", type=int, default=ENEMY_POOL_SIZE,
+                        help=f"vorab angelegte Canvas-Items für Gegner (Standard: {ENEMY_POOL_SIZE})")
+    parser.add_argument("--profile-out", metavar="DATEI", default=None,
+                        help="Frame-Profiler mitlaufen lassen und beim Beenden als .csv/.json schreiben")
+    parser.add_argument("--record", metavar="DATEI", default=None,
+                        help="jeden Lauf bis zum Game Over als Replay speichern")
+    parser.add_argument("--replay", metavar="DATEI", default=None,
+                        help="Replay abspielen und Punkte gegen die Aufnahme prüfen")
+    parser.add_argument("--speed", type=int, choices=REPLAY_SPEEDS, default=0,
+                        help="Replay-Tempo: 0 = ohne Anzeige so schnell wie möglich, sonst 1x/4x/16x")
+    parser.add_argument("--sprite-cache", metavar="ORDNER", default=None,
+                        help="Ordner für erzeugte Sprite-Varianten (Standard: Benutzer-Cache)")
+    parser.add_argument("--collision", choices=("mask", "box"), default="mask",
+                        help="Treffer pixelgenau (Maske) oder wie früher über Rechtecke")
+    parser.add_argument("--render", choices=RENDER_BACKENDS, default="canvas",
+                        help="Anzeige über Canvas-Items oder als ein Bild (framebuffer, NumPy; "
+                             "schneller bei sehr vielen Logos)")
+    parser.add_argument("--fps", type=int, choices=FPS_CHOICES, default=FPS,
+                        help=f"Ziel-Bildrate in Hz (Standard: {FPS})")
+    parser.add_argument("--threaded", action="store_true",
+                        help="Simulation im eigenen Thread: Spiel läuft im Takt weiter, auch wenn Tk hängt")
+    parser.add_argument("--quality", choices=QUALITY_CHOICES, default="auto",
+                        help="Darstellungsstufe: auto = nach Frame-Kosten, 0 = voll bis "
+                             f"{len(QUALITY_LEVELS) - 1} = sparsam (siehe QUALITY_LEVELS)")
+    parser.add_argument("--no-idle", action="store_true",
+                        help="auch in Menü, Pause und im Hintergrund mit voller Bildrate zeichnen")
+    parser.add_argument("--idle-report", action="store_true",
+                        help="beim Beenden die CPU-Last je Zustand (Spiel, Menü, Pause, Hintergrund) ausgeben")
+    parser.add_argument("--practice", action="store_true",
+                        help="Übungsmodus: RÜCKTASTE gedrückt halten spult die letzten "
+                             "Sekunden zurück (Bestwert zählt nicht)")
+    parser.add_argument("--latency", action="store_true",
+                        help="beim Beenden Frame-Takt und Eingabelatenz (Taste → Bild) ausgeben")
+    parser.add_argument("--trace-startup", action="store_true",
+                        help="Dauer jeder Startphase ausgeben")
+    parser.add_argument("--check-ttff", action="store_true",
+                        help=f"Start messen, danach beenden; Exit-Code 1 über {TTFF_TARGET_MS} ms bis zum ersten Frame")
+    args = parser.parse_args(argv)
+    trace = StartupTrace(STARTUP_T0) if args.trace_startup or args.check_ttff else None
+    if trace is not None:
+        trace.mark("Importe")
+
+    if args.replay:
+        try:
+            load_replay(args.replay)
+        except (OSError, ValueError) as e:
+            print(f"[FEHLER] Replay konnte nicht geladen werden: {args.replay}")
+            print(f"        Grund: {e}")
+            sys.exit(2)
+
+    if args.replay and args.speed == 0:
+        t0 = time.perf_counter()
+        r = replay_headless(args.replay, enemy_store=args.enemy_store or "list", broadphase=args.broadphase)
+        print(f"[REPLAY] {'OK' if r['ok'] else 'ABWEICHUNG'}: Punkte {r['score']:.3f} "
+              f"(aufgenommen {r['recorded_score']:.3f}), Schritte {r['steps']}/{r['recorded_steps']}, "
+              f"{time.perf_counter() - t0:.3f} s")
+        sys.exit(0 if r["ok"] else 1)
+
+    root = tk.Tk()
+    if trace is not None:
+        trace.mark("Tk")
+    game = Game(root, sim_hz=args.sim_hz, seed=args.seed, enemy_store=args.enemy_store,
+                broadphase=args.broadphase, check_bbox=args.check_bbox,
+                star_density=args.star_density, enemy_pool_size=args.pool_size,
+                profile=args.profile_out is not None,
+                record=args.record, replay=args.replay, replay_speed=args.speed,
+                sprite_cache=args.sprite_cache, trace=trace, trace_quit=args.check_ttff,
+                collision=args.collision, render=args.render, fps=args.fps,
+                threaded=args.threaded, quality=args.quality, idle=not args.no_idle,
+                practice=args.practice)
+    root.mainloop()
+
+    if args.check_ttff:
+        ttff = trace.at("erster Frame")
+        sys.exit(0 if ttff is not None and ttff * 1000.0 <= TTFF_TARGET_MS else 1)
+
+    if args.latency:
+        print(f"[TAKT] {game.pacing_text()}")
+
+    if args.idle_report:
+        for key, st in sorted(game.idle_meter.stats().items()):
+            print(f"[LEERLAUF] {key:<24} CPU {st['cpu_pct']:5.1f} %  ({st['cpu_s']:.2f} s in {st['wall_s']:.1f} s)")
+
+    if args.check_bbox:
+        print(f"[BBOX] {game.bbox_checks} Prüfungen, {game.bbox_mismatches} Abweichungen")
+
+    if args.profile_out:
+        game.profiler.export(args.profile_out)
+        print(f"[PROFIL] {game.profiler.frame} Frames → {args.profile_out}")
+
+
+def bench(argv=None):
+    """Reproduzierbare Benchmarks (Szenarien und Ausgabe: siehe benchmark.py)."""
+    from benchmark import bench_main
+    return bench_main(argv)
+
+
+def batch(argv=None):
+    """Viele Läufe gleichzeitig ohne Anzeige, Durchsatz messen (siehe batch.py)."""
+    from batch import batch_main
+    return batch_main(argv)
+
+
+def tournament(argv=None):
+    """Stellschrauben × Spielweisen über alle Kerne (siehe tournament.py)."""
+    from tournament import tournament_main
+    return tournament_main(argv)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench"]:
+        bench(sys.argv[2:])
+    elif sys.argv[1:2] == ["batch"]:
+        batch(sys.argv[2:])
+    elif sys.argv[1:2] == ["tournament"]:
+        tournament(sys.argv[2:])
+    else:
+        main()
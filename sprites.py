@@ -0,0 +1,438 @@
+import base64
+import hashlib
+import math
+import os
+import struct
+import sys
+import zlib
+from collections import OrderedDict
+
+from simulation import LOGO_FILE, PLAYER_FILE, full_mask, load_numpy
+
+# -------------------------
+# AUSWEICHEN — Sprite-Cache
+# PNG lesen, auf beliebige Pixelgrößen umrechnen (Flächenmittel statt
+# Tk subsample/zoom) und als PNG im Benutzer-Cache ablegen. Schlüssel:
+# Hash der Quelldatei + Zielgröße — ändert sich das Bild, wird neu erzeugt.
+# Ohne PIL: reines Python, mit NumPy (falls vorhanden) deutlich schneller.
+# Läuft bei kaltem Cache in einem Hintergrund-Thread (spiel.py).
+# -------------------------
+
+CACHE_APP = "ausweichen"
+SPRITE_RESIDENT = 48            # so viele PhotoImages bleiben höchstens im Speicher (LRU; angezeigte werden nie verdrängt)
+SPRITE_COMPRESS = 1             # zlib-Stufe der Cache-Dateien: klein genug, schnell zu lesen
+MASK_ALPHA = 128                # ab dieser Deckkraft zählt ein Pixel zur Kollisionsmaske
+# Voll deckende Bilder (beide PNGs haben weißen Hintergrund statt Transparenz):
+# vom Rand her zusammenhängende Pixel in der Farbe der Ecke zählen nicht zur Maske.
+# Gilt für Logo und Krankenschein: das weiße Blatt ist vom Rand durch seine
+# Kontur getrennt und bleibt ganz (80×53: 2697 von 4240 Pixeln statt des Rechtecks).
+MASK_KEY_TOLERANCE = 24
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def user_cache_dir() -> str:
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, CACHE_APP, "sprites")
+
+
+# -------------------------
+# PNG lesen/schreiben
+# -------------------------
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def decode_png(data: bytes):
+    """
+    8-Bit-PNG (Grau, RGB, Palette, jeweils mit/ohne Alpha, nicht interlaced).
+    Rückgabe: (w, h, Kanäle 3|4, Pixelbytes zeilenweise)
+    """
+    if data[:8] != PNG_SIGNATURE:
+        raise ValueError("keine PNG-Datei")
+    pos = 8
+    idat = []
+    palette = trns = None
+    w = h = depth = ctype = interlace = None
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            w, h, depth, ctype, _, _, interlace = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"PLTE":
+            palette = chunk
+        elif kind == b"tRNS":
+            trns = chunk
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+    if depth != 8 or interlace:
+        raise ValueError(f"PNG-Variante nicht unterstützt (Bittiefe {depth}, Interlace {interlace})")
+
+    src_ch = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[ctype]
+    raw = zlib.decompress(b"".join(idat))
+    stride = w * src_ch
+
+    # Zeilenfilter rückgängig machen
+    out = bytearray(h * stride)
+    prev = bytearray(stride)
+    for y in range(h):
+        i = y * (stride + 1)
+        ftype = raw[i]
+        line = bytearray(raw[i + 1:i + 1 + stride])
+        if ftype == 1:
+            for x in range(src_ch, stride):
+                line[x] = (line[x] + line[x - src_ch]) & 0xFF
+        elif ftype == 2:
+            for x in range(stride):
+                line[x] = (line[x] + prev[x]) & 0xFF
+        elif ftype == 3:
+            for x in range(stride):
+                left = line[x - src_ch] if x >= src_ch else 0
+                line[x] = (line[x] + ((left + prev[x]) >> 1)) & 0xFF
+        elif ftype == 4:
+            for x in range(stride):
+                if x >= src_ch:
+                    line[x] = (line[x] + _paeth(line[x - src_ch], prev[x], prev[x - src_ch])) & 0xFF
+                else:
+                    line[x] = (line[x] + prev[x]) & 0xFF
+        out[y * stride:(y + 1) * stride] = line
+        prev = line
+
+    # auf RGB bzw. RGBA bringen
+    if ctype == 2 and trns is None:
+        return w, h, 3, bytes(out)
+    if ctype == 6:
+        return w, h, 4, bytes(out)
+    if ctype == 3:
+        alpha = (trns or b"") + b"\xff" * (256 - len(trns or b""))
+        lut = [palette[3 * i:3 * i + 3] + alpha[i:i + 1] for i in range(len(palette) // 3)]
+        return w, h, 4, b"".join(lut[v] for v in out)
+    if ctype == 2:
+        key = struct.unpack(">HHH", trns)
+        px = [out[i:i + 3] for i in range(0, len(out), 3)]
+        return w, h, 4, b"".join(p + (b"\x00" if tuple(p) == key else b"\xff") for p in px)
+    if ctype == 0:
+        return w, h, 3, bytes(v for g in out for v in (g, g, g))
+    # ctype == 4: Grau + Alpha
+    return w, h, 4, bytes(v for i in range(0, len(out), 2) for v in (out[i],) * 3 + (out[i + 1],))
+
+
+def encode_png(w: int, h: int, channels: int, pixels: bytes) -> bytes:
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    stride = w * channels
+    raw = b"".join(b"\x00" + pixels[y * stride:(y + 1) * stride] for y in range(h))
+    ihdr = struct.pack(">IIBBBBB", w, h, 8, 6 if channels == 4 else 2, 0, 0, 0)
+    return (PNG_SIGNATURE + chunk(b"IHDR", ihdr)
+            + chunk(b"IDAT", zlib.compress(raw, SPRITE_COMPRESS)) + chunk(b"IEND", b""))
+
+
+# -------------------------
+# Umrechnen (Flächenmittel)
+# -------------------------
+
+def _weights(src: int, dst: int):
+    """Je Zielpixel: [(Quellpixel, Anteil)], Anteile summieren sich zu 1."""
+    scale = src / dst
+    out = []
+    for i in range(dst):
+        a, b = i * scale, (i + 1) * scale
+        taps = []
+        for s in range(int(a), min(src, math.ceil(b))):
+            cover = min(b, s + 1) - max(a, s)
+            if cover > 0:
+                taps.append((s, cover / scale))
+        out.append(taps)
+    return out
+
+
+def resample(w: int, h: int, channels: int, pixels: bytes, nw: int, nh: int) -> bytes:
+    """
+    Auf nw×nh umrechnen. Alpha wird vorher eingerechnet, damit
+    durchsichtige Pixel keine dunklen Ränder hinterlassen.
+    """
+    wx, wy = _weights(w, nw), _weights(h, nh)
+
+    np = load_numpy()
+    if np is not None:
+        mx = np.zeros((nw, w))
+        for i, taps in enumerate(wx):
+            for s, f in taps:
+                mx[i, s] = f
+        my = np.zeros((nh, h))
+        for i, taps in enumerate(wy):
+            for s, f in taps:
+                my[i, s] = f
+        img = np.frombuffer(pixels, dtype=np.uint8).reshape(h, w, channels).astype(np.float64)
+        if channels == 4:
+            img[..., :3] *= img[..., 3:4] / 255.0
+        img = np.einsum("ys,sxc->yxc", my, img)
+        img = np.einsum("xs,ysc->yxc", mx, img)
+        if channels == 4:
+            a = img[..., 3:4]
+            img[..., :3] = np.where(a > 0, img[..., :3] * 255.0 / np.maximum(a, 1e-9), 0.0)
+        return np.clip(img + 0.5, 0, 255).astype(np.uint8).tobytes()
+
+    # reines Python: erst Zeilen, dann Spalten
+    c = channels
+    rows = []
+    for y in range(h):
+        row = pixels[y * w * c:(y + 1) * w * c]
+        if c == 4:
+            src = []
+            for x in range(w):
+                r, g, b, a = row[4 * x:4 * x + 4]
+                f = a / 255.0
+                src += (r * f, g * f, b * f, a)
+        else:
+            src = list(row)
+        line = []
+        for taps in wx:
+            acc = [0.0] * c
+            for s, f in taps:
+                for k in range(c):
+                    acc[k] += src[s * c + k] * f
+            line += acc
+        rows.append(line)
+
+    out = bytearray()
+    for taps in wy:
+        line = [0.0] * (nw * c)
+        for s, f in taps:
+            src = rows[s]
+            for i in range(nw * c):
+                line[i] += src[i] * f
+        if c == 4:
+            for p in range(0, nw * 4, 4):
+                a = line[p + 3]
+                for k in range(3):
+                    line[p + k] = line[p + k] * 255.0 / a if a > 0 else 0.0
+        out += bytes(min(255, int(v + 0.5)) for v in line)
+    return bytes(out)
+
+
+def _key_background(w: int, h: int, channels: int, pixels: bytes, tolerance: int):
+    """Deckkraft je Pixel: 0 für den vom Rand erreichbaren Hintergrund (Farbe der Ecke)."""
+    key = pixels[:3]
+    opaque = bytearray(b"\xff" * (w * h))
+
+    def is_bg(i):
+        p = pixels[i * channels:i * channels + 3]
+        return max(abs(p[0] - key[0]), abs(p[1] - key[1]), abs(p[2] - key[2])) <= tolerance
+
+    stack = [x for x in range(w)] + [(h - 1) * w + x for x in range(w)]
+    stack += [y * w for y in range(h)] + [y * w + w - 1 for y in range(h)]
+    while stack:
+        i = stack.pop()
+        if not opaque[i] or not is_bg(i):
+            continue
+        opaque[i] = 0
+        x, y = i % w, i // w
+        if x > 0:
+            stack.append(i - 1)
+        if x < w - 1:
+            stack.append(i + 1)
+        if y > 0:
+            stack.append(i - w)
+        if y < h - 1:
+            stack.append(i + w)
+    return opaque
+
+
+def alpha_mask(w: int, h: int, channels: int, pixels: bytes, key_tolerance=None):
+    """
+    Kollisionsmaske: eine Zeile je int, Bit x gesetzt = Pixel deckt (Alpha ≥ MASK_ALPHA).
+    Ohne echte Transparenz und mit key_tolerance: Hintergrund freistellen (_key_background).
+    """
+    alpha = pixels[3::4] if channels == 4 else b""
+    if not alpha or min(alpha) >= MASK_ALPHA:
+        if key_tolerance is None:
+            return full_mask(w, h)
+        alpha = _key_background(w, h, channels, pixels, key_tolerance)
+
+    rows = []
+    for y in range(h):
+        bits = 0
+        for x, a in enumerate(alpha[y * w:(y + 1) * w]):
+            if a >= MASK_ALPHA:
+                bits |= 1 << x
+        rows.append(bits)
+    return rows
+
+
+# -------------------------
+# Cache
+# -------------------------
+
+class SpriteCache:
+    """
+    prepare(src, sizes) legt fehlende Varianten als Datei an (nur bei kaltem Cache
+    wird die Quelle überhaupt dekodiert), photo(src, w, h) liefert das PhotoImage.
+    Höchstens `resident` PhotoImages bleiben geladen, das am längsten nicht
+    benutzte fliegt zuerst — aber nie eines, das gerade ein Canvas-Item zeigt:
+    pin()/unpin() zählen die Items je Bild (render.ItemPool mit images=).
+    Sind alle angezeigt, wächst der Cache vorübergehend über `resident`.
+    Wer ein Bild außerhalb eines Pools dauerhaft anzeigt (Spieler), hält
+    selbst eine Referenz darauf.
+    """
+
+    def __init__(self, photo_image, cache_dir=None, resident: int = SPRITE_RESIDENT):
+        self.photo_image = photo_image
+        self.cache_dir = cache_dir or user_cache_dir()
+        self.resident = resident
+        self.photos = OrderedDict()
+        self.pinned = {}            # PhotoImage → Anzahl Canvas-Items, die es zeigen
+        self.hashes = {}
+        self.memory = {}            # (src, w, h) → PNG-Bytes, falls der Cache nicht beschreibbar ist
+        self.masks = {}
+        self.decoded = {}
+        self.generated = 0
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def _hash(self, src: str) -> str:
+        digest = self.hashes.get(src)
+        if digest is None:
+            with open(src, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()[:16]
+            self.hashes[src] = digest
+        return digest
+
+    def path(self, src: str, w: int, h: int) -> str:
+        stem = os.path.splitext(os.path.basename(src))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{self._hash(src)}-{w}x{h}.png")
+
+    def prepare(self, src: str, sizes) -> int:
+        """Fehlende Varianten erzeugen; Rückgabe: Anzahl neu erzeugter."""
+        missing = [(w, h) for w, h in sorted(set(sizes))
+                   if (src, w, h) not in self.memory and not os.path.exists(self.path(src, w, h))]
+        if not missing:
+            return 0
+
+        with open(src, "rb") as f:
+            bw, bh, channels, pixels = decode_png(f.read())
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:
+            pass
+        for w, h in missing:
+            data = encode_png(w, h, channels, resample(bw, bh, channels, pixels, w, h))
+            path = self.path(src, w, h)
+            try:
+                # erst unter anderem Namen schreiben: nie eine halbe Datei im Cache
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                if not self.memory:
+                    print(f"[FEHLER] Sprite-Cache nicht beschreibbar: {self.cache_dir}")
+                    print(f"        Grund: {e}")
+                self.memory[(src, w, h)] = data
+            self.generated += 1
+        return len(missing)
+
+    def photo(self, src: str, w: int, h: int):
+        key = (src, w, h)
+        img = self.photos.get(key)
+        if img is not None:
+            self.photos.move_to_end(key)
+            self.hits += 1
+            return img
+
+        data = self.memory.get(key)
+        if data is not None:
+            img = self.photo_image(data=base64.b64encode(data))
+        else:
+            img = self.photo_image(file=self.path(src, w, h))
+        self.loads += 1
+        self.photos[key] = img
+        if len(self.photos) > self.resident:
+            self._evict(key)
+        return img
+
+    def _evict(self, keep):
+        # das älteste nicht angezeigte Bild außer dem gerade geholten (wird gleich
+        # angezeigt); Tk löscht es, sobald die letzte Referenz weg ist
+        for key, img in self.photos.items():
+            if key != keep and img not in self.pinned:
+                del self.photos[key]
+                self.evictions += 1
+                return
+
+    def pin(self, img):
+        self.pinned[img] = self.pinned.get(img, 0) + 1
+
+    def unpin(self, img):
+        n = self.pinned[img] - 1
+        if n:
+            self.pinned[img] = n
+        else:
+            del self.pinned[img]
+
+    def pixels(self, src: str, w: int, h: int):
+        """Dekodierte (mit prepare erzeugte) Variante: (w, h, Kanäle, Pixelbytes), einmal gelesen."""
+        key = (src, w, h)
+        decoded = self.decoded.get(key)
+        if decoded is None:
+            data = self.memory.get(key)
+            if data is None:
+                with open(self.path(src, w, h), "rb") as f:
+                    data = f.read()
+            decoded = self.decoded[key] = decode_png(data)
+        return decoded
+
+    def mask(self, src: str, w: int, h: int, key_tolerance=None):
+        """Kollisionsmaske einer (mit prepare erzeugten) Variante, einmal berechnet."""
+        key = (src, w, h, key_tolerance)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = self.masks[key] = alpha_mask(*self.pixels(src, w, h), key_tolerance=key_tolerance)
+        return mask
+
+    def stats(self) -> dict:
+        return {
+            "resident": len(self.photos),
+            "pinned": len(self.pinned),
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "generated": self.generated,
+        }
+
+
+def sprite_masks(logo_sizes, player_size, cache: SpriteCache = None):
+    """
+    Masken für Simulation(masks=...): ({Wunschgröße: Maske}, Spielermaske oder None).
+    Ohne lesbare Datei bleibt es bei Boxen (leeres dict bzw. None).
+    """
+    cache = cache or SpriteCache(None)
+    logo_masks = {}
+    player_mask = None
+    try:
+        cache.prepare(LOGO_FILE, logo_sizes.values())
+        logo_masks = {k: cache.mask(LOGO_FILE, w, h, MASK_KEY_TOLERANCE)
+                      for k, (w, h) in logo_sizes.items()}
+    except (OSError, ValueError):
+        pass
+    try:
+        cache.prepare(PLAYER_FILE, [player_size])
+        player_mask = cache.mask(PLAYER_FILE, *player_size, MASK_KEY_TOLERANCE)
+    except (OSError, ValueError):
+        pass
+    return logo_masks, player_mask
@@ -0,0 +1,286 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from profiler import percentile
+from simulation import (
+    WIDTH, PLAYER_Y, GRAZE_MARGIN, PLAYER_MAX_SPEED, SIM_HZ, TUNING,
+    Simulation, clamp, headless_sprite_sizes,
+)
+from sprites import sprite_masks
+
+# -------------------------
+# AUSWEICHEN — Turnier: Stellschrauben × Spielweisen, über alle Kerne
+#
+#   python spiel.py tournament --grid spawn_rate_start=0.8,0.95,1.1 --grid graze_bonus=8,12,16
+#   python spiel.py tournament --grid spawn_accel=0.04,0.09 --sample 50 --runs 40
+#
+# Jede Kombination (Stellschrauben, Spielweise) ist ein Auftrag mit --runs Läufen
+# ohne Anzeige. Fertige Aufträge landen sofort als eine JSON-Zeile in --out;
+# ein neuer Aufruf mit derselben Datei überspringt sie (Abbruch über Nacht: einfach
+# noch einmal starten).
+# -------------------------
+
+TOURNAMENT_RUNS = 20            # Läufe je Auftrag
+TOURNAMENT_MAX_T = 300.0        # Lauf endet spätestens nach so vielen Spielsekunden
+TOURNAMENT_SEED = 12345
+TOURNAMENT_OUT = "tournament.jsonl"
+
+POLICY_EVERY = 4                # Spielweisen entscheiden jeden 4. Schritt (30 Hz bei SIM_HZ = 120)
+POLICY_HORIZON = 1.2            # so weit (Sekunden) schauen sie voraus
+POLICY_OFFSETS = range(-240, 241, 40)   # mögliche Ziele relativ zum Spieler
+
+
+# -------------------------
+# Spielweisen: policy(sim) → inputs wie in Simulation.step
+# -------------------------
+
+def _threats(sim, dt):
+    """(x1, x2, Ankunft, Abflug) je Gegner, der in POLICY_HORIZON das Spielerband erreicht."""
+    band0, band1 = PLAYER_Y, PLAYER_Y + sim.player_h
+    out = []
+    for _, _, x, y, py, w, h, _ in sim.enemies.rows():
+        vy = (y - py) / dt
+        if vy <= 0.0 or y > band1:
+            continue
+        arrive = max(0.0, (band0 - (y + h)) / vy)
+        if arrive < POLICY_HORIZON:
+            out.append((x, x + w, arrive, (band1 - y) / vy))
+    return out
+
+
+def _best_x(sim, dt, graze: bool):
+    """
+    Ziel-x mit der geringsten Gefahr: Gegner, die noch auf dem Ziel liegen, wenn
+    wir ankommen, oder den Weg kreuzen, solange wir unterwegs sind — umso
+    teurer, je früher sie ankommen. graze: Ziele, an denen ein Gegner knapp
+    vorbeifällt, sind etwas wert.
+    """
+    half = sim.player_w / 2
+    x = sim.player_x
+    threats = _threats(sim, dt)
+    best, best_cost = x, None
+    for d in POLICY_OFFSETS:
+        c = clamp(x + d, half + 10, WIDTH - half - 10)
+        lo, hi = min(x, c) - half - 4, max(x, c) + half + 4
+        reach = abs(c - x) / PLAYER_MAX_SPEED
+        cost = 0.002 * abs(c - x) + 0.001 * abs(c - WIDTH / 2)
+        for x1, x2, arrive, leave in threats:
+            if x2 >= c - half - 4 and x1 <= c + half + 4 and leave > reach:
+                cost += 1.0 / (arrive + 0.1)            # liegt auf dem Ziel
+            elif x2 >= lo and x1 <= hi and arrive < reach:
+                cost += 1.0 / (arrive + 0.1)            # kreuzt den Weg, solange wir unterwegs sind
+            elif graze and arrive > reach and (x2 >= c - half - GRAZE_MARGIN and x1 <= c + half + GRAZE_MARGIN):
+                cost -= 0.3 / (arrive + 0.3)
+        if best_cost is None or cost < best_cost:
+            best, best_cost = c, cost
+    return best
+
+
+def _steer(sim, target) -> dict:
+    return {"left": target < sim.player_x - 6, "right": target > sim.player_x + 6, "dash": False}
+
+
+def policy_idle(sim, dt) -> dict:
+    return {"left": False, "right": False, "dash": False}
+
+
+def policy_dodge(sim, dt) -> dict:
+    return _steer(sim, _best_x(sim, dt, graze=False))
+
+
+def policy_graze(sim, dt) -> dict:
+    return _steer(sim, _best_x(sim, dt, graze=True))
+
+
+def policy_dash(sim, dt) -> dict:
+    """Ausweichen wie dodge, und sprinten, sobald die Leiste voll ist und es vorwärts geht."""
+    inputs = _steer(sim, _best_x(sim, dt, graze=False))
+    inputs["dash"] = (inputs["left"] or inputs["right"]) and sim.dash_charge() >= 1.0
+    return inputs
+
+
+POLICIES = {"idle": policy_idle, "dodge": policy_dodge, "graze": policy_graze, "dash": policy_dash}
+
+
+# -------------------------
+# Aufträge (laufen in den Worker-Prozessen)
+# -------------------------
+
+_masks = None
+
+
+def _init_worker(collision: str):
+    """Einmal je Prozess: Kollisionsmasken aus den Sprites (wie im Spiel)."""
+    global _masks
+    if collision == "mask":
+        logo_sizes, player_size = headless_sprite_sizes()
+        _masks = sprite_masks(logo_sizes, player_size)
+
+
+def job_key(job) -> str:
+    """Eindeutig und stabil — daran erkennt ein neuer Aufruf fertige Aufträge."""
+    return json.dumps({k: job[k] for k in ("tuning", "policy", "runs", "seed", "max_t", "collision")},
+                      sort_keys=True)
+
+
+def run_job(job) -> dict:
+    """Alle Läufe eines Auftrags; Seeds hängen nur vom Auftrag ab, nicht vom Prozess."""
+    policy = POLICIES[job["policy"]]
+    dt = 1.0 / SIM_HZ
+    key = job_key(job)
+    survival, scores = [], []
+    t0 = time.perf_counter()
+    for i in range(job["runs"]):
+        seed = zlib.crc32(f"{key}#{i}".encode()) ^ (job["seed"] << 32)
+        sim = Simulation(seed=seed, masks=_masks, tuning=job["tuning"])
+        inputs = None
+        while not sim.over and sim.t < job["max_t"]:
+            if sim.steps % POLICY_EVERY == 0:
+                inputs = policy(sim, dt)
+            elif inputs["dash"]:
+                inputs = dict(inputs, dash=False)
+            sim.step(dt, inputs)
+        survival.append(sim.t)
+        scores.append(sim.score())
+    return {**job, "key": key, "survival": survival, "score": scores,
+            "seconds": time.perf_counter() - t0}
+
+
+def summary(values) -> dict:
+    ordered = sorted(values)
+    return {
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p10": percentile(ordered, 0.10),
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "max": ordered[-1] if ordered else 0.0,
+    }
+
+
+# -------------------------
+# Konfigurationen
+# -------------------------
+
+def parse_grid(items):
+    """["name=1,2,3", ...] → {name: [1.0, 2.0, 3.0]}"""
+    grid = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        name = name.strip().replace("-", "_")
+        if name not in TUNING:
+            raise ValueError(f"unbekannte Stellschraube: {name} (bekannt: {', '.join(TUNING)})")
+        grid[name] = [float(v) for v in values.split(",") if v.strip()]
+        if not grid[name]:
+            raise ValueError(f"keine Werte für {name}")
+    return grid
+
+
+def configurations(grid, sample: int = 0, seed: int = TOURNAMENT_SEED):
+    """
+    Alle Kombinationen des Gitters, oder sample zufällige Punkte: je Stellschraube
+    gleichverteilt zwischen kleinstem und größtem angegebenen Wert.
+    """
+    names = sorted(grid)
+    if not sample:
+        return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    rng = random.Random(seed)
+    return [{n: round(rng.uniform(min(grid[n]), max(grid[n])), 4) for n in names} for _ in range(sample)]
+
+
+def load_done(path: str) -> dict:
+    """
+    Fertige Aufträge aus einer früheren (evtl. abgebrochenen) Ausgabe: {key: Ergebnis}.
+    Eine halbe letzte Zeile wird übergangen und mit einem Zeilenende abgeschlossen,
+    damit die nächste Zeile nicht an ihr klebt.
+    """
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    for line in text.splitlines():
+        try:
+            r = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        done[r["key"]] = r
+    if text and not text.endswith("\n"):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n")
+    return done
+
+
+def _label(r) -> str:
+    params = " ".join(f"{k}={v:g}" for k, v in sorted(r["tuning"].items()))
+    return f"{r['policy']:<6} {params or '(Standard)'}"
+
+
+def _line(r) -> str:
+    s, p = summary(r["survival"]), summary(r["score"])
+    return (f"{_label(r)}: Überleben p10/p50/p90 {s['p10']:.1f}/{s['p50']:.1f}/{s['p90']:.1f} s, "
+            f"Punkte p10/p50/p90 {p['p10']:.0f}/{p['p50']:.0f}/{p['p90']:.0f}")
+
+
+def tournament_main(argv=None):
+    parser = argparse.ArgumentParser(prog="spiel.py tournament",
+                                     description="AUSWEICHEN — Stellschrauben × Spielweisen ohne Anzeige")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=W1,W2,...",
+                        help=f"Werte einer Stellschraube (mehrfach möglich): {', '.join(TUNING)}")
+    parser.add_argument("--sample", type=int, default=0,
+                        help="statt des ganzen Gitters so viele Zufallspunkte zwischen den Grenzen")
+    parser.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                        help="nur diese Spielweisen (mehrfach möglich; Standard: alle)")
+    parser.add_argument("--runs", type=int, default=TOURNAMENT_RUNS, help=f"Läufe je Auftrag (Standard: {TOURNAMENT_RUNS})")
+    parser.add_argument("--max-t", type=float, default=TOURNAMENT_MAX_T,
+                        help=f"Lauf nach so vielen Spielsekunden beenden (Standard: {TOURNAMENT_MAX_T:g})")
+    parser.add_argument("--seed", type=int, default=TOURNAMENT_SEED)
+    parser.add_argument("--collision", choices=("mask", "box"), default="mask")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--out", default=TOURNAMENT_OUT,
+                        help=f"Ergebnisse, eine JSON-Zeile je Auftrag; wird fortgesetzt (Standard: {TOURNAMENT_OUT})")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = parse_grid(args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+
+    policies = args.policy or list(POLICIES)
+    jobs = [{"tuning": tuning, "policy": policy, "runs": args.runs, "seed": args.seed,
+             "max_t": args.max_t, "collision": args.collision}
+            for tuning in configurations(grid, args.sample, args.seed) for policy in policies]
+    done = load_done(args.out)
+    results = [done[job_key(job)] for job in jobs if job_key(job) in done]
+    pending = [job for job in jobs if job_key(job) not in done]
+    print(f"[TURNIER] {len(jobs)} Aufträge ({len(jobs) // len(policies)} Konfigurationen × "
+          f"{len(policies)} Spielweisen), {len(results)} schon fertig in {args.out}, "
+          f"{args.workers} Prozesse")
+
+    t0 = time.perf_counter()
+    with open(args.out, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(args.collision,)) as pool:
+        futures = [pool.submit(run_job, job) for job in pending]
+        try:
+            for i, future in enumerate(as_completed(futures), 1):
+                r = future.result()
+                out.write(json.dumps(r) + "\n")
+                out.flush()
+                results.append(r)
+                print(f"[TURNIER] {i}/{len(pending)} {_line(r)}")
+        except KeyboardInterrupt:
+            pool.shutdown(cancel_futures=True)
+            print(f"[TURNIER] abgebrochen — {len(results)} Aufträge in {args.out}, "
+                  f"ein neuer Aufruf macht dort weiter")
+            return results
+
+    print(f"[TURNIER] fertig in {time.perf_counter() - t0:.1f} s")
+    for r in sorted(results, key=lambda r: (sorted(r["tuning"].items()), r["policy"])):
+        print(f"  {_line(r)}")
+    return results
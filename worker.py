@@ -0,0 +1,148 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from replay import LEFT_KEYS, RIGHT_KEYS, DASH_KEYS
+
+# -------------------------
+# AUSWEICHEN — Simulation im eigenen Thread (--threaded)
+#
+# Der Worker rechnet mit festem Takt und veröffentlicht nach jedem Durchgang
+# einen unveränderlichen Snapshot. Tk liest im after-Callback nur den jeweils
+# neuesten und zeichnet ihn; Tasten gehen über eine Queue an den Worker.
+# Hängt Tk (Neuzeichnen, Fenster wird gezogen), läuft das Spiel im Takt weiter —
+# tkinter gibt die GIL frei, solange Tcl arbeitet oder auf Ereignisse wartet.
+# -------------------------
+
+WORKER_MAX_CATCHUP = 0.25       # mehr Rückstand wird verworfen (wie MAX_CATCHUP in spiel.py)
+
+# Zustand nach einem Durchgang. enemies: ((x, y, py, w, h, size), ...),
+# popups: ((x, y, py, text, kind), ...). time: perf_counter-Zeitpunkt, zu dem der
+# letzte Schritt fällig war (Anzeige interpoliert ab da eine Periode lang);
+# polled: bis hierhin gedrückte Tasten sind enthalten
+Snapshot = namedtuple("Snapshot", "time polled steps player_x prev_player_x enemies popups score mult dash over")
+
+
+def snapshot_of(sim, time: float, polled: float) -> Snapshot:
+    return Snapshot(
+        time=time,
+        polled=polled,
+        steps=sim.steps,
+        player_x=sim.player_x,
+        prev_player_x=sim.prev_player_x,
+        enemies=sim.enemies.snapshot(),
+        popups=tuple((p["x"], p["y"], p["py"], p["text"], p["kind"]) for p in sim.popups),
+        score=sim.score(),
+        mult=sim.mult,
+        dash=sim.dash_charge(),
+        over=sim.over,
+    )
+
+
+class KeyInput:
+    """
+    Tasten aus dem Tk-Thread (push) als Simulations-Eingaben je Schritt —
+    dieselbe Logik wie replay.ReplayInput. Aufgezeichnet wird beim Übernehmen,
+    mit der Schrittzahl, in der die Taste wirkt.
+    """
+
+    def __init__(self, left: bool, right: bool, recorder=None):
+        self.queue = queue.SimpleQueue()
+        self.left = left
+        self.right = right
+        self.recorder = recorder
+
+    def push(self, key: str, down: bool):
+        self.queue.put((key, down))
+
+    def inputs(self, step: int) -> dict:
+        dash = False
+        while True:
+            try:
+                key, down = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if self.recorder is not None:
+                self.recorder.key(step, key, down)
+            if key in LEFT_KEYS:
+                self.left = down
+            elif key in RIGHT_KEYS:
+                self.right = down
+            elif key in DASH_KEYS and down:
+                dash = True
+        return {"left": self.left, "right": self.right, "dash": dash}
+
+
+class SimWorker:
+    """
+    Führt sim in einem Daemon-Thread mit festem Takt (Zeitpunkte wie FramePacer),
+    solange play() gilt. Während eines Durchgangs hält der Worker `lock`;
+    halt() nimmt ihn ebenfalls — danach steht die Simulation, und der Tk-Thread
+    darf sie lesen und ändern (Neustart, Aufnahme, Game Over).
+
+    snapshot ist immer ein fertiger Snapshot: der Worker baut den nächsten,
+    während Tk den vorigen liest, und tauscht dann nur die Referenz.
+    """
+
+    def __init__(self, sim, sim_hz: int):
+        self.sim = sim
+        self.dt = 1.0 / sim_hz
+        self.period = self.dt
+        self.source = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.running = False
+        self.resync = False
+        self.dropped = 0.0          # verworfene Simulationszeit (s), wenn der Worker nicht nachkommt
+        now = time.perf_counter()
+        self.snapshot = snapshot_of(sim, now, now)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def publish(self):
+        """Snapshot des aktuellen (angehaltenen) Zustands, z. B. nach reset()."""
+        with self.lock:
+            now = time.perf_counter()
+            self.snapshot = snapshot_of(self.sim, now, now)
+
+    def play(self, source=None, time_scale: float = 1.0):
+        """Weiterrechnen; source liefert inputs(step) (KeyInput, ReplayInput), None = wie bisher."""
+        with self.lock:
+            if source is not None:
+                self.source = source
+            self.period = self.dt / time_scale
+            self.running = not self.sim.over
+            self.resync = True
+        self.wake.set()
+
+    def halt(self):
+        with self.lock:
+            self.running = False
+
+    def _run(self):
+        deadline = 0.0
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            while True:
+                with self.lock:
+                    if not self.running:
+                        break
+                    sim = self.sim
+                    now = time.perf_counter()
+                    if self.resync:
+                        self.resync = False
+                        deadline = now
+                    elif now - deadline > WORKER_MAX_CATCHUP:
+                        self.dropped += now - deadline
+                        deadline = now
+                    steps = sim.steps
+                    while deadline <= now and not sim.over:
+                        sim.step(self.dt, self.source.inputs(sim.steps))
+                        deadline += self.period
+                    if sim.over:
+                        self.running = False
+                    if sim.steps != steps:
+                        self.snapshot = snapshot_of(sim, deadline - self.period, now)
+                time.sleep(max(0.0, deadline - time.perf_counter()))